@@ -0,0 +1,124 @@
+"""Fair sharing between a heavy and a light client, with and without admission control.
+
+Starts ``server_http_sse:app`` under uvicorn in a subprocess per scenario and
+drives it over SSE with two clients, told apart by ``X-Client-Id``:
+
+- heavy: ``--heavy-sessions`` sessions calling ``shortlist_resumes`` back to
+  back; shed calls sleep for the ``retry_after`` hint before trying again
+- light: ``--light-sessions`` sessions making one call every ``--light-interval``
+
+For each client it prints completed calls per second, shed calls by reason,
+and the latency of completed calls. Without admission control the light
+client queues behind everything the heavy one sends; with it, the heavy
+client is held to its token rate and the in-flight slots are handed out
+round-robin, so the light client keeps its call rate at a fraction of the
+latency. (The load generator shares the machine, so on few cores its own CPU
+use adds to every latency.)
+
+    python benchmarks/admission_fairness.py [--seconds 10] [--heavy-sessions 24] [--light-sessions 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.shared.exceptions import McpError
+
+sys.path.insert(0, os.path.dirname(__file__))
+from resume_scoring import synthetic_resume  # noqa: E402
+from sse_load import free_port, start_server  # noqa: E402
+from webhook_shipping import percentile  # noqa: E402
+
+SCENARIOS = {
+    "admission off": {},
+    "admission on": {
+        "MAX_IN_FLIGHT_CALLS": "4",
+        "ADMISSION_QUEUE_SIZE": "32",
+        "ADMISSION_CLIENT_QUEUE": "8",
+        "CLIENT_RATE_PER_SECOND": "20",
+        "CLIENT_BURST": "20",
+    },
+}
+
+
+class ClientStats:
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.shed: Counter = Counter()
+
+
+async def session(url: str, client: str, args: Dict, stats: ClientStats, deadline: float, interval: float) -> None:
+    async with sse_client(url, headers={"X-Client-Id": client}, timeout=30, sse_read_timeout=300) as (read, write):
+        async with ClientSession(read, write) as mcp:
+            await mcp.initialize()
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    await mcp.call_tool("shortlist_resumes", args)
+                    stats.latencies.append((time.perf_counter() - start) * 1000)
+                    pause = interval
+                except McpError as exc:
+                    data = exc.error.data or {}
+                    stats.shed[data.get("reason", "error")] += 1
+                    pause = min(float(data.get("retry_after", 1.0)), 1.0)
+                if pause:
+                    await asyncio.sleep(pause)
+
+
+async def drive(url: str, args: argparse.Namespace, tool_args: Dict) -> Dict[str, ClientStats]:
+    stats = {"heavy": ClientStats(), "light": ClientStats()}
+    deadline = time.monotonic() + args.seconds
+    await asyncio.gather(
+        *(session(url, "heavy", tool_args, stats["heavy"], deadline, 0.0) for _ in range(args.heavy_sessions)),
+        *(session(url, "light", tool_args, stats["light"], deadline, args.light_interval) for _ in range(args.light_sessions)),
+    )
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--heavy-sessions", type=int, default=24)
+    parser.add_argument("--light-sessions", type=int, default=2)
+    parser.add_argument("--light-interval", type=float, default=0.2, help="seconds between a light session's calls")
+    parser.add_argument("--resumes", type=int, default=5, help="resumes per shortlist call (sets the per-call cost)")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    tool_args = {
+        "resumes": [{"id": str(i), "text": synthetic_resume(rng)} for i in range(args.resumes)],
+        "target_role": "Python Developer",
+        "top_n": 3,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        base = {"LOG_DIR": tmp, "DATA_DIR": tmp, "LOG_WEBHOOK_URL": "", "TOOL_EXECUTION_MODE": "async"}
+        for name, env in SCENARIOS.items():
+            port = free_port()
+            proc = start_server(port, {**base, **env})
+            try:
+                stats = asyncio.run(drive(f"http://127.0.0.1:{port}/mcp/sse", args, tool_args))
+            finally:
+                proc.terminate()
+                proc.wait()
+            print(f"{name}: {args.heavy_sessions} heavy sessions, {args.light_sessions} light sessions, {args.seconds:.0f}s")
+            for client, result in stats.items():
+                done = result.latencies
+                shed = ", ".join(f"{reason} {count}" for reason, count in sorted(result.shed.items())) or "none"
+                latency = (
+                    f"p50 {percentile(done, 0.5):7.1f} ms  p99 {percentile(done, 0.99):7.1f} ms" if done else "no completed calls"
+                )
+                print(f"  {client:<6} {len(done) / args.seconds:7.1f} calls/s  {latency}  shed: {shed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Measure cold start of the HTTP/SSE app in eager and lazy tool startup modes.
+
+For each ``TOOL_STARTUP_MODE`` this reports, over fresh interpreters:
+
+- import time of ``server_http_sse`` (which builds the server), and the
+  slowest modules in it from ``python -X importtime``;
+- time from spawning uvicorn to the first successful ``GET /health``;
+- latency of the first ``tools/call`` on the started server, which is where
+  lazy mode pays for importing the tool module and building its schema.
+
+    python benchmarks/cold_start.py [--runs 5] [--modes eager,lazy] [--top 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+sys.path.insert(0, os.path.dirname(__file__))
+from sse_load import free_port  # noqa: E402
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_profile(env: dict) -> tuple[float, list[tuple[int, str]]]:
+    """Total import time (ms) and the modules with the largest self time (us)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import hiring_router_mcp.server_http_sse"],
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    own: list[tuple[int, str]] = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if not m:
+            continue
+        self_us, cumulative_us, indent, module = int(m.group(1)), int(m.group(2)), m.group(3), m.group(4)
+        if len(indent) == 1:
+            total_us += cumulative_us
+        own.append((self_us, module))
+    return total_us / 1000, sorted(own, reverse=True)
+
+
+def time_to_health(env: dict) -> tuple[float, subprocess.Popen, int]:
+    port = free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "hiring_router_mcp.server_http_sse:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, **env},
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=0.5) as response:
+                if response.status == 200:
+                    return (time.perf_counter() - start) * 1000, proc, port
+        except OSError:
+            time.sleep(0.005)
+    proc.kill()
+    raise RuntimeError("server did not become healthy")
+
+
+async def first_call_ms(port: int, tool: str) -> float:
+    async with sse_client(f"http://127.0.0.1:{port}/mcp/sse", timeout=30) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            start = time.perf_counter()
+            await session.call_tool(tool, {"role": "Python Developer"})
+            return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", default="eager,lazy")
+    parser.add_argument("--tool", default="generate_job_post")
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # No webhook: this measures startup, not log shipping
+        base_env = {"LOG_DIR": tmp, "DATA_DIR": tmp, "LOG_WEBHOOK_URL": ""}
+        for mode in args.modes.split(","):
+            env = {**base_env, "TOOL_STARTUP_MODE": mode}
+            imports, health, first_call = [], [], []
+            own: list[tuple[int, str]] = []
+            for _ in range(args.runs):
+                total, own = import_profile(env)
+                imports.append(total)
+                ms, proc, port = time_to_health(env)
+                health.append(ms)
+                try:
+                    first_call.append(asyncio.run(first_call_ms(port, args.tool)))
+                finally:
+                    proc.terminate()
+                    proc.wait()
+            print(
+                f"{mode:>5}: import {statistics.median(imports):7.1f}ms  "
+                f"first /health {statistics.median(health):7.1f}ms  "
+                f"first {args.tool} {statistics.median(first_call):6.1f}ms  (median of {args.runs})"
+            )
+            ours = [(us, name) for us, name in own if name.startswith("hiring_router_mcp")]
+            print("       slowest modules (self time): " + ", ".join(f"{name} {us / 1000:.1f}ms" for us, name in own[: args.top]))
+            print("       hiring_router_mcp modules: " + ", ".join(f"{name} {us / 1000:.1f}ms" for us, name in ours))
+
+
+if __name__ == "__main__":
+    main()
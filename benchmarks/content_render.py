@@ -0,0 +1,81 @@
+"""Render throughput of the job post, quiz and homework templates.
+
+For each generator: renders per second with the render cache bypassed (the
+``__wrapped__`` function), with the cache hit (the same parameters repeated),
+and through the tool function itself. Also
+times compiling the templates with their per-level variants and loading the
+question bank.
+
+    python benchmarks/content_render.py [--calls 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+
+def rate(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return calls / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # SKILL_INDEX_ENABLED=0 keeps generate_job_post's index write out of the tool-level numbers
+        os.environ.update({"LOG_DIR": tmp, "DATA_DIR": tmp, "LOG_WEBHOOK_URL": "", "SKILL_INDEX_ENABLED": "0"})
+        from hiring_router_mcp import content_templates as ct
+        from hiring_router_mcp.tools.recruiter import generate_homework, generate_job_post, generate_quiz
+
+        start = time.perf_counter()
+        for _ in range(100):
+            for source in (ct.JOB_POST_SOURCE, ct.HOMEWORK_SOURCE):
+                template = ct.Template(source)
+                {level: template.bind(**values) for level, values in ct.LEVELS.items()}
+        print(f"compile 2 templates + {len(ct.LEVELS)} variants each: {(time.perf_counter() - start) / 100 * 1000:.3f} ms")
+        ct.question_index.cache_clear()
+        start = time.perf_counter()
+        index = ct.question_index()
+        questions = sum(len(qs) for levels in index.values() for qs in levels.values())
+        print(f"load question bank ({questions} questions, {len(index)} topics): {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        requirements = ("Python 3.11", "PostgreSQL", "Docker", "Async I/O")
+        responsibilities = ("Design and build services", "Review code", "Own production incidents")
+        benefits = ("Remote-friendly", "Learning budget", "Health insurance")
+        rubric = tuple(ct.DEFAULT_RUBRIC)
+        topics = ("python", "sql", "algorithms", "system_design", "behavioral")
+        difficulties = ("easy", "medium", "hard", "mixed")
+        renders = {
+            "job post": (
+                lambda i: ct.render_job_post.__wrapped__("Acme", "Python Developer", "senior", "Remote", requirements, responsibilities, benefits),
+                lambda i: ct.render_job_post("Acme", "Python Developer", "senior", "Remote", requirements, responsibilities, benefits),
+                lambda i: generate_job_post("Acme", "Python Developer", "Senior", "Remote", list(requirements), list(responsibilities), list(benefits)),
+            ),
+            "quiz (10 questions)": (
+                lambda i: ct.render_quiz.__wrapped__(topics, difficulties[i % 4], 10),
+                lambda i: ct.render_quiz(topics, "medium", 10),
+                lambda i: generate_quiz("Python Developer", None, 10, "medium"),
+            ),
+            "homework": (
+                lambda i: ct.render_homework.__wrapped__("Python Developer", "senior", "Build a REST API", ("GitHub repo", "README"), rubric),
+                lambda i: ct.render_homework("Python Developer", "senior", "Build a REST API", ("GitHub repo", "README"), rubric),
+                lambda i: generate_homework("Python Developer", "Build a REST API", ["GitHub repo", "README"], dict(rubric), "Senior"),
+            ),
+        }
+        for name, (uncached, cached, tool) in renders.items():
+            cold = rate(uncached, args.calls)
+            warm = rate(cached, args.calls)
+            via_tool = rate(tool, args.calls)
+            print(f"  {name:<20} render {cold:9.0f}/s   cache hit {warm:10.0f}/s   tool function {via_tool:9.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
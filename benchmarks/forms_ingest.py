@@ -0,0 +1,147 @@
+"""Burst-load POST /forms/submit and time storage and n8n fan-out.
+
+Starts ``server_http_sse:app`` under uvicorn with ``N8N_WEBHOOK_URL`` pointed
+at a local stand-in (with an artificial delay), then fires a burst of
+submissions from concurrent clients, one per request plus NDJSON bulk
+requests. A fraction of them are re-submissions of the same email and
+position. The benchmark reports request latency, how long it takes until
+every submission is stored and notified, and what the webhook received.
+
+    python benchmarks/forms_ingest.py [--submissions 5000] [--concurrency 50] [--bulk 200] [--duplicates 0.1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(__file__))
+from sse_load import free_port, start_server  # noqa: E402
+from webhook_shipping import percentile  # noqa: E402
+
+
+def start_n8n(delay_seconds: float) -> tuple[ThreadingHTTPServer, dict]:
+    received = {"requests": 0, "submissions": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", "0"))))
+            time.sleep(delay_seconds)
+            with lock:
+                received["requests"] += 1
+                received["submissions"] += len(body["submissions"])
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, received
+
+
+def submission(i: int) -> dict:
+    return {
+        "position": f"Position {i % 20}",
+        "full_name": f"Candidate {i}",
+        "email": f"candidate{i}@example.com",
+        "resume_url": f"https://cv.example.com/{i}.pdf",
+        "source": random.choice(("hh", "linkedin", "referral")),
+    }
+
+
+async def fire(base_url: str, payloads: list, concurrency: int) -> list[float]:
+    latencies: list[float] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for payload in payloads:
+        queue.put_nowait(payload)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while not queue.empty():
+            payload = queue.get_nowait()
+            if isinstance(payload, list):
+                content = "\n".join(json.dumps(p) for p in payload).encode("utf-8")
+                headers = {"Content-Type": "application/x-ndjson"}
+            else:
+                content, headers = json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"}
+            start = time.perf_counter()
+            response = await client.post("/forms/submit", content=content, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code == 503:
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+                queue.put_nowait(payload)
+            elif response.status_code != 202:
+                raise RuntimeError(f"unexpected {response.status_code}: {response.text}")
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--submissions", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--bulk", type=int, default=200, help="submissions per NDJSON request for half of the burst")
+    parser.add_argument("--duplicates", type=float, default=0.1)
+    parser.add_argument("--webhook-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    random.seed(7)
+    unique = int(args.submissions * (1 - args.duplicates))
+    records = [submission(i) for i in range(unique)] + [submission(random.randrange(unique)) for _ in range(args.submissions - unique)]
+    random.shuffle(records)
+    half = len(records) // 2
+    payloads: list = records[:half] + [records[i : i + args.bulk] for i in range(half, len(records), args.bulk)]
+
+    n8n, received = start_n8n(args.webhook_delay)
+    with tempfile.TemporaryDirectory() as tmp:
+        port = free_port()
+        env = {
+            "LOG_DIR": tmp,
+            "DATA_DIR": tmp,
+            "LOG_WEBHOOK_URL": "",
+            "N8N_WEBHOOK_URL": f"http://127.0.0.1:{n8n.server_address[1]}/webhook",
+        }
+        proc = start_server(port, env)
+        try:
+            start = time.perf_counter()
+            latencies = asyncio.run(fire(f"http://127.0.0.1:{port}", payloads, args.concurrency))
+            accepted_s = time.perf_counter() - start
+            db = sqlite3.connect(str(Path(tmp) / "forms.sqlite"))
+            stored = notified = 0
+            deadline = time.time() + 120
+            while time.time() < deadline:
+                stored, notified = db.execute("SELECT COUNT(*), COUNT(notified_at) FROM form_submissions").fetchone()
+                if stored == unique and notified == unique:
+                    break
+                time.sleep(0.05)
+            done_s = time.perf_counter() - start
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    print(f"{args.submissions:,} submissions ({unique:,} unique) in {len(payloads):,} requests, concurrency {args.concurrency}")
+    print(f"  accepted in {accepted_s:.2f}s ({args.submissions / accepted_s:,.0f}/s); "
+          f"request p50 {percentile(latencies, 0.5):.1f}ms p99 {percentile(latencies, 0.99):.1f}ms max {max(latencies):.1f}ms")
+    print(f"  stored {stored:,}, notified {notified:,} after {done_s:.2f}s; "
+          f"webhook got {received['submissions']:,} submissions in {received['requests']:,} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Local stand-in for the hh.ru API, served from ``fixtures/hh_vacancies.json``.
+
+Implements the subset the client uses (``/dictionaries``, ``/suggests/areas``, paginated
+``/vacancies`` filtered by area/experience, ``/vacancies/{id}``) with ETags
+and ``304 Not Modified``, plus an optional per-request delay. Running the
+module exercises the client end to end offline:
+
+    python benchmarks/hh_stub.py [--delay-ms 30] [--copies 20]
+
+To point the server at it: ``HH_API_ENABLED=1 HH_API_BASE_URL=http://127.0.0.1:<port>``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = Path(__file__).parent / "fixtures" / "hh_vacancies.json"
+
+
+def load_fixtures(copies: int = 1) -> dict:
+    """Load the fixture vacancies, optionally replicated under fresh ids for volume."""
+    data = json.loads(FIXTURES.read_text(encoding="utf-8"))
+    vacancies = []
+    for copy in range(copies):
+        for item in data["vacancies"]:
+            vacancies.append({**item, "id": str(int(item["id"]) + copy * 1_000_000)})
+    return {"areas": data["areas"], "vacancies": vacancies}
+
+
+def start_stub(delay_seconds: float = 0.0, copies: int = 1) -> tuple[ThreadingHTTPServer, dict]:
+    data = load_fixtures(copies)
+    by_id = {item["id"]: item for item in data["vacancies"]}
+    counters = {"requests": 0, "not_modified": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, payload: object) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                with lock:
+                    counters["not_modified"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:  # noqa: N802
+            with lock:
+                counters["requests"] += 1
+            if delay_seconds:
+                time.sleep(delay_seconds)
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if url.path == "/dictionaries":
+                self._send({"currency": [
+                    {"code": "RUR", "rate": 1.0},
+                    {"code": "USD", "rate": 0.0111},
+                    {"code": "EUR", "rate": 0.0102},
+                ]})
+            elif url.path == "/suggests/areas":
+                text = query.get("text", "").lower()
+                self._send({"items": [a for a in data["areas"] if text and text in a["text"].lower()]})
+            elif url.path == "/vacancies":
+                items = [
+                    {k: v for k, v in item.items() if k != "key_skills"}
+                    for item in data["vacancies"]
+                    if query.get("area") in (None, item["area"]["id"])
+                    and query.get("experience") in (None, item["experience"]["id"])
+                ]
+                page, per_page = int(query.get("page", 0)), int(query.get("per_page", 20))
+                pages = max(1, -(-len(items) // per_page))
+                self._send({
+                    "found": len(items),
+                    "pages": pages,
+                    "page": page,
+                    "per_page": per_page,
+                    "items": items[page * per_page:(page + 1) * per_page],
+                })
+            elif url.path.startswith("/vacancies/") and url.path.rsplit("/", 1)[1] in by_id:
+                self._send(by_id[url.path.rsplit("/", 1)[1]])
+            else:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, counters
+
+
+def main() -> None:
+    from hiring_router_mcp.hh_api import HHClient
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay-ms", type=float, default=30.0)
+    parser.add_argument("--copies", type=int, default=20, help="replicate fixtures to get several result pages")
+    parser.add_argument("--rate", type=float, default=20.0)
+    args = parser.parse_args()
+
+    server, counters = start_stub(args.delay_ms / 1000, args.copies)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    with tempfile.TemporaryDirectory() as tmp:
+        client = HHClient(base_url=base_url, rate_per_second=args.rate, cache_path=Path(tmp) / "hh.sqlite", cache_ttl_seconds=0)
+        try:
+            for label in ("cold", "revalidated (304)"):
+                before = dict(counters)
+                start = time.perf_counter()
+                snapshot = client.run(client.market_snapshot("python", location="Москва", detail_limit=40))
+                elapsed = (time.perf_counter() - start) * 1000
+                print(
+                    f"{label:>18}: {elapsed:7.1f}ms requests={counters['requests'] - before['requests']} "
+                    f"304s={counters['not_modified'] - before['not_modified']} fetched={snapshot['fetched']}"
+                )
+            summary = {"salary": snapshot["salary"], "top_skills": snapshot["top_skills"][:5]}
+            if "salary_bands" in snapshot:
+                summary["salary_bands"] = {k: snapshot["salary_bands"][k] for k in ("overall", "bands")}
+            print(json.dumps(summary, ensure_ascii=False, indent=1))
+        finally:
+            client.close()
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
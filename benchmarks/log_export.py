@@ -0,0 +1,102 @@
+"""Time log export formats over synthetic request logs and check memory stays flat.
+
+Writes ``requests.jsonl`` plus rotated daily backups of tool_call/tool_result
+records, then runs every export format over all of them (and a filtered
+window) and reports throughput, output size and peak Python heap
+(tracemalloc, in a separate untimed pass) during the export.
+
+    python benchmarks/log_export.py [--records 1000000] [--days 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from hiring_router_mcp.log_export import ExportFilter, export_page, export_stream
+
+TOOLS = ("generate_job_post", "market_research", "resume_optimizer", "interview_prep", "salary_research")
+
+
+def write_logs(log_dir: Path, records: int, days: int) -> int:
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    per_day = records // days
+    total = 0
+    for day in range(days - 1, -1, -1):
+        moment = now - timedelta(days=day)
+        name = "requests.jsonl" + ("" if day == 0 else "." + moment.strftime("%Y-%m-%d"))
+        path = log_dir / name
+        with path.open("w", encoding="utf-8") as f:
+            start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+            for i in range(per_day):
+                ts = (start + timedelta(seconds=i * 86400 / per_day)).strftime("%Y-%m-%dT%H:%M:%S.%f") + "Z"
+                tool = rng.choice(TOOLS)
+                record = {"timestamp": ts, "level": "INFO", "logger": "hiring_router_mcp.server", "message": "tool_result",
+                          "event": "tool_result" if i % 2 else "tool_call", "tool": tool, "client_id": f"client-{i % 7}"}
+                if i % 2:
+                    record["duration_ms"] = round(rng.lognormvariate(3, 1), 2)
+                    record["result_preview"] = "x" * rng.randrange(50, 300)
+                else:
+                    record["args"] = {"role": "Python Developer", "seq": i}
+                f.write(json.dumps(record) + "\n")
+                total += 1
+        mtime = (moment if day else now).timestamp()
+        os.utime(path, (mtime, mtime))
+    return total
+
+
+def run(label: str, log_dir: Path, flt: ExportFilter, fmt: str, compression: str, input_bytes: int) -> None:
+    start = time.perf_counter()
+    chunks, _, _ = export_stream(log_dir, flt, fmt, compression)
+    size = sum(len(chunk) for chunk in chunks)
+    elapsed = time.perf_counter() - start
+    # Second pass under tracemalloc, which would otherwise skew the timing
+    tracemalloc.start()
+    chunks, _, _ = export_stream(log_dir, flt, fmt, compression)
+    largest = max((len(chunk) for chunk in chunks), default=0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>26} {fmt:>6}/{compression:<4}: {elapsed:6.2f}s {input_bytes / elapsed / 1e6:6.1f} MB/s in, "
+          f"{size / 1e6:7.1f} MB out, largest chunk {largest / 1e3:5.0f} kB, peak heap {peak / 1e6:5.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = Path(tmp)
+        total = write_logs(log_dir, args.records, args.days)
+        input_bytes = sum(p.stat().st_size for p in log_dir.iterdir())
+        print(f"{total:,} records in {args.days} files, {input_bytes / 1e6:.0f} MB")
+
+        everything = ExportFilter()
+        for fmt, compression in (("ndjson", "none"), ("ndjson", "gzip"), ("ndjson", "zstd"), ("arrow", "zstd")):
+            run("all records", log_dir, everything, fmt, compression, input_bytes)
+        window = ExportFilter.from_args(time_range="last_2_days", event="tool_result", tool="generate_job_post")
+        run("2 days, 1 tool's results", log_dir, window, "ndjson", "gzip", input_bytes)
+
+        start = time.perf_counter()
+        pages, cursor, seen = 0, None, 0
+        while True:
+            page = export_page(log_dir, window, cursor=cursor, limit=1000)
+            pages += 1
+            seen += len(page["records"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        print(f"{'paged (limit 1000)':>28}: {seen:,} records in {pages} pages, {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compare the JSONL request log with the segmented binary log: write cost and scan speed.
+
+Emits the same synthetic tool_call/tool_result records (spread over several
+days) through the JSONL file handler and through ``SegmentLogHandler``,
+timing the per-record handler cost and the bytes written. Then runs the
+analytics scans over each format: the all-time summary, a latency report over
+everything and one over the last day only (where segments outside the window
+are skipped by their footers).
+
+    python benchmarks/log_segments.py [--records 1000000] [--days 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from hiring_router_mcp.logging_setup import JsonLogFormatter, SegmentLogHandler
+from hiring_router_mcp.log_segments import segment_dir
+from hiring_router_mcp.tools.analytics import LogAggregator
+
+TOOLS = ("generate_job_post", "market_research", "resume_optimizer", "interview_prep", "salary_research")
+CHUNK = 10_000
+
+
+def make_records(rng: random.Random, start: float, count: int, step: float, offset: int) -> list[logging.LogRecord]:
+    records = []
+    for i in range(offset, offset + count):
+        tool = rng.choice(TOOLS)
+        if i % 2:
+            fields = {"event": "tool_result", "tool": tool, "client_id": f"client-{i % 7}",
+                      "duration_ms": round(rng.lognormvariate(3, 1), 2), "result_preview": "x" * rng.randrange(50, 300)}
+        else:
+            fields = {"event": "tool_call", "tool": tool, "client_id": f"client-{i % 7}",
+                      "args": {"role": "Python Developer", "seq": i}}
+        record = logging.LogRecord("hiring_router_mcp.server", logging.INFO, __file__, 0, fields["event"], None, None)
+        record.created = start + i * step
+        record.extra = fields
+        records.append(record)
+    return records
+
+
+def write_logs(log_dir: Path, records: int, days: int) -> tuple[int, int]:
+    rng = random.Random(7)
+    per_day = records // days
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    segments = SegmentLogHandler(log_dir)
+    jsonl_seconds = segment_seconds = 0.0
+    for day in range(days - 1, -1, -1):
+        moment = today - timedelta(days=day)
+        path = log_dir / ("requests.jsonl" + ("" if day == 0 else "." + moment.strftime("%Y-%m-%d")))
+        jsonl = logging.FileHandler(str(path), encoding="utf-8")
+        jsonl.setFormatter(JsonLogFormatter())
+        for offset in range(0, per_day, CHUNK):
+            batch = make_records(rng, moment.timestamp(), min(CHUNK, per_day - offset), 86400 / per_day, offset)
+            start = time.perf_counter()
+            for record in batch:
+                jsonl.handle(record)
+            jsonl_seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            for record in batch:
+                segments.handle(record)
+            segment_seconds += time.perf_counter() - start
+        jsonl.close()
+        end_of_day = min(moment.timestamp() + 86400, time.time())
+        os.utime(path, (end_of_day, end_of_day))
+    segments.close()
+
+    total = per_day * days
+    jsonl_bytes = sum(p.stat().st_size for p in log_dir.glob("requests.jsonl*"))
+    segment_bytes = sum(p.stat().st_size for p in segment_dir(log_dir).iterdir())
+    print(f"{total:,} records over {days} days")
+    print(f"  write  jsonl:    {jsonl_seconds / total * 1e6:5.1f} µs/record, {jsonl_bytes / total:5.0f} B/record ({jsonl_bytes / 1e6:.0f} MB)")
+    print(f"  write  segments: {segment_seconds / total * 1e6:5.1f} µs/record, {segment_bytes / total:5.0f} B/record ({segment_bytes / 1e6:.0f} MB)")
+    return jsonl_bytes, segment_bytes
+
+
+def timed(label: str, size: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<38} {elapsed:6.2f}s  {elapsed / (size / 1e9):6.1f} s/GB of this format")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = Path(tmp)
+        jsonl_bytes, segment_bytes = write_logs(log_dir, args.records, args.days)
+        last_day = datetime.now(timezone.utc) - timedelta(days=1)
+        for name, segments, size in (("jsonl", False, jsonl_bytes), ("segments", True, segment_bytes)):
+            timed(f"summary (all files), {name}", size, lambda: LogAggregator(log_dir, segments=segments).summary(include_rotated=True))
+            timed(f"latency by tool (all), {name}", size, lambda: LogAggregator(log_dir, segments=segments).latency_report())
+            timed(f"latency by tool (last day), {name}", size, lambda: LogAggregator(log_dir, segments=segments).latency_report(start=last_day))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Load test the HTTP/SSE app under ``uvicorn --workers N`` with and without the session broker.
+
+Each configuration starts ``server_http_sse:app`` in a subprocess, opens
+concurrent MCP sessions over SSE and makes tool calls. With several workers
+the kernel spreads connections across them, so a session's POSTs often land
+on a worker that does not hold its SSE stream: with ``SESSION_BROKER=local``
+those calls fail (404, the client times out), with ``SESSION_BROKER=unix``
+they are forwarded to the owner. Reports completed/failed calls, latency and
+throughput, and how many messages were forwarded (summed from each worker's
+/metrics, which a scrape only sees one worker of at a time).
+
+    python benchmarks/multi_worker.py [--sessions 40] [--calls 10] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from hiring_router_mcp.session_broker import _encode, _read_frame
+
+sys.path.insert(0, os.path.dirname(__file__))
+from sse_load import free_port, start_server  # noqa: E402
+from webhook_shipping import percentile  # noqa: E402
+
+
+async def session_worker(url: str, calls: int, tool: str, latencies: list[float], failures: list[str]) -> None:
+    try:
+        async with sse_client(url, timeout=10, sse_read_timeout=120) as (read, write):
+            async with ClientSession(read, write, read_timeout_seconds=timedelta(seconds=5)) as session:
+                await session.initialize()
+                for i in range(calls):
+                    start = time.perf_counter()
+                    await session.call_tool(tool, {"role": f"Role {i}"})
+                    latencies.append((time.perf_counter() - start) * 1000)
+    except Exception as exc:  # noqa: BLE001 - a failed session is what is being counted
+        failures.append(type(exc).__name__)
+
+
+async def run_load(url: str, sessions: int, calls: int, tool: str) -> tuple[list[float], list[str], float]:
+    latencies: list[float] = []
+    failures: list[str] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(session_worker(url, calls, tool, latencies, failures) for _ in range(sessions)))
+    return latencies, failures, time.perf_counter() - started
+
+
+def forwarded_messages(broker_dir: str) -> int:
+    # Every worker's socket is in the broker directory; ask each for its own counter
+    total = 0
+    for name in os.listdir(broker_dir):
+        if name.startswith("worker-") and name.endswith(".sock"):
+            total += asyncio.run(_received(os.path.join(broker_dir, name)))
+    return total
+
+
+async def _received(socket_path: str) -> int:
+    # The broker's own protocol: replay GET /metrics on that worker
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    writer.write(_encode({"path": "/metrics", "query": "", "headers": [], "client": None, "method": "GET"}, b""))
+    await writer.drain()
+    _, body = await _read_frame(reader)
+    writer.close()
+    for line in body.decode().splitlines():
+        if line.startswith("hiring_router_session_messages_received_total"):
+            return int(float(line.rsplit(" ", 1)[1]))
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--tool", default="generate_job_post")
+    args = parser.parse_args()
+
+    configs = [(1, "local"), (args.workers, "local"), (args.workers, "unix")]
+    for workers, broker in configs:
+        port = free_port()
+        with tempfile.TemporaryDirectory() as tmp:
+            broker_dir = os.path.join(tmp, "broker")
+            env = {"LOG_DIR": tmp, "DATA_DIR": tmp, "LOG_WEBHOOK_URL": "", "SESSION_BROKER": broker, "SESSION_BROKER_DIR": broker_dir}
+            proc = start_server(port, env, ("--workers", str(workers)))
+            try:
+                time.sleep(2 if workers > 1 else 0)
+                latencies, failures, wall = asyncio.run(
+                    run_load(f"http://127.0.0.1:{port}/mcp/sse", args.sessions, args.calls, args.tool)
+                )
+                forwarded = forwarded_messages(broker_dir) if broker == "unix" else 0
+            finally:
+                proc.terminate()
+                proc.wait(timeout=30)
+        p50 = statistics.median(latencies) if latencies else float("nan")
+        p99 = percentile(latencies, 0.99) if latencies else float("nan")
+        print(
+            f"workers={workers} broker={broker:<5}: calls ok={len(latencies):5} failed sessions={len(failures):3} "
+            f"p50={p50:7.1f}ms p99={p99:7.1f}ms throughput={len(latencies) / wall:7.1f}/s forwarded={forwarded}"
+        )
+
+
+if __name__ == "__main__":
+    main()
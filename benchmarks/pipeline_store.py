@@ -0,0 +1,87 @@
+"""Ingest synthetic candidate stage transitions and time funnel report queries.
+
+Candidates move through the default journey with per-stage pass rates and
+random dwell times over ~180 days, across positions and sources; events are
+ingested in batches (shuffled, so timelines are re-linked out of order).
+
+    python benchmarks/pipeline_store.py [--events 1000000] [--batch 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from hiring_router_mcp.pipeline import STAGE_ORDER, PipelineStore, StageEvent
+
+PASS_RATES = (0.9, 0.6, 0.5, 0.5, 0.6, 0.85)
+SOURCES = ("hh", "linkedin", "referral", "career_site", "agency")
+
+
+def generate(n_events: int, positions: int, seed: int = 7) -> list[StageEvent]:
+    rng = random.Random(seed)
+    now = int(time.time())
+    events: list[StageEvent] = []
+    candidate = 0
+    while len(events) < n_events:
+        candidate += 1
+        cid, position, source = f"c{candidate}", f"position-{rng.randrange(positions)}", rng.choice(SOURCES)
+        ts = now - rng.randrange(180 * 86400)
+        for i, stage in enumerate(STAGE_ORDER):
+            events.append(StageEvent(cid, position, stage, ts, source, f"{cid}:{stage}"))
+            if i == len(PASS_RATES) or rng.random() > PASS_RATES[i]:
+                if i < len(PASS_RATES) and rng.random() < 0.7:
+                    ts += int(rng.expovariate(1 / (3 * 86400)))
+                    events.append(StageEvent(cid, position, "rejected", ts, source, f"{cid}:rejected"))
+                break
+            ts += int(rng.expovariate(1 / (4 * 86400))) + 600
+    rng.shuffle(events)
+    return events[:n_events]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--positions", type=int, default=50)
+    args = parser.parse_args()
+
+    events = generate(args.events, args.positions)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "pipeline.sqlite"
+        store = PipelineStore(path)
+        start = time.perf_counter()
+        for i in range(0, len(events), args.batch):
+            store.record_events(events[i : i + args.batch])
+        elapsed = time.perf_counter() - start
+        print(f"ingest: {len(events):,} events in {elapsed:.1f}s ({len(events) / elapsed:,.0f}/s), "
+              f"{path.stat().st_size / 1e6:.0f} MB, {store.event_count():,} rolled up")
+
+        now = datetime.now(timezone.utc)
+        for label, kwargs in (
+            ("30 days", {"start": now - timedelta(days=30), "end": now}),
+            ("180 days", {"start": now - timedelta(days=180), "end": now}),
+            ("180 days by position", {"start": now - timedelta(days=180), "end": now, "group_by": "position"}),
+            ("180 days by week", {"start": now - timedelta(days=180), "end": now, "group_by": "week"}),
+            ("one position", {"start": now - timedelta(days=180), "end": now, "position": "position-3"}),
+        ):
+            samples = []
+            for _ in range(20):
+                t = time.perf_counter()
+                report = store.funnel(**kwargs)
+                samples.append((time.perf_counter() - t) * 1000)
+            print(f"{label:>22}: median {statistics.median(samples):6.1f}ms ({len(report)} groups)")
+        overall = store.funnel(now - timedelta(days=180), now)["all"]["stages"]
+        for stage in overall:
+            print(f"  {stage['stage']:<22} entered {stage['entered']:>7} conv {stage['conversion_rate']:.2f} "
+                  f"drop {stage['drop_off_rate']:.2f} p50 {stage['time_in_stage_hours'] and stage['time_in_stage_hours']['p50']}h")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
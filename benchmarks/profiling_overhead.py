@@ -0,0 +1,71 @@
+"""Per-call cost of the tool profiling hooks: off, sampled, and every call.
+
+Builds the server once per PROFILE_SAMPLE_RATE setting and calls a tool's
+logged wrapper (as registered with FastMCP, log level WARNING so record
+writes do not drown the difference) in a loop, next to the bare tool
+function for reference. With profiling off the wrapper only adds an
+``is None`` check, so "off" should match the pre-profiling wrapper to within
+noise; the sampled rows show what capture costs when it is on.
+
+    python benchmarks/profiling_overhead.py [--calls 20000] [--tool generate_job_post]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from hiring_router_mcp.lazy_tools import tool_functions
+from hiring_router_mcp.server import build_server
+
+ARGS = {"role": "Python Developer", "company": "Acme", "location": "Remote"}
+
+
+def per_call_us(fn, calls: int, rounds: int = 5) -> float:
+    # Median of several rounds; each round is a tight loop of ``calls`` invocations
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn(**ARGS)
+        samples.append((time.perf_counter() - start) / calls * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--tool", default="generate_job_post")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # WARNING drops the tool_call/tool_result records, whose file writes would swamp the difference
+        os.environ.update({"LOG_DIR": tmp, "DATA_DIR": tmp, "LOG_WEBHOOK_URL": "", "TOOL_CACHE_TTL_SECONDS": "0", "LOG_LEVEL": "WARNING"})
+        bare = per_call_us(tool_functions()[args.tool], args.calls)
+        print(f"{'bare tool function':<28} {bare:8.2f} µs/call")
+        baseline = None
+        # "off" again last shows the run-to-run drift
+        for rate in (0, 1000, 100, 1, 0):
+            os.environ["PROFILE_SAMPLE_RATE"] = str(rate)
+            server = build_server(startup_mode="eager")
+            wrapped = server._tool_manager.get_tool(args.tool).fn
+            us = per_call_us(wrapped, args.calls)
+            baseline = us if baseline is None else baseline
+            label = "wrapper, profiling off" if rate == 0 else f"wrapper, 1 in {rate} profiled"
+            extra = "" if server.profiler is None else f"  (sampled {server.profiler.sampled}, kept {server.profiler.stats()['buffered']})"
+            print(f"{label:<28} {us:8.2f} µs/call  {us - baseline:+7.2f} vs off{extra}")
+
+        # The whole disabled-path cost, isolated from logging noise
+        profiler = None
+        start = time.perf_counter()
+        for _ in range(args.calls * 50):
+            if profiler is None:
+                pass
+        print(f"{'is None check alone':<28} {(time.perf_counter() - start) / (args.calls * 50) * 1e9:8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,505 @@
+"""Replay recorded tool traffic against the server and report throughput, latency and memory.
+
+Reads the ``tool_call`` records in ``--log-dir`` (``requests.jsonl`` and its
+rotated backups, or the segmented log with ``--segments``) and rebuilds the
+call sequence: which tools were called, in what order, how far apart and
+with which argument names. Arguments are synthesized from each tool's input
+schema in ``tool_manifest.json`` and the per-name values in ``VALUES``;
+arguments only the original caller could supply (export cursors, time
+bounds) are left out. ``batch_generate`` calls get items drawn from the
+recorded batch items. Tools that write no ``tool_call`` record
+(``get_available_tools``, ``get_cache_stats``, ``get_tool_profiles``) are
+not replayed. With no recorded calls, every tool is called in turn.
+
+Targets:
+
+- ``inprocess``: the FastMCP server behind ``server_http_sse:app``, driven
+  through in-memory MCP sessions in this process (tool wrappers, logging,
+  admission control and metrics, without the HTTP layer)
+- ``sse``: ``server_http_sse:app`` under uvicorn in a subprocess, over ``/mcp/sse``
+
+Pacing: ``--rate`` sends calls at a fixed average rate (Poisson arrivals),
+``--speed`` keeps the recorded gaps divided by the factor, and with neither
+each of the ``--concurrency`` sessions calls back to back. Latency counts
+from a call's scheduled time, so a call that waited for a free session
+includes the wait. The server logs to a temporary LOG_DIR shipped to a local
+stand-in webhook and hh.ru lookups are off, so the run needs no network.
+
+Prints completed calls per second and p50/p95/p99 per tool next to the
+recorded p50 (from ``tool_result`` durations), plus the server's RSS after
+warm-up, at its peak and at the end (for ``inprocess`` that includes the
+load generator). ``--json`` saves the report; ``--baseline`` compares it with
+a saved one and exits 1 when throughput, a tool's p95 (tools with 20+ calls)
+or memory growth is worse by more than ``--max-regression``. Compare
+closed-loop runs: with ``--rate`` or ``--speed`` the throughput is the pacing.
+
+    python benchmarks/replay_traffic.py [--log-dir hiring_logs] [--target inprocess|sse] [--calls 500] [--concurrency 8] [--rate 0] [--speed 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp import ClientSession, types
+from mcp.client.sse import sse_client
+from mcp.shared.exceptions import McpError
+
+from hiring_router_mcp.admission import ADMISSION_ERROR_CODE
+from hiring_router_mcp.lazy_tools import load_manifest
+from hiring_router_mcp.log_export import ExportFilter, iter_lines
+from hiring_router_mcp.utils import parse_moment
+
+sys.path.insert(0, os.path.dirname(__file__))
+from resume_scoring import synthetic_resume  # noqa: E402
+from sse_load import free_port, start_server  # noqa: E402
+from webhook_shipping import percentile, start_webhook  # noqa: E402
+
+ROLES = ("Python Developer", "Data Analyst", "Frontend Developer", "DevOps Engineer", "Product Manager")
+SKILLS = ("Python", "PostgreSQL", "Docker", "Kubernetes", "React", "TypeScript", "Airflow", "Go")
+TASKS = (
+    "Write a job post for a senior Python developer",
+    "Research salaries for data analysts in Moscow",
+    "Prepare me for a system design interview",
+    "Build an application form and a candidate journey",
+    "Improve my resume for a DevOps role",
+)
+
+# Synthesized value per parameter name ("tool.param" before "param"). None leaves the argument out: only
+# the original caller could supply it (route_hiring_task passes context on as the routed tool's arguments).
+# Optional parameters not listed here are left to their defaults.
+VALUES: Dict[str, Optional[Callable[[random.Random], Any]]] = {
+    "role": lambda rng: rng.choice(ROLES),
+    "target_role": lambda rng: rng.choice(ROLES),
+    "position": lambda rng: rng.choice(ROLES),
+    "query": lambda rng: rng.choice(ROLES),
+    "company": lambda rng: rng.choice(("Acme", "Globex", "Initech")),
+    "location": lambda rng: rng.choice(("Moscow", "Saint Petersburg", "Remote")),
+    "seniority": lambda rng: rng.choice(("Junior", "Middle", "Senior")),
+    "experience_years": lambda rng: rng.randint(1, 10),
+    "requirements": lambda rng: rng.sample(SKILLS, 4),
+    "responsibilities": lambda rng: ["Design and build services", "Review code", "Own production incidents"],
+    "benefits": lambda rng: ["Remote-friendly", "Learning budget", "Health insurance"],
+    "topics": lambda rng: rng.sample(("python", "sql", "algorithms", "system_design", "behavioral"), 2),
+    "difficulty": lambda rng: rng.choice(("easy", "medium", "hard", "mixed")),
+    "num_questions": lambda rng: rng.choice((5, 10, 20)),
+    "objective": lambda rng: "Build a REST API for job postings",
+    "deliverables": lambda rng: ["GitHub repo", "README"],
+    "evaluation_rubric": lambda rng: {"Code quality": 40, "Correctness": 40, "Documentation": 20},
+    "stages": lambda rng: ["Sourcing", "Application", "Screening", "Interview", "Offer"],
+    "stage": lambda rng: rng.choice(("Screening", "Interview", "Offer")),
+    "time_range": lambda rng: rng.choice(("last_24_hours", "last_7_days", "last_30_days")),
+    "generate_funnel_report.group_by": lambda rng: rng.choice(("stage", "position", "week")),
+    "get_request_analytics.group_by": lambda rng: rng.choice(("tool", "tool,event", "hour")),
+    "event": lambda rng: "tool_call",
+    "user_type": lambda rng: rng.choice(("recruiter", "candidate")),
+    "task_description": lambda rng: rng.choice(TASKS),
+    "context": None,
+    "resume_text": synthetic_resume,
+    "vacancy_text": lambda rng: f"We are hiring a {rng.choice(ROLES)} with {', '.join(rng.sample(SKILLS, 3))}",
+    "days_until_interview": lambda rng: rng.randint(1, 14),
+    "top_n": lambda rng: 5,
+    "start": None,
+    "end": None,
+    "cursor": None,
+    "tool": None,
+    "webhook_url": None,
+}
+
+# Per JSON type, for required parameters with no entry in VALUES
+TYPE_VALUES: Dict[str, Any] = {"string": "Python Developer", "integer": 1, "number": 1.0, "boolean": False, "array": [], "object": {}}
+
+DEFAULT_BATCH_ITEM = ("generate_job_post", ("company", "role", "seniority"))
+
+
+@dataclass(frozen=True)
+class Call:
+    at: float  # seconds after the first recorded call
+    tool: str
+    arg_keys: Tuple[str, ...]
+
+
+@dataclass
+class Profile:
+    calls: List[Call]
+    batch_items: List[Call]
+    batch_size: int
+    recorded_ms: Dict[str, List[float]]
+    skipped: Counter = field(default_factory=Counter)
+
+
+def load_profile(log_dir: Path, segments: bool, time_range: Optional[str], tools: Dict[str, Dict[str, Any]]) -> Profile:
+    """Recorded calls of tools the server still has, oldest first; calls made by batch_generate items apart.
+
+    A routed route_hiring_task call is logged as a ``route_hiring_task``
+    record followed by the routed tool's ``tool_call``; the latter is not
+    replayed on its own, since replaying the route makes it again.
+    """
+    flt = ExportFilter.from_args(time_range=time_range, event="tool_call,tool_result,route_hiring_task")
+    calls: List[Tuple[float, str, Tuple[str, ...]]] = []
+    items: List[Call] = []
+    batches: Counter = Counter()
+    recorded: Dict[str, List[float]] = defaultdict(list)
+    skipped: Counter = Counter()
+    routed: Counter = Counter()
+    for _, record in iter_lines(log_dir, flt, segments=segments):
+        if record["event"] == "route_hiring_task":
+            arg_keys = ("user_type", "task_description") + (("context",) if record.get("context_keys") else ())
+            calls.append((parse_moment(record["timestamp"]).timestamp(), "route_hiring_task", arg_keys))
+            if record.get("routed_to"):
+                routed[record["routed_to"]] += 1
+            continue
+        tool = record.get("tool")
+        batch_id = record.get("batch_id")
+        if tool not in tools:
+            if record["event"] == "tool_call":
+                skipped[tool] += 1
+            continue
+        if record["event"] == "tool_result":
+            if not batch_id and "duration_ms" in record:
+                recorded[tool].append(float(record["duration_ms"]))
+            continue
+        arg_keys = tuple(record.get("arg_keys") or ())
+        if batch_id:
+            batches[batch_id] += 1
+            if tool != "batch_generate":
+                items.append(Call(0.0, tool, arg_keys))
+            continue
+        if routed[tool]:
+            routed[tool] -= 1
+            continue
+        calls.append((parse_moment(record["timestamp"]).timestamp(), tool, arg_keys))
+    calls.sort()
+    first = calls[0][0] if calls else 0.0
+    return Profile(
+        calls=[Call(ts - first, tool, arg_keys) for ts, tool, arg_keys in calls],
+        batch_items=items or [Call(0.0, *DEFAULT_BATCH_ITEM)],
+        batch_size=int(statistics.median(batches.values())) if batches else 5,
+        recorded_ms=dict(recorded),
+        skipped=skipped,
+    )
+
+
+class ArgumentSynthesizer:
+    """Arguments for a replayed call from the tool's input schema and the argument names recorded for it."""
+
+    def __init__(self, tools: Dict[str, Dict[str, Any]], profile: Profile, resumes: int, rng: random.Random) -> None:
+        self.tools = tools
+        self.profile = profile
+        self.resumes = resumes
+        self.rng = rng
+        self._resume_pool = [synthetic_resume(rng) for _ in range(max(50, resumes * 2))]
+
+    def __call__(self, call: Call) -> Dict[str, Any]:
+        schema = self.tools[call.tool]["parameters"]
+        properties = schema.get("properties", {})
+        required = schema.get("required", [])
+        # Recorded names the tool no longer takes are dropped
+        names = dict.fromkeys([*required, *(name for name in call.arg_keys if name in properties)])
+        args: Dict[str, Any] = {}
+        for name in names:
+            if name == "resumes":
+                texts = self.rng.sample(self._resume_pool, self.resumes)
+                args[name] = [{"id": str(i), "text": text} for i, text in enumerate(texts)]
+            elif name == "items" and call.tool == "batch_generate":
+                picked = self.rng.choices(self.profile.batch_items, k=self.profile.batch_size)
+                args[name] = [{"tool": item.tool, "args": self(item)} for item in picked]
+            else:
+                make = VALUES.get(f"{call.tool}.{name}", VALUES.get(name, ...))
+                if make is not None and make is not ...:
+                    args[name] = make(self.rng)
+                elif name in required:
+                    args[name] = TYPE_VALUES.get(_json_type(properties[name]), "")
+        return args
+
+
+def _json_type(schema: Dict[str, Any]) -> Optional[str]:
+    for option in schema.get("anyOf", [schema]):
+        if option.get("type") not in (None, "null"):
+            return option["type"]
+    return None
+
+
+def build_plan(profile: Profile, tools: Dict[str, Dict[str, Any]], args: argparse.Namespace, rng: random.Random) -> List[Tuple[float, Call]]:
+    """``(seconds after start, call)`` pairs, cycling through the recorded calls until ``--calls`` are planned."""
+    calls = profile.calls or [
+        Call(float(i), name, tuple(entry["parameters"].get("properties", {}))) for i, (name, entry) in enumerate(tools.items())
+    ]
+    count = args.calls or len(calls)
+    if args.rate > 0:
+        plan, at = [], 0.0
+        for i in range(count):
+            plan.append((at, calls[i % len(calls)]))
+            at += rng.expovariate(args.rate)
+        return plan
+    if args.speed > 0:
+        # One average gap between the end of the recording and its next repetition
+        cycle = calls[-1].at * len(calls) / max(1, len(calls) - 1) or 1.0
+        return [(((i // len(calls)) * cycle + calls[i % len(calls)].at) / args.speed, calls[i % len(calls)]) for i in range(count)]
+    return [(0.0, calls[i % len(calls)]) for i in range(count)]
+
+
+def rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+class Results:
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.outcomes: Dict[str, Counter] = defaultdict(Counter)
+        self.first_error: Dict[str, str] = {}
+
+    async def call(self, session: ClientSession, call: Call, args: Dict[str, Any], scheduled: Optional[float]) -> None:
+        loop = asyncio.get_running_loop()
+        start = scheduled if scheduled is not None else loop.time()
+        try:
+            result = await session.call_tool(call.tool, args)
+            outcome = "error" if result.isError else "ok"
+            message = getattr(result.content[0], "text", "") if result.isError and result.content else ""
+        except McpError as exc:
+            outcome = "shed" if exc.error.code == ADMISSION_ERROR_CODE else "error"
+            message = exc.error.message
+        self.outcomes[call.tool][outcome] += 1
+        if outcome == "ok":
+            self.latencies[call.tool].append((loop.time() - start) * 1000)
+        elif outcome == "error":
+            self.first_error.setdefault(call.tool, message[:200])
+
+
+async def open_sessions(stack: AsyncExitStack, target: Any, count: int, client_id: str) -> List[ClientSession]:
+    sessions = []
+    for _ in range(count):
+        if isinstance(target, str):
+            read, write = await stack.enter_async_context(
+                sse_client(target, headers={"X-Client-Id": client_id}, timeout=30, sse_read_timeout=300)
+            )
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+        else:
+            from mcp.shared.memory import create_connected_server_and_client_session
+
+            session = await stack.enter_async_context(
+                create_connected_server_and_client_session(target, client_info=types.Implementation(name=client_id, version="1"))
+            )
+        sessions.append(session)
+    return sessions
+
+
+async def replay(
+    target: Any, plan: List[Tuple[float, Call]], synth: ArgumentSynthesizer, args: argparse.Namespace, pid: Optional[int]
+) -> Dict[str, Any]:
+    """Warm up with one call per planned tool, then run ``plan`` and return the report."""
+    paced = args.rate > 0 or args.speed > 0
+    results = Results()
+    async with AsyncExitStack() as stack:
+        sessions = await open_sessions(stack, target, args.concurrency, args.client_id)
+        warmup = Results()
+        for call in {call.tool: call for _, call in plan}.values():
+            await warmup.call(sessions[0], call, synth(call), None)
+        memory = {"start": rss_mb(pid), "peak": rss_mb(pid)}
+
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+
+        async def dispatch() -> None:
+            begin = loop.time()
+            for at, call in plan:
+                if paced:
+                    delay = begin + at - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                # Arguments are synthesized here, so their cost stays out of the measured latency
+                queue.put_nowait((begin + at if paced else None, call, synth(call)))
+            for _ in sessions:
+                queue.put_nowait(None)
+
+        async def work(session: ClientSession) -> None:
+            while (item := await queue.get()) is not None:
+                scheduled, call, call_args = item
+                await results.call(session, call, call_args, scheduled)
+
+        async def sample_memory() -> None:
+            while True:
+                await asyncio.sleep(0.5)
+                current = rss_mb(pid)
+                if current is not None:
+                    memory["peak"] = max(memory["peak"] or 0.0, current)
+
+        sampler = asyncio.create_task(sample_memory())
+        started = time.perf_counter()
+        await asyncio.gather(dispatch(), *(work(session) for session in sessions))
+        elapsed = time.perf_counter() - started
+        sampler.cancel()
+        memory["end"] = rss_mb(pid)
+
+    completed = sum(len(values) for values in results.latencies.values())
+    tools = {}
+    for tool in sorted(results.outcomes):
+        done = results.latencies[tool]
+        recorded = synth.profile.recorded_ms.get(tool)
+        tools[tool] = {
+            "calls": sum(results.outcomes[tool].values()),
+            "errors": results.outcomes[tool]["error"],
+            "shed": results.outcomes[tool]["shed"],
+            "p50_ms": round(percentile(done, 0.5), 2) if done else None,
+            "p95_ms": round(percentile(done, 0.95), 2) if done else None,
+            "p99_ms": round(percentile(done, 0.99), 2) if done else None,
+            "recorded_p50_ms": round(percentile(recorded, 0.5), 2) if recorded else None,
+            "first_error": results.first_error.get(tool),
+        }
+    return {
+        "target": args.target,
+        "calls": len(plan),
+        "concurrency": args.concurrency,
+        "seconds": round(elapsed, 3),
+        "throughput": round(completed / elapsed, 2),
+        "tools": tools,
+        "memory_mb": {name: round(value, 1) if value is not None else None for name, value in memory.items()},
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{report['target']}: {report['calls']} calls over {report['concurrency']} sessions in {report['seconds']:.1f}s,"
+        f" {report['throughput']:.1f} completed calls/s"
+    )
+    print(f"  {'tool':<27} {'calls':>6} {'errors':>6} {'shed':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'recorded p50':>13}")
+
+    def ms(value: Optional[float]) -> str:
+        return f"{value:.1f}" if value is not None else "-"
+
+    for tool, row in report["tools"].items():
+        print(
+            f"  {tool:<27} {row['calls']:>6} {row['errors']:>6} {row['shed']:>5} {ms(row['p50_ms']):>8}"
+            f" {ms(row['p95_ms']):>8} {ms(row['p99_ms']):>8} {ms(row['recorded_p50_ms']):>13}"
+        )
+    for tool, row in report["tools"].items():
+        if row["first_error"]:
+            print(f"  {tool} error: {row['first_error']}")
+    memory = report["memory_mb"]
+    if memory["start"] is not None:
+        print(
+            f"  RSS {memory['start']:.1f} MB after warm-up, peak {memory['peak']:.1f} MB,"
+            f" end {memory['end']:.1f} MB ({memory['end'] - memory['start']:+.1f} MB)"
+        )
+    if "webhook_records" in report:
+        print(f"  log webhook received {report['webhook_records']} records")
+
+
+def regressions(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_calls: int = 20) -> List[str]:
+    """Ways ``report`` is worse than ``baseline`` by more than ``tolerance`` (a fraction)."""
+    found = []
+    if report["throughput"] < baseline["throughput"] * (1 - tolerance):
+        found.append(f"throughput {report['throughput']:.1f} calls/s vs {baseline['throughput']:.1f}")
+    for tool, row in report["tools"].items():
+        base = baseline["tools"].get(tool)
+        if not base or row["p95_ms"] is None or base["p95_ms"] is None or min(row["calls"], base["calls"]) < min_calls:
+            continue
+        if row["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            found.append(f"{tool} p95 {row['p95_ms']:.1f} ms vs {base['p95_ms']:.1f} ms")
+    memory, base_memory = report["memory_mb"], baseline["memory_mb"]
+    if None not in (memory["start"], memory["end"], base_memory["start"], base_memory["end"]):
+        growth, base_growth = memory["end"] - memory["start"], base_memory["end"] - base_memory["start"]
+        # Growth of a few MB is allocator noise
+        if growth > max(base_growth * (1 + tolerance), base_growth + 10.0):
+            found.append(f"memory growth {growth:+.1f} MB vs {base_growth:+.1f} MB")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--log-dir", default=os.getenv("LOG_DIR", "hiring_logs"), help="recorded logs to replay")
+    parser.add_argument("--segments", action="store_true", help="read the segmented binary log instead of requests.jsonl")
+    parser.add_argument("--time-range", default=None, help="replay only this window, e.g. last_7_days")
+    parser.add_argument("--target", choices=("inprocess", "sse"), default="inprocess")
+    parser.add_argument("--calls", type=int, default=500, help="calls to replay (0 = the recording once)")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent MCP sessions")
+    parser.add_argument("--rate", type=float, default=0.0, help="calls per second (Poisson arrivals)")
+    parser.add_argument("--speed", type=float, default=0.0, help="replay the recorded gaps this many times faster")
+    parser.add_argument("--resumes", type=int, default=20, help="resumes per shortlist_resumes call")
+    parser.add_argument("--mode", choices=("sync", "async"), default="async", help="TOOL_EXECUTION_MODE of the server")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE", help="extra server setting (repeatable)")
+    parser.add_argument("--client-id", default="replay", help="X-Client-Id / clientInfo name of the replay sessions")
+    parser.add_argument("--webhook-delay-ms", type=float, default=5.0, help="response delay of the stand-in log webhook")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", dest="json_path", help="write the report here")
+    parser.add_argument("--baseline", help="report saved with --json to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="tolerated slowdown as a fraction")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tools = load_manifest()
+    profile = load_profile(Path(args.log_dir), args.segments, args.time_range, tools)
+    if profile.calls:
+        mix = Counter(call.tool for call in profile.calls)
+        span = profile.calls[-1].at
+        print(f"{len(profile.calls)} recorded calls of {len(mix)} tools over {span:.0f}s in {args.log_dir}")
+        print("  mix: " + ", ".join(f"{tool} {count}" for tool, count in mix.most_common()))
+    else:
+        print(f"no recorded tool calls in {args.log_dir}; calling every tool in turn")
+    if profile.skipped:
+        print("  skipped (no longer a tool): " + ", ".join(f"{tool} {count}" for tool, count in profile.skipped.items()))
+    plan = build_plan(profile, tools, args, rng)
+    synth = ArgumentSynthesizer(tools, profile, args.resumes, rng)
+
+    webhook, received = start_webhook(args.webhook_delay_ms / 1000)
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            "LOG_DIR": tmp,
+            "DATA_DIR": tmp,
+            "LOG_WEBHOOK_URL": f"http://127.0.0.1:{webhook.server_address[1]}/",
+            "LOG_WEBHOOK_MODE": "batch",
+            "LOG_CLIENT_ID": "",
+            "HH_API_ENABLED": "0",
+            "HH_API_KEY": "",
+            "TOOL_EXECUTION_MODE": args.mode,
+            "RESUME_MAX_BATCH": str(max(1000, args.resumes)),
+            **dict(item.split("=", 1) for item in args.env),
+        }
+        if args.target == "sse":
+            port = free_port()
+            proc = start_server(port, env)
+            try:
+                report = asyncio.run(replay(f"http://127.0.0.1:{port}/mcp/sse", plan, synth, args, proc.pid))
+            finally:
+                proc.terminate()
+                proc.wait()
+        else:
+            os.environ.update(env)
+            from hiring_router_mcp.server_http_sse import _server
+
+            report = asyncio.run(replay(_server, plan, synth, args, None))
+        # Batched records still queued in-process are flushed at exit, after this count
+        report["webhook_records"] = received["lines"]
+    webhook.shutdown()
+
+    print_report(report)
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.baseline:
+        found = regressions(report, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.max_regression)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
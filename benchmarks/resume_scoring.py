@@ -0,0 +1,103 @@
+"""Resume analysis throughput: single resumes inline, and bulk shortlists over the process pool.
+
+Generates synthetic resumes (English and Russian, 150-900 words, varied
+sections, skills and date formats), then reports:
+
+- ``analyze_resume`` throughput on one core
+- ``rank_resumes`` throughput for each worker count, and per core, after a
+  warm-up batch has started the pool (the cold first batch is shown separately)
+
+    python benchmarks/resume_scoring.py [--resumes 2000] [--workers 1,2,4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+SKILLS = (
+    "Python", "Django", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "Redis", "Celery", "Git", "Linux", "SQL",
+    "asyncio", "pytest", "Kafka", "React", "TypeScript", "AWS", "Terraform", "Grafana", "ClickHouse",
+)
+TITLES = ("Python Developer", "Senior Backend Engineer", "Software Engineer", "Team Lead", "Разработчик Python", "Ведущий инженер")
+BULLETS = (
+    "Built a {s} service handling {n}k rps",
+    "Reduced infrastructure costs by {n}% after moving to {s}",
+    "Mentored {n} engineers and ran code reviews",
+    "Worked on internal tools with {s}",
+    "Developed REST API used by {n}k users",
+    "Responsible for {s} maintenance",
+    "Внедрил {s}, сократил время релиза на {n}%",
+    "Поддержка сервисов на {s}",
+)
+FILLER = "Collaborated with product and design teams on roadmap planning and delivery of customer-facing features."
+
+
+def synthetic_resume(rng: random.Random) -> str:
+    lines = [f"Candidate {rng.randint(1, 10**6)}"]
+    if rng.random() < 0.8:
+        lines.append(f"candidate{rng.randint(1, 999)}@example.com | +7 (9{rng.randint(10, 99)}) {rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(10, 99)}")
+    lines += ["", "Summary", " ".join([FILLER] * rng.randint(1, 4)), "", rng.choice(("Experience", "Work experience", "Опыт работы"))]
+    year = 2024
+    for _ in range(rng.randint(1, 5)):
+        start = year - rng.randint(1, 4)
+        span = rng.choice((f"{rng.randint(1, 12):02d}.{start} - {rng.randint(1, 12):02d}.{year}", f"{start} – {year}", f"Jan {start} — Dec {year}"))
+        lines.append(f"{rng.choice(TITLES)} at Company{rng.randint(1, 500)}, {span}")
+        for _ in range(rng.randint(2, 6)):
+            lines.append("- " + rng.choice(BULLETS).format(s=rng.choice(SKILLS), n=rng.randint(2, 90)))
+        lines.append(" ".join([FILLER] * rng.randint(0, 6)))
+        year = start
+    if rng.random() < 0.8:
+        lines += ["", "Education", f"State University, Computer Science, {year - 5} – {year - 1}"]
+    if rng.random() < 0.9:
+        lines += ["", "Skills: " + ", ".join(rng.sample(SKILLS, rng.randint(3, 12)))]
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--workers", default=None, help="comma-separated worker counts (default: 1,2,4..cpu count)")
+    args = parser.parse_args()
+
+    cores = multiprocessing.cpu_count()
+    counts = [int(w) for w in args.workers.split(",")] if args.workers else sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i < cores], cores})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({"LOG_DIR": tmp, "DATA_DIR": tmp, "LOG_WEBHOOK_URL": ""})
+        from hiring_router_mcp.resume_analysis import analyze_resume, rank_resumes, role_profile
+
+        rng = random.Random(7)
+        resumes = [(str(i), synthetic_resume(rng)) for i in range(args.resumes)]
+        words = sum(len(text.split()) for _, text in resumes) / len(resumes)
+        profile = role_profile("Senior Python Developer", "We need Python, FastAPI, PostgreSQL and Kubernetes")
+        print(f"{len(resumes)} resumes, {words:.0f} words on average; {cores} CPU(s); profile {profile.source}")
+
+        start = time.perf_counter()
+        for _, text in resumes:
+            analyze_resume(text, profile)
+        elapsed = time.perf_counter() - start
+        print(f"  analyze_resume inline      {len(resumes) / elapsed:8.0f} resumes/s  {elapsed / len(resumes) * 1e6:7.0f} µs/resume")
+
+        for workers in counts:
+            start = time.perf_counter()
+            rank_resumes(resumes[:200], profile, workers=workers)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            result = rank_resumes(resumes, profile, top_n=10, workers=workers)
+            elapsed = time.perf_counter() - start
+            rate = len(resumes) / elapsed
+            print(
+                f"  rank_resumes workers={workers:<3} {rate:8.0f} resumes/s  {rate / min(workers, cores):8.0f} /s per core"
+                f"  ({result['mode']}, first batch of 200 {cold * 1000:6.0f} ms)"
+            )
+        top = result["shortlist"][0]
+        print(f"  top candidate: score {top['score']}, keyword {top['keyword_score']}, ATS {top['ats_score']}, {top['experience_years']} years")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Micro-benchmark: compiled keyword router vs chained ``any(k in text ...)`` scans.
+
+Runs over a corpus of long, realistic task descriptions (English and Russian)
+and repeats the measurement with synthetic routing tables of growing size to
+show that per-description cost of the compiled router stays flat.
+
+    python benchmarks/routing.py [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from hiring_router_mcp.routing import DEFAULT_ROUTING_TABLE, KeywordRouter, Route, RouteTable
+
+CORPUS = [
+    "We are a fintech startup in Berlin hiring our first senior backend engineer. Before we open the role "
+    "we want to understand what competitors pay, how many similar openings exist and which stack is most "
+    "common, then draft the public posting and a short take-home.",
+    "Нам нужно закрыть вакансию Python разработчика в Москве. Помогите понять рынок: сколько сейчас открытых "
+    "позиций на hh.ru, какие зарплаты предлагают конкуренты и какие навыки чаще всего требуются. "
+    "Затем подготовьте описание вакансии и тестовое задание.",
+    "Please put together a structured candidate journey for our data team: sourcing, screening call, technical "
+    "interview loop, reference checks and offer, with expected durations for each step of the process.",
+    "Готовлю отчёт для руководства по воронке найма за прошлый квартал: конверсия по этапам, время на этапе, "
+    "где теряем кандидатов. Нужна помощь со структурой funnel report и ключевыми метриками.",
+    "I'm a candidate preparing for a staff engineer interview next week; I need a prep plan covering system "
+    "design questions, behavioral stories and a realistic salary range to negotiate.",
+    "Create an application form for a QA automation position with fields for portfolio, GitHub profile and "
+    "availability, wired into our existing n8n workflow so recruiters get notified.",
+]
+
+
+def legacy_route(user_type: str, normalized: str) -> str | None:
+    table = DEFAULT_ROUTING_TABLE.get(user_type) or DEFAULT_ROUTING_TABLE["candidate"]
+    for route in table.routes:
+        if any(k in normalized for k in list(route.keywords)):
+            return route.name
+    return table.fallback
+
+
+def synthetic_table(num_routes: int, keywords_per_route: int = 4, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    routes = list(DEFAULT_ROUTING_TABLE["recruiter"].routes)
+    while len(routes) < num_routes:
+        words = tuple(
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+            for _ in range(keywords_per_route)
+        )
+        routes.append(Route(f"route_{len(routes)}", words))
+    return {"recruiter": RouteTable(routes=tuple(routes))}
+
+
+def time_per_description(fn, repeat: int) -> float:
+    texts = [t.lower() for t in CORPUS] * repeat
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return (time.perf_counter() - start) / len(texts) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"corpus: {len(CORPUS)} descriptions, avg {sum(map(len, CORPUS)) // len(CORPUS)} chars")
+    print(f"{'routes':>7} {'keywords':>9} {'chained any() us':>17} {'compiled us':>12}")
+    for num_routes in (7, 35, 140, 560):
+        tables = synthetic_table(num_routes)
+        router = KeywordRouter(tables)
+        routes = tables["recruiter"].routes
+
+        def chained(text: str) -> str | None:
+            for route in routes:
+                if any(k in text for k in list(route.keywords)):
+                    return route.name
+            return None
+
+        def unrouted_chained(text: str) -> None:
+            # Worst case for the chain: no early exit, every route is scanned
+            for route in routes:
+                any(k in text for k in list(route.keywords))
+
+        keywords = sum(len(r.keywords) for r in routes)
+        legacy_us = time_per_description(unrouted_chained, args.repeat)
+        compiled_us = time_per_description(lambda text: router.match("recruiter", text), args.repeat)
+        print(f"{num_routes:>7} {keywords:>9} {legacy_us:>17.2f} {compiled_us:>12.2f}")
+
+    default_router = KeywordRouter()
+    for text in CORPUS:
+        for user_type in ("recruiter", "candidate"):
+            m = default_router.match(user_type, text)
+            print(f"{user_type:>9}: legacy={legacy_route(user_type, text.lower())!s:<28} compiled={m.route!s:<28} "
+                  f"score={m.score} keywords={list(m.matched_keywords)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark the columnar salary engine at 10k / 100k / 1M vacancies.
+
+Compares ``salary_bands`` on a :class:`VacancyFrame` with a per-row Python
+implementation (normalize each vacancy, bucket it, ``statistics.quantiles``
+per bucket). The Python baseline is skipped above 100k rows.
+
+    python benchmarks/salary_stats.py [--sizes 10000,100000,1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from hiring_router_mcp.salary_stats import (
+    CURRENCIES,
+    DEFAULT_RATES,
+    EXPERIENCE_BUCKETS,
+    INCOME_TAX,
+    VacancyFrame,
+    salary_bands,
+)
+
+
+def synthetic_frame(n: int, seed: int = 0) -> VacancyFrame:
+    rng = np.random.default_rng(seed)
+    experience = rng.integers(0, len(EXPERIENCE_BUCKETS), n).astype(np.int8)
+    base = np.array([80_000, 150_000, 250_000, 350_000])[experience] * rng.lognormal(0, 0.25, n)
+    currency = np.where(rng.random(n) < 0.9, 0, rng.integers(1, 3, n)).astype(np.int8)
+    per_rur = np.array([DEFAULT_RATES[c] for c in CURRENCIES])[currency]
+    salary_from = np.round(base * per_rur, -3)
+    salary_to = salary_from * rng.choice([1.0, 1.2, 1.5], n)
+    salary_from[rng.random(n) < 0.15] = np.nan
+    salary_to[rng.random(n) < 0.30] = np.nan
+    no_salary = rng.random(n) < 0.25
+    salary_from[no_salary] = np.nan
+    salary_to[no_salary] = np.nan
+    region = rng.choice([1, 2, 88, 4], n).astype(np.int32)
+    gross = rng.random(n) < 0.5
+    return VacancyFrame(salary_from, salary_to, currency, experience, region, gross)
+
+
+def python_bands(frame: VacancyFrame) -> dict:
+    rows = zip(
+        frame.salary_from.tolist(), frame.salary_to.tolist(), frame.currency.tolist(),
+        frame.experience.tolist(), frame.gross.tolist(),
+    )
+    buckets: dict = {}
+    for low, high, currency, experience, gross in rows:
+        low = None if low != low else low
+        high = None if high != high else high
+        if low is None and high is None:
+            continue
+        mid = (low + high) / 2 if low is not None and high is not None else (low if low is not None else high)
+        rub = mid / DEFAULT_RATES[CURRENCIES[currency]]
+        if gross:
+            rub *= 1 - INCOME_TAX
+        buckets.setdefault(experience, []).append(rub)
+    return {k: statistics.quantiles(v, n=4, method="inclusive") for k, v in buckets.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'numpy ms':>9} {'python ms':>10} {'speedup':>8}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        frame = synthetic_frame(n)
+        start = time.perf_counter()
+        salary_bands(frame)
+        numpy_ms = (time.perf_counter() - start) * 1000
+        if n <= 100_000:
+            start = time.perf_counter()
+            python_bands(frame)
+            python_ms = (time.perf_counter() - start) * 1000
+            print(f"{n:>9} {numpy_ms:>9.1f} {python_ms:>10.1f} {python_ms / numpy_ms:>7.1f}x")
+        else:
+            print(f"{n:>9} {numpy_ms:>9.1f} {'-':>10} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Accuracy and latency of the semantic router against the keyword router.
+
+Scores both routers over the labelled descriptions in
+``fixtures/routing_labelled.json`` (English and Russian, none of them among the
+router's example utterances), sweeps the confidence threshold, and times
+index build, index load from disk and per-description routing.
+
+    python benchmarks/semantic_routing.py [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from hiring_router_mcp.routing import KeywordRouter
+from hiring_router_mcp.semantic_routing import DEFAULT_CONFIDENCE, SemanticIndex, SemanticRouter, route_examples
+
+FIXTURE = Path(__file__).parent / "fixtures" / "routing_labelled.json"
+
+
+def accuracy(router, samples: list[dict]) -> tuple[float, Counter]:
+    misses: Counter = Counter()
+    for sample in samples:
+        routed = router.match(sample["user_type"], sample["text"]).route
+        if routed != sample["route"]:
+            misses[(sample["route"], routed)] += 1
+    return 1 - sum(misses.values()) / len(samples), misses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    samples = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    keywords = KeywordRouter()
+    examples = route_examples(keywords.tables)
+
+    start = time.perf_counter()
+    index = SemanticIndex.build(examples)
+    build_ms = (time.perf_counter() - start) * 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "routing_index.npz"
+        index.save(path)
+        start = time.perf_counter()
+        SemanticIndex.load_or_build(path, examples)
+        load_ms = (time.perf_counter() - start) * 1000
+    print(f"index: {len(index.vocabulary)} terms, build {build_ms:.1f} ms, load {load_ms:.1f} ms")
+
+    print(f"{len(samples)} labelled descriptions")
+    keyword_accuracy, _ = accuracy(keywords, samples)
+    print(f"  keyword router:            accuracy {keyword_accuracy:6.1%}")
+    for threshold in (0.05, DEFAULT_CONFIDENCE, 0.15, 0.25, 0.35, 0.5):
+        router = SemanticRouter(keywords, index, threshold)
+        semantic_accuracy, _ = accuracy(router, samples)
+        engines = Counter(router.match(s["user_type"], s["text"]).engine for s in samples)
+        print(f"  semantic, threshold {threshold:4.2f}:  accuracy {semantic_accuracy:6.1%}  "
+              f"(semantic {engines['semantic']}, keyword fallback {engines['keyword']})")
+    router = SemanticRouter(keywords, index, DEFAULT_CONFIDENCE)
+    _, semantic_misses = accuracy(router, samples)
+    for (expected, routed), count in sorted(semantic_misses.items(), key=str):
+        print(f"    miss at {DEFAULT_CONFIDENCE}: {expected} -> {routed} x{count}")
+
+    texts = [(s["user_type"], s["text"]) for s in samples] * args.repeat
+    for label, fn in (("keyword", keywords.match), ("semantic", router.match)):
+        start = time.perf_counter()
+        for user_type, text in texts:
+            fn(user_type, text)
+        print(f"  {label:<8} {(time.perf_counter() - start) / len(texts) * 1e6:7.1f} µs/description")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Build a skill index over synthetic job posts and time top-k and coverage queries.
+
+Documents are generated from per-role skill vocabularies (English and Russian
+phrasing) and ingested in batches, as the hh.ru fetcher does.
+
+    python benchmarks/skill_index.py [--docs 200000] [--batch 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from hiring_router_mcp.skill_index import SkillIndex
+
+ROLES = {
+    "Python Developer": ["Python", "Django", "FastAPI", "PostgreSQL", "Docker", "asyncio", "Celery", "Redis", "REST API"],
+    "Frontend Developer": ["JavaScript", "TypeScript", "React", "Redux", "webpack", "CSS", "HTML", "Next.js", "Jest"],
+    "Data Engineer": ["Python", "SQL", "Airflow", "Spark", "Kafka", "ClickHouse", "dbt", "Hadoop", "ETL"],
+    "QA Engineer": ["Selenium", "pytest", "Postman", "API testing", "SQL", "Jira", "CI/CD", "Playwright"],
+    "DevOps Engineer": ["Kubernetes", "Docker", "Terraform", "Ansible", "Prometheus", "Grafana", "Linux", "GitLab CI"],
+}
+TEMPLATES = [
+    "Опыт коммерческой разработки от 3 лет. Уверенное знание {a} и {b}. Будет плюсом опыт с {c}.",
+    "Strong experience with {a}, {b} and {c}. Familiarity with {d} is a plus.",
+    "Разработка и поддержка сервисов на {a}; работа с {b}, {c}, {d}.",
+    "You will design systems using {a} and {b}, write tests, and mentor engineers on {c}.",
+]
+SENIORITY = ["Senior", "Middle", "Junior", "Lead", "Старший", ""]
+
+
+def documents(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    roles = list(ROLES)
+    for i in range(n):
+        role = rng.choice(roles)
+        skills = rng.sample(ROLES[role], 4)
+        text = rng.choice(TEMPLATES).format(a=skills[0], b=skills[1], c=skills[2], d=skills[3])
+        yield f"bench:{i}", f"{rng.choice(SENIORITY)} {role}".strip(), text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "skill_index.sqlite"
+        index = SkillIndex(path)
+        start = time.perf_counter()
+        batch = []
+        for doc in documents(args.docs):
+            batch.append(doc)
+            if len(batch) >= args.batch:
+                index.add_documents(batch)
+                batch = []
+        if batch:
+            index.add_documents(batch)
+        build = time.perf_counter() - start
+        print(f"ingest: {args.docs} docs in {build:.1f}s ({args.docs / build:,.0f} docs/s), "
+              f"{path.stat().st_size / 1e6:.1f} MB")
+
+        resume = "Backend developer: 5 years of Python, Django and PostgreSQL; built REST API services, Docker."
+        for label, fn in (
+            ("top_terms(k=20)", lambda: index.top_terms("Senior Python Developer", 20)),
+            ("coverage(k=30)", lambda: index.coverage("Python Developer", resume)),
+        ):
+            samples = []
+            for _ in range(200):
+                t = time.perf_counter()
+                fn()
+                samples.append((time.perf_counter() - t) * 1000)
+            print(f"{label:>16}: median {statistics.median(samples):.3f}ms max {max(samples):.3f}ms")
+        print(index.top_terms("Python Developer", 8, unigrams_only=True))
+        print(index.coverage("Python Developer", resume))
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Load test the HTTP/SSE app with concurrent MCP sessions.
+
+Starts ``server_http_sse:app`` under uvicorn in a subprocess (once per
+execution mode), points its log webhook at a local stand-in with an
+artificial delay, opens N concurrent SSE sessions with the MCP client and
+measures per-call latency of ``tools/call``.
+
+    python benchmarks/sse_load.py [--sessions 80] [--calls 10] [--modes sync,async]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+sys.path.insert(0, os.path.dirname(__file__))
+from webhook_shipping import percentile, start_webhook  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, env: dict, extra_args: tuple = ()) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "hiring_router_mcp.server_http_sse:app", "--port", str(port), "--log-level", "warning", *extra_args],
+        env={**os.environ, **env},
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+async def session_worker(url: str, calls: int, tool: str, latencies: list[float]) -> None:
+    async with sse_client(url, timeout=30, sse_read_timeout=300) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            for i in range(calls):
+                start = time.perf_counter()
+                await session.call_tool(tool, {"role": f"Role {i}"})
+                latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def run_load(url: str, sessions: int, calls: int, tool: str) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(session_worker(url, calls, tool, latencies) for _ in range(sessions)))
+    return latencies, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=80)
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--tool", default="generate_job_post")
+    parser.add_argument("--delay-ms", type=float, default=20.0)
+    parser.add_argument("--modes", default="sync,async")
+    args = parser.parse_args()
+
+    webhook, _ = start_webhook(args.delay_ms / 1000)
+    webhook_url = f"http://127.0.0.1:{webhook.server_address[1]}/"
+    try:
+        for mode in args.modes.split(","):
+            port = free_port()
+            with tempfile.TemporaryDirectory() as log_dir:
+                proc = start_server(
+                    port,
+                    {"TOOL_EXECUTION_MODE": mode, "LOG_WEBHOOK_URL": webhook_url, "LOG_DIR": log_dir},
+                )
+                try:
+                    latencies, wall = asyncio.run(
+                        run_load(f"http://127.0.0.1:{port}/mcp/sse", args.sessions, args.calls, args.tool)
+                    )
+                finally:
+                    proc.terminate()
+                    proc.wait(timeout=30)
+            print(
+                f"{mode:>6}: sessions={args.sessions} calls={len(latencies)} "
+                f"p50={statistics.median(latencies):8.1f}ms p99={percentile(latencies, 0.99):8.1f}ms "
+                f"throughput={len(latencies) / wall:7.1f}/s"
+            )
+    finally:
+        webhook.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Streaming tool progress over /mcp/sse, and what a client disconnect costs.
+
+Starts the HTTP/SSE app in-process and calls ``shortlist_resumes`` on
+synthetic resumes over a raw SSE session, then reports:
+
+- call latency without a progressToken (no notifications) and with one,
+  plus the notifications received
+- after disconnecting once the first progress notification arrives: the
+  logged ``tool_cancelled`` record and how long the tool kept running
+
+    python benchmarks/streaming_progress.py [--resumes 3000] [--mode sync|async]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from resume_scoring import synthetic_resume  # noqa: E402
+
+PORT = 8799
+
+
+async def open_session(client):
+    """GET /mcp/sse, initialize, and return ``(response, lines, post)``."""
+    response = await client.send(client.build_request("GET", "/mcp/sse"), stream=True)
+    lines = response.aiter_lines()
+    async for line in lines:
+        if line.startswith("data:"):
+            endpoint = line[5:].strip()
+            break
+
+    async def post(body):
+        (await client.post(endpoint, json=body)).raise_for_status()
+
+    await post({"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {
+        "protocolVersion": "2025-03-26", "capabilities": {}, "clientInfo": {"name": "bench", "version": "1"},
+    }})
+    await post({"jsonrpc": "2.0", "method": "notifications/initialized"})
+    return response, lines, post
+
+
+async def call(lines, post, request_id, arguments, token=None, stop_after=None):
+    params = {"name": "shortlist_resumes", "arguments": arguments}
+    if token:
+        params["_meta"] = {"progressToken": token}
+    start = time.perf_counter()
+    await post({"jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": params})
+    notifications = 0
+    async for line in lines:
+        if not line.startswith("data:"):
+            continue
+        message = json.loads(line[5:])
+        if message.get("method") == "notifications/progress":
+            notifications += 1
+            if stop_after and notifications >= stop_after:
+                break
+        elif message.get("id") == request_id:
+            break
+    return time.perf_counter() - start, notifications
+
+
+async def run(args, log_dir: Path) -> None:
+    import httpx
+    import uvicorn
+
+    from hiring_router_mcp.server_http_sse import app
+
+    server = uvicorn.Server(uvicorn.Config(app, port=PORT, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    rng = random.Random(7)
+    # Trimmed so the request stays under the 4 MB body limit
+    resumes = [{"id": str(i), "text": synthetic_resume(rng)[:900]} for i in range(args.resumes)]
+    arguments = {"resumes": resumes, "target_role": "Python Developer"}
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", timeout=120, follow_redirects=True) as client:
+        response, lines, post = await open_session(client)
+        await call(lines, post, 1, {**arguments, "resumes": resumes[:100]})
+        plain, _ = await call(lines, post, 2, arguments)
+        streamed, notifications = await call(lines, post, 3, arguments, token="p3")
+        print(f"{args.resumes} resumes, TOOL_EXECUTION_MODE={args.mode}")
+        print(f"  without progressToken {plain * 1000:8.0f} ms")
+        print(f"  with progressToken    {streamed * 1000:8.0f} ms  ({notifications} progress notifications)")
+
+        response, lines, post = await open_session(client)
+        elapsed, _ = await call(lines, post, 4, arguments, token="p4", stop_after=1)
+        await response.aclose()
+        print(f"  disconnected {elapsed * 1000:.0f} ms into the call (after the first notification)")
+
+    await asyncio.sleep(max(1.0, plain * 2))
+    records = [json.loads(line) for path in log_dir.glob("*.jsonl") for line in path.read_text().splitlines()]
+    cancelled = [r for r in records if r.get("event") == "tool_cancelled"]
+    for record in cancelled:
+        print(f"  tool_cancelled reason={record['reason']} after {record['duration_ms']} ms"
+              f" (a full call takes {plain * 1000:.0f} ms)")
+    if not cancelled:
+        print("  no tool_cancelled record: the call ran to completion")
+    server.should_exit = True
+    await serving
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=3000)
+    parser.add_argument("--mode", choices=("sync", "async"), default="sync")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({
+            "LOG_DIR": tmp, "DATA_DIR": tmp, "LOG_WEBHOOK_URL": "",
+            "TOOL_EXECUTION_MODE": args.mode, "RESUME_MAX_BATCH": str(args.resumes),
+        })
+        asyncio.run(run(args, Path(tmp)))
+
+
+if __name__ == "__main__":
+    main()
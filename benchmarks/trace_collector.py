@@ -0,0 +1,165 @@
+"""Local OTLP/HTTP collector stand-in, plus a look at where composite calls spend their time.
+
+Starts a tiny ``/v1/traces`` receiver and the hh.ru stub, builds the server with
+``TRACING_EXPORTER=otlp`` pointed at the receiver, and drives
+``route_hiring_task`` (routed to ``market_research``, which calls hh.ru)
+through an in-memory MCP client session, so every span from the
+``tools/call`` request down to the upstream HTTP requests is exported. Prints
+one trace as a tree and the average time per span name across all of them,
+then compares per-call latency with tracing off and on.
+
+    python benchmarks/trace_collector.py [--calls 50] [--delay-ms 20]
+
+The receiver alone (``--serve``) is handy as a local collector while developing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hh_stub import start_stub  # noqa: E402
+
+ARGS = {
+    "user_type": "recruiter",
+    "task_description": "help me price a senior backend role",
+    "context": {"role": "Python Developer", "location": "Москва"},
+}
+
+
+def start_collector(port: int = 0) -> tuple[ThreadingHTTPServer, list]:
+    spans: list = []
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            with lock:
+                for resource in payload.get("resourceSpans", []):
+                    for scope in resource.get("scopeSpans", []):
+                        spans.extend(scope.get("spans", []))
+            body = b"{}"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, spans
+
+
+def duration_ms(span: dict) -> float:
+    return (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+
+
+def print_tree(spans: list) -> None:
+    children = defaultdict(list)
+    for span in spans:
+        children[span.get("parentSpanId")].append(span)
+
+    def show(span: dict, depth: int) -> None:
+        print(f"  {'  ' * depth}{span['name']:<{48 - 2 * depth}} {duration_ms(span):8.2f} ms")
+        for child in sorted(children[span["spanId"]], key=lambda s: int(s["startTimeUnixNano"])):
+            show(child, depth + 1)
+
+    for root in children[None]:
+        show(root, 0)
+
+
+async def drive(server, calls: int) -> list[float]:
+    latencies = []
+    async with create_connected_server_and_client_session(server._mcp_server) as client:
+        for _ in range(calls):
+            start = time.perf_counter()
+            await client.call_tool("route_hiring_task", ARGS)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--delay-ms", type=float, default=20.0)
+    parser.add_argument("--serve", action="store_true", help="only run the collector and print spans as they arrive")
+    parser.add_argument("--port", type=int, default=4318)
+    args = parser.parse_args()
+
+    if args.serve:
+        collector, spans = start_collector(args.port)
+        print(f"collecting on http://127.0.0.1:{args.port}/v1/traces")
+        seen = 0
+        while True:
+            time.sleep(1)
+            for span in spans[seen:]:
+                print(f"{span['traceId'][:8]} {span['name']:<40} {duration_ms(span):8.2f} ms")
+            seen = len(spans)
+
+    collector, spans = start_collector()
+    stub, _ = start_stub(delay_seconds=args.delay_ms / 1000)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({
+            "LOG_DIR": tmp,
+            "DATA_DIR": tmp,
+            "LOG_WEBHOOK_URL": "",
+            "HH_API_ENABLED": "1",
+            "HH_API_BASE_URL": f"http://127.0.0.1:{stub.server_address[1]}",
+            # Every call goes upstream; the hh.ru response cache would hide it after the first
+            "HH_CACHE_TTL_SECONDS": "0",
+            "HH_RATE_LIMIT_PER_SECOND": "1000",
+            "OTEL_EXPORTER_OTLP_ENDPOINT": f"http://127.0.0.1:{collector.server_address[1]}",
+            "TRACE_FLUSH_SECONDS": "0.2",
+            "ROUTING_ENGINE": "semantic",
+        })
+        from hiring_router_mcp.server import build_server
+
+        results = {}
+        for exporter in ("none", "otlp", "none", "otlp"):
+            os.environ["TRACING_EXPORTER"] = exporter
+            server = build_server()
+            asyncio.run(drive(server, 3))
+            results.setdefault(exporter, []).extend(asyncio.run(drive(server, args.calls)))
+        time.sleep(0.5)
+
+    roots = [s for s in spans if "parentSpanId" not in s and s["name"].startswith("tools/call")]
+    by_trace = defaultdict(list)
+    for span in spans:
+        by_trace[span["traceId"]].append(span)
+    print(f"{len(spans)} spans in {len(by_trace)} traces")
+    print("one trace:")
+    print_tree(by_trace[roots[-1]["traceId"]])
+
+    total = statistics.mean(duration_ms(s) for s in roots)
+    per_name = defaultdict(list)
+    for span in spans:
+        if span["traceId"] in {r["traceId"] for r in roots}:
+            name = "GET hh.ru /vacancies/{id}" if span["name"].startswith("GET hh.ru /vacancies/") else span["name"]
+            per_name[name].append(duration_ms(span))
+    print(f"average per call ({len(roots)} traced calls, root {total:.2f} ms):")
+    for name, values in sorted(per_name.items(), key=lambda item: -sum(item[1])):
+        print(f"  {name:<40} x{len(values) / len(roots):5.1f}/call {statistics.mean(values):8.2f} ms each")
+
+    for exporter, latencies in results.items():
+        print(f"tracing {exporter:<5}: p50 {statistics.median(latencies):7.2f} ms, mean {statistics.mean(latencies):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Compare per-call logging latency for sync vs batched webhook shipping.
+
+Starts a local stand-in webhook (with an artificial response delay) and runs
+80 concurrent "tool calls" (our Cloud Run ``containerConcurrency``), each of
+which emits the two records ``_register_with_logging`` writes per call.
+
+    python benchmarks/webhook_shipping.py [--calls 2000] [--delay-ms 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from hiring_router_mcp.logging_setup import BatchingWebhookLogHandler, JsonLogFormatter, WebhookLogHandler
+
+
+def start_webhook(delay_seconds: float) -> tuple[ThreadingHTTPServer, dict]:
+    received = {"requests": 0, "lines": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802
+            body = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+            time.sleep(delay_seconds)
+            with lock:
+                received["requests"] += 1
+                received["lines"] += body.count(b"\n") or 1
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args) -> None:  # silence stderr
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, received
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(handler: logging.Handler, calls: int, concurrency: int) -> list[float]:
+    handler.setFormatter(JsonLogFormatter())
+    logger = logging.getLogger(f"bench.{type(handler).__name__}")
+    logger.propagate = False
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+
+    def one_call(i: int) -> float:
+        start = time.perf_counter()
+        logger.info("tool_call", extra={"extra": {"event": "tool_call", "tool": "generate_job_post", "seq": i}})
+        logger.info("tool_result", extra={"extra": {"event": "tool_result", "tool": "generate_job_post", "seq": i}})
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(one_call, range(calls)))
+    handler.close()
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=80)
+    parser.add_argument("--delay-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    server, received = start_webhook(args.delay_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        for name, handler in (
+            ("sync", WebhookLogHandler(url, secret="bench")),
+            ("batch", BatchingWebhookLogHandler(url, secret="bench")),
+        ):
+            received.update(requests=0, lines=0)
+            started = time.perf_counter()
+            latencies = run(handler, args.calls, args.concurrency)
+            wall = time.perf_counter() - started
+            print(
+                f"{name:>5}: p50={statistics.median(latencies):8.3f}ms "
+                f"p99={percentile(latencies, 0.99):8.3f}ms wall={wall:6.2f}s "
+                f"posts={received['requests']} records={received['lines']}"
+            )
+            if isinstance(handler, BatchingWebhookLogHandler):
+                print(f"       stats={handler.stats()}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Mapping, Optional
+
+from .metrics import MetricsRegistry
+
+# The caller a tool call is made for (X-Client-Id header, LOG_CLIENT_ID or the MCP clientInfo name);
+# set per tools/call request, picked up by the log records and the admission controller
+current_client_id: ContextVar[Optional[str]] = ContextVar("client_id", default=None)
+
+# JSON-RPC server-defined error code for shed calls; the 29 echoes HTTP 429
+ADMISSION_ERROR_CODE = -32029
+# Buckets of the least recently seen clients are dropped beyond this many (a dropped client starts full again)
+MAX_TRACKED_CLIENTS = 10000
+# Smoothing of the observed slot hold time behind queue retry hints
+_HOLD_ALPHA = 0.1
+
+
+class AdmissionRejected(Exception):
+    """A call was shed: ``reason`` is "rate_limited", "queue_full" or "queue_timeout"."""
+
+    def __init__(self, reason: str, retry_after: float, client_id: str) -> None:
+        self.reason = reason
+        self.retry_after = round(retry_after, 3)
+        self.client_id = client_id
+        super().__init__(f"{reason} for client {client_id!r}; retry after {self.retry_after}s")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"status": 429, "reason": self.reason, "retry_after": self.retry_after, "client_id": self.client_id}
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+
+
+class AdmissionController:
+    """Per-client token buckets in front of a global in-flight cap with a bounded wait queue.
+
+    Each client gets ``rate`` calls per second with bursts up to ``burst``
+    (``client_rates`` overrides the rate per client; 0 = unlimited). At most
+    ``max_in_flight`` calls run at once (0 = no cap); the rest wait in per-client
+    queues, served round-robin so a client with many queued calls cannot push
+    out one with a few. A client may queue ``client_queue`` calls and all
+    clients ``queue_size`` together; beyond that, or after waiting
+    ``queue_timeout`` seconds, the call is rejected with a retry-after hint.
+
+    Every operation is O(1) dictionary and deque work on the event loop thread,
+    with no await between a check and its update, so no lock is needed. The
+    controller must only be used from that loop.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        rate: float = 0.0,
+        burst: int = 20,
+        client_rates: Optional[Mapping[str, float]] = None,
+        max_in_flight: int = 0,
+        queue_size: int = 64,
+        client_queue: int = 16,
+        queue_timeout: float = 5.0,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.client_rates = dict(client_rates or {})
+        self.max_in_flight = max_in_flight
+        self.queue_size = queue_size
+        self.client_queue = max(1, client_queue)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {"rate_limited": 0, "queue_full": 0, "queue_timeout": 0}
+        shed = registry.counter("admission_rejected_total", "Tool calls shed by admission control", ("reason",))
+        self._shed = {reason: shed.labels(reason) for reason in self.rejected}
+        self._wait = registry.histogram("admission_wait_seconds", "Time queued calls waited for an in-flight slot").labels()
+        registry.callback("admission_in_flight", "Tool calls holding an admission slot", lambda: self.in_flight)
+        registry.callback("admission_queue_depth", "Tool calls waiting for an admission slot", lambda: self.queued)
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+        # Waiting clients in round-robin order, each with its FIFO of waiters
+        self._waiting: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._hold = 0.05
+
+    def _reject(self, reason: str, retry_after: float, client_id: str) -> AdmissionRejected:
+        self.rejected[reason] += 1
+        self._shed[reason].inc()
+        return AdmissionRejected(reason, retry_after, client_id)
+
+    def _queue_hint(self) -> float:
+        # Time for the calls ahead to drain through max_in_flight slots at the observed hold time
+        return min(60.0, max(0.1, self._hold * (self.queued + 1) / max(1, self.max_in_flight)))
+
+    def _bucket(self, client_id: str, rate: float, now: float) -> _Bucket:
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            bucket = self._buckets[client_id] = _Bucket(float(self.burst), now)
+            if len(self._buckets) > MAX_TRACKED_CLIENTS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client_id)
+            bucket.tokens = min(float(self.burst), bucket.tokens + (now - bucket.updated) * rate)
+            bucket.updated = now
+        return bucket
+
+    async def acquire(self, client_id: str, cost: int = 1) -> float:
+        """Take ``cost`` tokens and an in-flight slot for ``client_id``, waiting in the queue if needed.
+
+        Returns the admission time to hand back to ``release``; raises
+        AdmissionRejected when the call is shed. ``cost`` is capped at the
+        burst size, so a batch of any size stays admissible.
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        cost = min(max(1, cost), self.burst)
+        rate = self.client_rates.get(client_id, self.rate)
+        bucket = self._bucket(client_id, rate, now) if rate > 0 else None
+        if bucket is not None and bucket.tokens < cost:
+            raise self._reject("rate_limited", (cost - bucket.tokens) / rate, client_id)
+        if self.max_in_flight <= 0 or (self.in_flight < self.max_in_flight and not self.queued):
+            if bucket is not None:
+                bucket.tokens -= cost
+            self.in_flight += 1
+            self.admitted += 1
+            return now
+        waiters = self._waiting.get(client_id)
+        if self.queued >= self.queue_size or (waiters is not None and len(waiters) >= self.client_queue):
+            raise self._reject("queue_full", self._queue_hint(), client_id)
+        if bucket is not None:
+            bucket.tokens -= cost
+        if waiters is None:
+            waiters = self._waiting[client_id] = deque()
+        waiter = loop.create_future()
+        waiters.append(waiter)
+        self.queued += 1
+        try:
+            # release() hands its slot straight to the waiter, so in_flight already counts this call
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot in the same loop iteration the wait ended; give it back
+                self.release(loop.time())
+            else:
+                waiter.cancel()
+                self._unqueue(client_id, waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                raise self._reject("queue_timeout", self._queue_hint(), client_id) from None
+            raise
+        self.admitted += 1
+        admitted_at = loop.time()
+        self._wait.observe(admitted_at - now)
+        return admitted_at
+
+    def _unqueue(self, client_id: str, waiter: asyncio.Future) -> None:
+        waiters = self._waiting.get(client_id)
+        if waiters is None:
+            return
+        # At most client_queue entries long
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            return
+        self.queued -= 1
+        if not waiters:
+            del self._waiting[client_id]
+
+    def release(self, admitted_at: float) -> None:
+        """Free the slot of a call admitted at ``admitted_at``, handing it to the next waiting client if any."""
+        self._hold += _HOLD_ALPHA * (asyncio.get_running_loop().time() - admitted_at - self._hold)
+        while self._waiting:
+            client_id, waiters = next(iter(self._waiting.items()))
+            waiter = waiters.popleft()
+            self.queued -= 1
+            if waiters:
+                self._waiting.move_to_end(client_id)
+            else:
+                del self._waiting[client_id]
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "waiting_clients": len(self._waiting),
+            "tracked_clients": len(self._buckets),
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+        }
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, Optional
+
+from mcp.server.fastmcp.utilities.func_metadata import FuncMetadata
+from pydantic import ValidationError
+
+from .admission import current_client_id
+
+# Set inside every batch item's task; tool_call/tool_result records pick it up
+current_batch_id: ContextVar[Optional[str]] = ContextVar("batch_id", default=None)
+
+
+class BatchValidationError(ValueError):
+    def __init__(self, errors: List[Dict[str, Any]]) -> None:
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid batch item(s): " + "; ".join(f"#{e['index']}: {e['error']}" for e in errors))
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors())
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    index: int
+    tool: str
+    args: Dict[str, Any]
+
+
+class BatchRunner:
+    """Validate and run many tool calls as one batch.
+
+    Items are checked against the tools' signatures and, when ``arg_metadata``
+    is given, parsed and validated by the tools' argument models as a single
+    ``tools/call`` is, all before anything runs. They are then executed
+    concurrently (at most ``max_concurrency`` at a time) through the same
+    logged, cached wrappers single calls use. Results are yielded in
+    completion order, each tagged with its item index; a failing item yields an
+    error record instead of aborting the batch.
+    """
+
+    def __init__(
+        self,
+        tools: Mapping[str, Callable[..., Any]],
+        max_items: int = 100,
+        max_concurrency: int = 8,
+        client_id: Optional[str] = None,
+        arg_metadata: Optional[Callable[[str], FuncMetadata]] = None,
+    ) -> None:
+        self._tools = dict(tools)
+        self._arg_metadata = arg_metadata
+        # Filled on first use so lazily loaded tools are not imported at startup
+        self._signatures: Dict[str, inspect.Signature] = {}
+        self.max_items = max_items
+        self.max_concurrency = max(1, max_concurrency)
+        self.client_id = client_id
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def tool_names(self) -> List[str]:
+        return sorted(self._tools)
+
+    def validate(self, items: Any) -> List[BatchItem]:
+        if not isinstance(items, list) or not items:
+            raise BatchValidationError([{"index": -1, "error": "items must be a non-empty list"}])
+        if len(items) > self.max_items:
+            raise BatchValidationError([{"index": -1, "error": f"batch has {len(items)} items; the limit is {self.max_items}"}])
+        validated: List[BatchItem] = []
+        errors: List[Dict[str, Any]] = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append({"index": index, "error": "item must be an object with 'tool' and 'args'"})
+                continue
+            tool, args = item.get("tool"), item.get("args") or {}
+            if tool not in self._tools:
+                errors.append({"index": index, "error": f"unknown tool {tool!r}"})
+                continue
+            if not isinstance(args, dict):
+                errors.append({"index": index, "error": "args must be an object"})
+                continue
+            if tool not in self._signatures:
+                self._signatures[tool] = inspect.signature(self._tools[tool])
+            try:
+                self._signatures[tool].bind(**args)
+            except TypeError as exc:
+                errors.append({"index": index, "error": f"{tool}: {exc}"})
+                continue
+            if self._arg_metadata is not None:
+                metadata = self._arg_metadata(tool)
+                try:
+                    # The item then runs with the same coerced arguments a single call would get
+                    args = metadata.arg_model.model_validate(metadata.pre_parse_json(args)).model_dump_one_level()
+                except ValidationError as exc:
+                    errors.append({"index": index, "error": f"{tool}: {_describe(exc)}"})
+                    continue
+            validated.append(BatchItem(index, tool, args))
+        if errors:
+            raise BatchValidationError(errors)
+        return validated
+
+    async def _call(self, item: BatchItem) -> Any:
+        func = self._tools[item.tool]
+        if inspect.iscoroutinefunction(func):
+            return await func(**item.args)
+        return await asyncio.to_thread(func, **item.args)
+
+    async def stream(self, items: List[BatchItem]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one ``item`` record per call as it completes, then a ``batch_done`` summary."""
+        batch_id = str(uuid.uuid4())
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._log("batch_start", batch_id, items=len(items), tools=sorted({item.tool for item in items}))
+
+        async def run_one(item: BatchItem) -> Dict[str, Any]:
+            current_batch_id.set(batch_id)
+            async with semaphore:
+                item_start = time.perf_counter()
+                record: Dict[str, Any] = {"event": "item", "index": item.index, "tool": item.tool}
+                try:
+                    record.update(ok=True, result=await self._call(item))
+                except Exception as exc:
+                    # The tool wrapper has already logged the traceback
+                    record.update(ok=False, error={"type": type(exc).__name__, "message": str(exc)})
+                record["duration_ms"] = int((time.perf_counter() - item_start) * 1000)
+                return record
+
+        tasks = [asyncio.create_task(run_one(item)) for item in items]
+        failed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                record = await next_done
+                failed += not record["ok"]
+                yield record
+        finally:
+            # Reached early only if the consumer went away (e.g. HTTP client disconnect)
+            for task in tasks:
+                task.cancel()
+        summary = {
+            "event": "batch_done",
+            "batch_id": batch_id,
+            "items": len(items),
+            "succeeded": len(items) - failed,
+            "failed": failed,
+            "duration_ms": int((time.perf_counter() - start) * 1000),
+        }
+        self._log("batch_result", batch_id, **{k: v for k, v in summary.items() if k not in ("event", "batch_id")})
+        yield summary
+
+    def _log(self, event: str, batch_id: str, **fields: Any) -> None:
+        self._logger.info(
+            event,
+            extra={"extra": {"event": event, "batch_id": batch_id, "client_id": current_client_id.get() or self.client_id, **fields}},
+        )
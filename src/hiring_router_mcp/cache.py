@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+
+def canonical_key(tool: str, kwargs: Mapping[str, Any]) -> Optional[str]:
+    """Stable hash of a tool call, or None if the arguments are not JSON-serializable."""
+    try:
+        payload = json.dumps(kwargs, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+    return tool + ":" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Thread-safe LRU + TTL cache for JSON-serializable tool results.
+
+    Results are stored as their JSON encoding: the encoded length is what the
+    memory cap is enforced against, and every hit decodes a fresh copy so
+    callers can never mutate a cached value. Least recently used entries are
+    evicted once either ``max_entries`` or ``max_bytes`` would be exceeded.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
+
+    def get(self, key: str) -> Any:
+        """Return the cached value or ``None`` if absent/expired (results are never None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, encoded = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return json.loads(encoded)
+
+    def put(self, key: str, value: Any, ttl_seconds: float) -> bool:
+        try:
+            # ASCII-only encoding so len() is the byte size charged against max_bytes
+            encoded = json.dumps(value, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return False
+        size = len(encoded)
+        with self._lock:
+            if size > self.max_bytes:
+                self.rejections += 1
+                return False
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and (len(self._entries) >= self.max_entries or self._bytes + size > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            self._entries[key] = (self._clock() + ttl_seconds, encoded)
+            self._bytes += size
+        return True
+
+    def _remove(self, key: str) -> None:
+        _, encoded = self._entries.pop(key)
+        self._bytes -= len(encoded)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "rejections": self.rejections,
+            }
+
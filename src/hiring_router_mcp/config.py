@@ -1,13 +1,28 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+import tempfile
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable, Dict, TypeVar
 
 from dotenv import load_dotenv
 
 DEFAULT_LOG_WEBHOOK_URL = "https://mcp-logging-webhook-dev.dev-a96.workers.dev"
 
+T = TypeVar("T")
+
+
+def parse_tool_map(spec: str | None, value_type: Callable[[str], T]) -> Dict[str, T]:
+    """Parse ``"tool=value,tool=value"`` env strings into a mapping."""
+    values: Dict[str, T] = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        values[name.strip()] = value_type(value.strip())
+    return values
+
 
 @dataclass(frozen=True)
 class AppConfig:
@@ -19,6 +34,61 @@ class AppConfig:
     log_webhook_secret: str | None
     n8n_webhook_url: str | None
     hh_api_key: str | None
+    log_webhook_mode: str = "sync"
+    log_webhook_batch_size: int = 100
+    log_webhook_flush_seconds: float = 1.0
+    log_webhook_queue_size: int = 10000
+    routing_table_path: Path | None = None
+    routing_engine: str = "keyword"
+    routing_confidence: float = 0.1
+    tool_cache_ttl_seconds: float = 0.0
+    tool_cache_ttls: Dict[str, float] = field(default_factory=dict)
+    tool_cache_max_entries: int = 1024
+    tool_cache_max_bytes: int = 16 * 1024 * 1024
+    tool_execution_mode: str = "sync"
+    tool_thread_pool_size: int = 16
+    tool_max_concurrency: int = 0
+    tool_concurrency_limits: Dict[str, int] = field(default_factory=dict)
+    data_dir: Path = Path("./hiring_data")
+    hh_api_enabled: bool = False
+    hh_api_base_url: str = "https://api.hh.ru"
+    hh_rate_limit_per_second: float = 5.0
+    hh_cache_ttl_seconds: float = 3600.0
+    skill_index_enabled: bool = True
+    batch_max_items: int = 100
+    batch_max_concurrency: int = 8
+    tool_startup_mode: str = "eager"
+    pipeline_webhook_secret: str | None = None
+    forms_queue_size: int = 20000
+    forms_batch_size: int = 500
+    forms_flush_seconds: float = 0.2
+    forms_notify_batch_size: int = 100
+    forms_drain_seconds: float = 8.0
+    log_export_token: str | None = None
+    log_format: str = "jsonl"
+    log_segment_max_bytes: int = 16 * 1024 * 1024
+    profile_sample_rate: int = 0
+    profile_slow_ms: float = 0.0
+    profile_keep: int = 20
+    profile_token: str | None = None
+    tracing_exporter: str = "none"
+    otlp_endpoint: str = "http://localhost:4318"
+    service_name: str = "hiring-router-mcp"
+    trace_batch_size: int = 512
+    trace_flush_seconds: float = 1.0
+    trace_queue_size: int = 10000
+    session_broker: str = "local"
+    session_broker_dir: Path = Path(tempfile.gettempdir()) / "hiring-router-mcp"
+    resume_workers: int = 0
+    resume_max_batch: int = 1000
+    stream_poll_seconds: float = 0.5
+    client_rate_per_second: float = 0.0
+    client_burst: int = 20
+    client_rate_limits: Dict[str, float] = field(default_factory=dict)
+    max_in_flight_calls: int = 0
+    admission_queue_size: int = 64
+    admission_client_queue: int = 16
+    admission_queue_timeout_seconds: float = 5.0
 
 
 def load_config() -> AppConfig:
@@ -32,6 +102,71 @@ def load_config() -> AppConfig:
     log_webhook_secret = os.getenv("LOG_WEBHOOK_SECRET")
     n8n_webhook_url = os.getenv("N8N_WEBHOOK_URL")
     hh_api_key = os.getenv("HH_API_KEY")
+    log_webhook_mode = os.getenv("LOG_WEBHOOK_MODE", "sync").lower()
+    log_webhook_batch_size = int(os.getenv("LOG_WEBHOOK_BATCH_SIZE", "100"))
+    log_webhook_flush_seconds = float(os.getenv("LOG_WEBHOOK_FLUSH_SECONDS", "1.0"))
+    log_webhook_queue_size = int(os.getenv("LOG_WEBHOOK_QUEUE_SIZE", "10000"))
+    routing_table_env = os.getenv("ROUTING_TABLE_PATH")
+    routing_table_path = Path(routing_table_env).expanduser().resolve() if routing_table_env else None
+    routing_engine = os.getenv("ROUTING_ENGINE", "keyword").lower()
+    routing_confidence = float(os.getenv("ROUTING_CONFIDENCE", "0.1"))
+    tool_cache_ttl_seconds = float(os.getenv("TOOL_CACHE_TTL_SECONDS", "0"))
+    tool_cache_ttls = parse_tool_map(os.getenv("TOOL_CACHE_TTLS"), float)
+    tool_cache_max_entries = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "1024"))
+    tool_cache_max_bytes = int(os.getenv("TOOL_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    tool_execution_mode = os.getenv("TOOL_EXECUTION_MODE", "sync").lower()
+    tool_thread_pool_size = int(os.getenv("TOOL_THREAD_POOL_SIZE", "16"))
+    tool_max_concurrency = int(os.getenv("TOOL_MAX_CONCURRENCY", "0"))
+    tool_concurrency_limits = parse_tool_map(os.getenv("TOOL_CONCURRENCY_LIMITS"), int)
+    data_dir = Path(os.getenv("DATA_DIR", "./hiring_data")).expanduser().resolve()
+    hh_api_enabled = os.getenv("HH_API_ENABLED", "1" if hh_api_key else "0").lower() in ("1", "true", "yes")
+    hh_api_base_url = os.getenv("HH_API_BASE_URL", "https://api.hh.ru")
+    hh_rate_limit_per_second = float(os.getenv("HH_RATE_LIMIT_PER_SECOND", "5"))
+    hh_cache_ttl_seconds = float(os.getenv("HH_CACHE_TTL_SECONDS", "3600"))
+    skill_index_enabled = os.getenv("SKILL_INDEX_ENABLED", "1").lower() in ("1", "true", "yes")
+    batch_max_items = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+    batch_max_concurrency = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+    tool_startup_mode = os.getenv("TOOL_STARTUP_MODE", "eager").lower()
+    pipeline_webhook_secret = os.getenv("PIPELINE_WEBHOOK_SECRET")
+    forms_queue_size = int(os.getenv("FORMS_QUEUE_SIZE", "20000"))
+    forms_batch_size = int(os.getenv("FORMS_BATCH_SIZE", "500"))
+    forms_flush_seconds = float(os.getenv("FORMS_FLUSH_SECONDS", "0.2"))
+    forms_notify_batch_size = int(os.getenv("FORMS_NOTIFY_BATCH_SIZE", "100"))
+    forms_drain_seconds = float(os.getenv("FORMS_DRAIN_SECONDS", "8"))
+    log_export_token = os.getenv("LOG_EXPORT_TOKEN")
+    log_format = os.getenv("LOG_FORMAT", "jsonl").lower()
+    log_segment_max_bytes = int(os.getenv("LOG_SEGMENT_MAX_BYTES", str(16 * 1024 * 1024)))
+    profile_sample_rate = int(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    profile_slow_ms = float(os.getenv("PROFILE_SLOW_MS", "0"))
+    profile_keep = int(os.getenv("PROFILE_KEEP", "20"))
+    profile_token = os.getenv("PROFILE_TOKEN")
+    tracing_exporter = os.getenv("TRACING_EXPORTER", "none").lower()
+    # Standard OpenTelemetry variable names, so an existing collector setup carries over
+    otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
+    service_name = os.getenv("OTEL_SERVICE_NAME", "hiring-router-mcp")
+    trace_batch_size = int(os.getenv("TRACE_BATCH_SIZE", "512"))
+    trace_flush_seconds = float(os.getenv("TRACE_FLUSH_SECONDS", "1.0"))
+    trace_queue_size = int(os.getenv("TRACE_QUEUE_SIZE", "10000"))
+    # uvicorn --workers defaults to WEB_CONCURRENCY; more than one worker needs cross-process session routing
+    workers = int(os.getenv("WEB_CONCURRENCY") or "1")
+    session_broker = os.getenv("SESSION_BROKER", "unix" if workers > 1 else "local").lower()
+    session_broker_dir = Path(
+        os.getenv("SESSION_BROKER_DIR", str(Path(tempfile.gettempdir()) / "hiring-router-mcp"))
+    ).expanduser().resolve()
+    # Process pool for shortlist_resumes; 0 = one worker per CPU
+    resume_workers = int(os.getenv("RESUME_WORKERS", "0"))
+    resume_max_batch = int(os.getenv("RESUME_MAX_BATCH", "1000"))
+    # How often a streaming tool checks, while a step runs, whether its client is still connected
+    stream_poll_seconds = float(os.getenv("STREAM_POLL_SECONDS", "0.5"))
+    # Admission control for tool calls: per-client token buckets (0 = unlimited; per-client
+    # overrides as client=rate) and a global in-flight cap with a bounded wait queue (0 = no cap)
+    client_rate_per_second = float(os.getenv("CLIENT_RATE_PER_SECOND", "0"))
+    client_burst = int(os.getenv("CLIENT_BURST", "20"))
+    client_rate_limits = parse_tool_map(os.getenv("CLIENT_RATE_LIMITS"), float)
+    max_in_flight_calls = int(os.getenv("MAX_IN_FLIGHT_CALLS", "0"))
+    admission_queue_size = int(os.getenv("ADMISSION_QUEUE_SIZE", "64"))
+    admission_client_queue = int(os.getenv("ADMISSION_CLIENT_QUEUE", "16"))
+    admission_queue_timeout_seconds = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5"))
 
     log_dir.mkdir(parents=True, exist_ok=True)
 
@@ -44,6 +179,61 @@ def load_config() -> AppConfig:
         log_webhook_secret=log_webhook_secret,
         n8n_webhook_url=n8n_webhook_url,
         hh_api_key=hh_api_key,
+        log_webhook_mode=log_webhook_mode,
+        log_webhook_batch_size=log_webhook_batch_size,
+        log_webhook_flush_seconds=log_webhook_flush_seconds,
+        log_webhook_queue_size=log_webhook_queue_size,
+        routing_table_path=routing_table_path,
+        routing_engine=routing_engine,
+        routing_confidence=routing_confidence,
+        tool_cache_ttl_seconds=tool_cache_ttl_seconds,
+        tool_cache_ttls=tool_cache_ttls,
+        tool_cache_max_entries=tool_cache_max_entries,
+        tool_cache_max_bytes=tool_cache_max_bytes,
+        tool_execution_mode=tool_execution_mode,
+        tool_thread_pool_size=tool_thread_pool_size,
+        tool_max_concurrency=tool_max_concurrency,
+        tool_concurrency_limits=tool_concurrency_limits,
+        data_dir=data_dir,
+        hh_api_enabled=hh_api_enabled,
+        hh_api_base_url=hh_api_base_url,
+        hh_rate_limit_per_second=hh_rate_limit_per_second,
+        hh_cache_ttl_seconds=hh_cache_ttl_seconds,
+        skill_index_enabled=skill_index_enabled,
+        batch_max_items=batch_max_items,
+        batch_max_concurrency=batch_max_concurrency,
+        tool_startup_mode=tool_startup_mode,
+        pipeline_webhook_secret=pipeline_webhook_secret,
+        forms_queue_size=forms_queue_size,
+        forms_batch_size=forms_batch_size,
+        forms_flush_seconds=forms_flush_seconds,
+        forms_notify_batch_size=forms_notify_batch_size,
+        forms_drain_seconds=forms_drain_seconds,
+        log_export_token=log_export_token,
+        log_format=log_format,
+        log_segment_max_bytes=log_segment_max_bytes,
+        profile_sample_rate=profile_sample_rate,
+        profile_slow_ms=profile_slow_ms,
+        profile_keep=profile_keep,
+        profile_token=profile_token,
+        tracing_exporter=tracing_exporter,
+        otlp_endpoint=otlp_endpoint,
+        service_name=service_name,
+        trace_batch_size=trace_batch_size,
+        trace_flush_seconds=trace_flush_seconds,
+        trace_queue_size=trace_queue_size,
+        session_broker=session_broker,
+        session_broker_dir=session_broker_dir,
+        resume_workers=resume_workers,
+        resume_max_batch=resume_max_batch,
+        stream_poll_seconds=stream_poll_seconds,
+        client_rate_per_second=client_rate_per_second,
+        client_burst=client_burst,
+        client_rate_limits=client_rate_limits,
+        max_in_flight_calls=max_in_flight_calls,
+        admission_queue_size=admission_queue_size,
+        admission_client_queue=admission_client_queue,
+        admission_queue_timeout_seconds=admission_queue_timeout_seconds,
     )
 
 
@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import json
+import random
+import re
+import string
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from .skill_index import normalize_role
+
+QUESTION_BANK_PATH = Path(__file__).with_name("question_bank.json")
+DIFFICULTIES = ("easy", "medium", "hard")
+# Where to draw from once the requested difficulty runs out
+_DIFFICULTY_ORDER = {"easy": ("easy", "medium", "hard"), "medium": ("medium", "easy", "hard"), "hard": ("hard", "medium", "easy")}
+MAX_QUESTIONS = 50
+
+_FORMATTER = string.Formatter()
+Part = Union[str, Tuple[str, str]]
+
+
+def _format(value: Any, spec: str) -> str:
+    if spec == "bullets":
+        return "\n".join(f"- {item}" for item in value)
+    if spec == "numbered":
+        return "\n".join(f"{i}. {item}" for i, item in enumerate(value, 1))
+    if spec == "comma":
+        return ", ".join(str(item) for item in value)
+    return str(value)
+
+
+class Template:
+    """Format-string template parsed once into literal and field parts.
+
+    ``{name}`` inserts a value; ``{name:bullets}``, ``{name:numbered}`` and
+    ``{name:comma}`` render lists. ``bind`` folds fixed values into the
+    literals, so per-variant templates are built once and rendering only
+    fills the remaining fields.
+    """
+
+    __slots__ = ("parts", "fields")
+
+    def __init__(self, source: Union[str, Tuple[Part, ...]]) -> None:
+        if isinstance(source, str):
+            parts: List[Part] = []
+            for literal, field, spec, _ in _FORMATTER.parse(source):
+                if literal:
+                    parts.append(literal)
+                if field is not None:
+                    parts.append((field, spec or ""))
+            source = tuple(parts)
+        self.parts = _merge_literals(source)
+        self.fields = frozenset(part[0] for part in self.parts if not isinstance(part, str))
+
+    def bind(self, **values: Any) -> "Template":
+        return Template(tuple(
+            _format(values[part[0]], part[1]) if not isinstance(part, str) and part[0] in values else part
+            for part in self.parts
+        ))
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        return "".join(part if isinstance(part, str) else _format(values[part[0]], part[1]) for part in self.parts)
+
+
+def _merge_literals(parts: Tuple[Part, ...]) -> Tuple[Part, ...]:
+    merged: List[Part] = []
+    for part in parts:
+        if isinstance(part, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += part
+        else:
+            merged.append(part)
+    return tuple(merged)
+
+
+JOB_POST_SOURCE = """{title}
+{company} · {location_line}
+
+About the role
+{company} is hiring a {title} to {mission}. {level_pitch}
+
+What you will do
+{responsibilities:bullets}
+
+What we are looking for
+{requirements:bullets}
+- {level_requirement}
+
+What we offer
+{benefits:bullets}
+
+How to apply
+Send your CV and a few lines about a project you are proud of. We reply to every application within {reply_days} working days.
+"""
+
+HOMEWORK_SOURCE = """Take-home assignment: {title}
+
+Objective
+{objective}
+
+Context
+{context}
+
+Deliverables
+{deliverables:bullets}
+
+Timebox
+Plan for about {hours} hours. {timebox_note}
+
+How we evaluate
+{rubric:bullets}
+
+Submission
+Share a repository link or an archive within {due_days} days, with a README covering setup steps and the trade-offs you made.
+"""
+
+LEVELS: Dict[str, Dict[str, Any]] = {
+    "intern": {
+        "label": "Intern",
+        "level_pitch": "You will learn alongside experienced engineers on real tasks from day one.",
+        "level_requirement": "Curiosity and the basics of the field; coursework or pet projects count",
+        "reply_days": 5, "hours": 3, "due_days": 7,
+        "timebox_note": "We care more about how you approach the problem than about finishing every part.",
+    },
+    "junior": {
+        "label": "Junior",
+        "level_pitch": "You will grow quickly with code reviews, mentoring and well-scoped tasks.",
+        "level_requirement": "Up to 2 years of hands-on experience, or strong projects that show it",
+        "reply_days": 5, "hours": 4, "due_days": 7,
+        "timebox_note": "We care more about how you approach the problem than about finishing every part.",
+    },
+    "middle": {
+        "label": "Middle",
+        "level_pitch": "You will own features end to end and work closely with product and design.",
+        "level_requirement": "2-4 years of experience shipping and supporting production work",
+        "reply_days": 3, "hours": 6, "due_days": 5,
+        "timebox_note": "If you run out of time, write down what you would do next.",
+    },
+    "senior": {
+        "label": "Senior",
+        "level_pitch": "You will shape technical decisions and raise the bar for the whole team.",
+        "level_requirement": "4+ years of experience, including design decisions you owned and can explain",
+        "reply_days": 3, "hours": 6, "due_days": 5,
+        "timebox_note": "Prioritize: a smaller, well-reasoned solution beats a complete but rushed one.",
+    },
+    "lead": {
+        "label": "Lead",
+        "level_pitch": "You will lead a team, set its technical direction and grow the people in it.",
+        "level_requirement": "Experience leading a team or a major initiative, with results you can point to",
+        "reply_days": 2, "hours": 6, "due_days": 5,
+        "timebox_note": "Include a short note on how you would split this work across a team.",
+    },
+}
+_LEVEL_ALIASES = {
+    "intern": "intern", "trainee": "intern", "стажер": "intern", "стажёр": "intern",
+    "junior": "junior", "jr": "junior", "младший": "junior",
+    "middle": "middle", "mid": "middle", "regular": "middle",
+    "senior": "senior", "sr": "senior", "старший": "senior", "ведущий": "senior",
+    "lead": "lead", "principal": "lead", "staff": "lead", "тимлид": "lead", "руководитель": "lead",
+}
+
+# Role families, most specific first; "backend" catches developers and engineers in general
+ROLE_FAMILY_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("frontend", ("frontend", "javascript", "react", "vue", "фронтенд")),
+    ("data", ("data", "analyst", "аналитик", "ml", "scientist", "bi")),
+    ("devops", ("devops", "sre", "platform", "infrastructure")),
+    ("qa", ("qa", "test", "tester", "тестировщик")),
+    ("design", ("designer", "дизайнер", "ux", "ui")),
+    ("recruiting", ("recruiter", "hr", "рекрутер", "talent")),
+    ("product", ("product", "project", "manager", "менеджер")),
+    ("backend", ("python", "java", "golang", "backend", "бэкенд", "developer", "engineer", "разработчик", "программист")),
+)
+FAMILIES: Dict[str, Dict[str, Any]] = {
+    "backend": {
+        "mission": "build and run the services behind our product",
+        "topics": ("sql", "algorithms", "system_design", "behavioral"),
+        "objective": "Build a small REST API for job applications: create an application, list applications by position with pagination, and move an application to the next hiring stage.",
+        "context": "Applications arrive from a public form and recruiters process them during the day. Assume a few thousand applications per position.",
+    },
+    "frontend": {
+        "mission": "build the interfaces our users work with every day",
+        "topics": ("javascript", "algorithms", "testing", "behavioral"),
+        "objective": "Build a candidate search page: a list with filters by position and stage, instant search by name, and a detail panel.",
+        "context": "Recruiters use the page all day on laptops; it should stay fast with a few thousand candidates loaded from a mock API.",
+    },
+    "data": {
+        "mission": "turn our data into decisions",
+        "topics": ("sql", "data_analysis", "python", "behavioral"),
+        "objective": "Analyse the attached hiring funnel export: conversion and time in stage per source, and the two changes you would recommend.",
+        "context": "The export covers the last six months of applications, with one row per stage transition.",
+    },
+    "devops": {
+        "mission": "keep our infrastructure fast, reliable and affordable",
+        "topics": ("devops", "system_design", "behavioral"),
+        "objective": "Containerize a small web service and its database, add a CI pipeline that tests and builds it, and describe how you would deploy and monitor it.",
+        "context": "The service handles a few hundred requests per second at peak and must survive the loss of one instance.",
+    },
+    "qa": {
+        "mission": "make sure every release works for our users",
+        "topics": ("testing", "sql", "behavioral"),
+        "objective": "Write a test plan and automated tests for an application form API: validation, duplicates, and stage changes.",
+        "context": "The API is used by a public form and by recruiters' tools; releases go out weekly.",
+    },
+    "design": {
+        "mission": "shape how our product looks and feels",
+        "topics": ("product", "behavioral"),
+        "objective": "Redesign the job application flow on mobile so more candidates finish it.",
+        "context": "Most candidates apply from phones and a third drop off at the CV upload step.",
+    },
+    "product": {
+        "mission": "decide what we build next and why",
+        "topics": ("product", "data_analysis", "behavioral"),
+        "objective": "Propose how to reduce time to hire for our customers: the problem, the evidence you would gather, and a first release.",
+        "context": "Customers are in-house recruiting teams of 2-20 people hiring engineers.",
+    },
+    "recruiting": {
+        "mission": "hire the people who build our product",
+        "topics": ("behavioral", "data_analysis"),
+        "objective": "Plan the hiring of five backend engineers in one quarter: sourcing channels, funnel targets and the interview process.",
+        "context": "The team has one hiring manager and a two-stage technical interview today.",
+    },
+    "general": {
+        "mission": "help us build our product",
+        "topics": ("behavioral",),
+        "objective": "Prepare a short case study of a problem you solved: the situation, your approach, and the result.",
+        "context": "We will discuss it with you in the follow-up interview.",
+    },
+}
+LANGUAGE_TOPICS = {"python": "python", "django": "python", "fastapi": "python", "javascript": "javascript", "typescript": "javascript", "react": "javascript"}
+TOPIC_ALIASES = {
+    "system design": "system_design", "architecture": "system_design",
+    "algorithms & ds": "algorithms", "data structures": "algorithms", "algorithms and data structures": "algorithms", "алгоритмы": "algorithms",
+    "docker": "devops", "kubernetes": "devops", "ci/cd": "devops", "infrastructure": "devops",
+    "qa": "testing", "test automation": "testing", "тестирование": "testing",
+    "js": "javascript", "typescript": "javascript", "react": "javascript", "frontend": "javascript",
+    "analytics": "data_analysis", "statistics": "data_analysis", "a/b testing": "data_analysis", "data analysis": "data_analysis",
+    "behavioural": "behavioral", "soft skills": "behavioral", "communication": "behavioral", "star": "behavioral",
+    "postgresql": "sql", "databases": "sql", "базы данных": "sql",
+    "django": "python", "fastapi": "python",
+    "product management": "product",
+}
+RUBRIC_DESCRIPTORS = {
+    "correctness": "required scenarios and edge cases work as described",
+    "code_quality": "readable structure, naming and error handling",
+    "tests": "meaningful tests for the core logic and the failure cases",
+    "docs": "a README someone else can follow, with the trade-offs explained",
+    "design": "sensible boundaries and data model for the problem size",
+    "performance": "no obvious bottlenecks at the stated scale",
+    "communication": "clear reasoning and a structured write-up",
+}
+DEFAULT_RUBRIC = (("correctness", 40), ("code_quality", 30), ("tests", 20), ("docs", 10))
+
+# Compiled once at import; the per-level variants leave only the per-call fields to fill
+JOB_POST = Template(JOB_POST_SOURCE)
+HOMEWORK = Template(HOMEWORK_SOURCE)
+JOB_POST_VARIANTS = {level: JOB_POST.bind(**values) for level, values in LEVELS.items()}
+HOMEWORK_VARIANTS = {level: HOMEWORK.bind(**values) for level, values in LEVELS.items()}
+
+
+def seniority_level(seniority: Optional[str], role: str = "") -> str:
+    """Level key for ``seniority``, else for a seniority word in ``role``; "senior" by default."""
+    for text in (seniority, role):
+        for word in re.findall(r"[a-zа-яё]+", (text or "").lower()):
+            if word in _LEVEL_ALIASES:
+                return _LEVEL_ALIASES[word]
+    return "senior"
+
+
+def role_title(role: str) -> str:
+    """``role`` without seniority words, which the level label replaces: "Senior Python Developer" -> "Python Developer"."""
+    words = [w for w in role.split() if w.lower().strip(",.()") not in _LEVEL_ALIASES]
+    return " ".join(words) or role
+
+
+@lru_cache(maxsize=1024)
+def role_family(role: str) -> str:
+    words = set(normalize_role(role).split())
+    for family, keywords in ROLE_FAMILY_KEYWORDS:
+        if words.intersection(keywords):
+            return family
+    return "general"
+
+
+def default_topics(role: str) -> Tuple[str, ...]:
+    words = normalize_role(role).split()
+    language = tuple(dict.fromkeys(LANGUAGE_TOPICS[w] for w in words if w in LANGUAGE_TOPICS))
+    return tuple(dict.fromkeys(language + FAMILIES[role_family(role)]["topics"]))
+
+
+@lru_cache(maxsize=1)
+def question_index() -> Dict[str, Dict[str, Tuple[Dict[str, str], ...]]]:
+    """Question bank as topic -> difficulty -> questions, loaded once."""
+    bank = json.loads(QUESTION_BANK_PATH.read_text(encoding="utf-8"))
+    return {
+        topic: {
+            difficulty: tuple(
+                {"id": f"{topic}-{difficulty[0]}{i}", "topic": topic, "difficulty": difficulty, "question": q, "expected": expected}
+                for i, (q, expected) in enumerate(levels.get(difficulty, []), 1)
+            )
+            for difficulty in DIFFICULTIES
+        }
+        for topic, levels in bank.items()
+    }
+
+
+def resolve_topic(topic: str) -> Optional[str]:
+    key = " ".join(topic.lower().replace("_", " ").split())
+    key = TOPIC_ALIASES.get(key, key.replace(" ", "_"))
+    return key if key in question_index() else None
+
+
+def _seed(*values: Any) -> int:
+    # Same parameters, same quiz: reproducible across processes, unlike hash()
+    return zlib.crc32(repr(values).encode("utf-8"))
+
+
+@lru_cache(maxsize=1024)
+def render_quiz(topics: Tuple[str, ...], difficulty: str, num_questions: int) -> Tuple[Dict[str, str], ...]:
+    """Up to ``num_questions`` questions, round-robin over ``topics`` (bank keys).
+
+    Each topic draws from ``difficulty`` first, then the nearest other
+    difficulties; "mixed" draws all difficulties evenly.
+    """
+    index = question_index()
+    rng = random.Random(_seed(topics, difficulty, num_questions))
+    pools = []
+    for topic in topics:
+        if difficulty == "mixed":
+            questions = [q for level in DIFFICULTIES for q in index[topic][level]]
+            rng.shuffle(questions)
+        else:
+            questions = []
+            for level in _DIFFICULTY_ORDER.get(difficulty, _DIFFICULTY_ORDER["medium"]):
+                bucket = list(index[topic][level])
+                rng.shuffle(bucket)
+                questions.extend(bucket)
+        pools.append(questions)
+    selected: List[Dict[str, str]] = []
+    position = 0
+    while len(selected) < num_questions and any(position < len(pool) for pool in pools):
+        for pool in pools:
+            if position < len(pool) and len(selected) < num_questions:
+                selected.append(pool[position])
+        position += 1
+    return tuple(selected)
+
+
+@lru_cache(maxsize=1024)
+def render_job_post(
+    company: str,
+    role: str,
+    level: str,
+    location: str,
+    requirements: Tuple[str, ...],
+    responsibilities: Tuple[str, ...],
+    benefits: Tuple[str, ...],
+) -> str:
+    remote = location.strip().lower() in ("remote", "удаленно", "удалённо", "anywhere")
+    return JOB_POST_VARIANTS[level].render({
+        "title": f"{LEVELS[level]['label']} {role_title(role)}",
+        "company": company,
+        "location_line": "Fully remote" if remote else f"Office in {location}",
+        "mission": FAMILIES[role_family(role)]["mission"],
+        "requirements": requirements,
+        "responsibilities": responsibilities,
+        "benefits": benefits,
+    })
+
+
+def _rubric_line(criterion: str, weight: int) -> str:
+    descriptor = RUBRIC_DESCRIPTORS.get(criterion.lower())
+    label = criterion.replace("_", " ").capitalize()
+    return f"{label} ({weight}%): {descriptor}" if descriptor else f"{label} ({weight}%)"
+
+
+@lru_cache(maxsize=1024)
+def render_homework(
+    role: str,
+    level: str,
+    objective: str,
+    deliverables: Tuple[str, ...],
+    rubric: Tuple[Tuple[str, int], ...],
+) -> str:
+    family = FAMILIES[role_family(role)]
+    # The level only sets the timebox and deadline; the title keeps the role as given
+    return HOMEWORK_VARIANTS[level].render({
+        "title": role,
+        "objective": objective,
+        "context": family["context"],
+        "deliverables": deliverables,
+        "rubric": [_rubric_line(criterion, weight) for criterion, weight in rubric],
+    })
+
+
+def render_cache_info() -> Dict[str, Dict[str, int]]:
+    return {
+        fn.__name__: fn.cache_info()._asdict()
+        for fn in (render_job_post, render_quiz, render_homework)
+    }
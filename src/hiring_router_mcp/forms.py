@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .config import load_config
+from .metrics import MetricsRegistry
+from .pipeline import record_stage_events
+
+if TYPE_CHECKING:
+    import httpx
+
+# Fields of the form generate_application_form emits; /forms/submit validates against them
+APPLICATION_FORM_FIELDS: Tuple[Dict[str, Any], ...] = (
+    {"name": "full_name", "label": "Full Name", "type": "text", "required": True},
+    {"name": "email", "label": "Email", "type": "email", "required": True},
+    {"name": "resume_url", "label": "Resume URL", "type": "url", "required": True},
+    {"name": "linkedin", "label": "LinkedIn", "type": "url", "required": False},
+    {"name": "portfolio", "label": "Portfolio", "type": "url", "required": False},
+)
+
+MAX_FIELD_LENGTH = 2048
+
+# A notifier's claim on pending rows; once it lapses (the worker died mid-delivery) another worker may take them
+CLAIM_LEASE_SECONDS = 300
+
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+@dataclass(frozen=True)
+class Submission:
+    email: str
+    position: str
+    fields: Dict[str, str]
+    source: str = ""
+    submitted_at: int = 0
+
+
+def _field_error(field: Mapping[str, Any], value: str) -> Optional[str]:
+    if not value:
+        return "required" if field.get("required") else None
+    if len(value) > MAX_FIELD_LENGTH:
+        return f"longer than {MAX_FIELD_LENGTH} characters"
+    if field.get("type") == "email" and not _EMAIL.match(value):
+        return "invalid email"
+    if field.get("type") == "url":
+        parts = urlsplit(value)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            return "must be an http(s) URL"
+    return None
+
+
+def parse_submission(
+    raw: Mapping[str, Any],
+    fields: Sequence[Mapping[str, Any]] = APPLICATION_FORM_FIELDS,
+    now: Optional[float] = None,
+) -> Submission:
+    """Validate one submission against the form's field spec; raises ValueError listing every bad field.
+
+    Besides the form fields a submission names its ``position`` and may carry
+    a ``source`` (utm/channel). Unknown keys are ignored.
+    """
+    if not isinstance(raw, Mapping):
+        raise ValueError("submission must be an object")
+    values: Dict[str, str] = {}
+    problems: List[str] = []
+    for field in fields:
+        value = str(raw.get(field["name"]) or "").strip()
+        problem = _field_error(field, value)
+        if problem:
+            problems.append(f"{field['name']}: {problem}")
+        elif value:
+            values[field["name"]] = value
+    position = str(raw.get("position") or "").strip()
+    if not position:
+        problems.append("position: required")
+    if problems:
+        raise ValueError("; ".join(problems))
+    email = values.get("email", "").lower()
+    if email:
+        values["email"] = email
+    source = str(raw.get("source") or "").strip().lower()[:100]
+    return Submission(email, position[:200], values, source, int(now if now is not None else time.time()))
+
+
+def parse_submissions(records: Sequence[Any], now: Optional[float] = None) -> Tuple[List[Submission], List[Dict[str, Any]]]:
+    """Valid submissions plus ``{"index", "error"}`` for the invalid ones."""
+    now = time.time() if now is None else now
+    submissions: List[Submission] = []
+    errors: List[Dict[str, Any]] = []
+    for index, raw in enumerate(records):
+        try:
+            submissions.append(parse_submission(raw, now=now))
+        except ValueError as exc:
+            errors.append({"index": index, "error": str(exc)})
+    return submissions, errors
+
+
+class SubmissionStore:
+    """Application form submissions in SQLite (WAL), one per (email, position).
+
+    Rows start un-notified; a notifier claims them in id order, so several
+    workers sharing the file never post the same row concurrently, and marks
+    them once the n8n webhook accepted them, so nothing is lost across restarts
+    or webhook outages.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS form_submissions (
+                id INTEGER PRIMARY KEY,
+                email TEXT NOT NULL,
+                position TEXT NOT NULL,
+                source TEXT NOT NULL DEFAULT '',
+                fields TEXT NOT NULL,
+                submitted_at INTEGER NOT NULL,
+                notified_at INTEGER,
+                claimed_by TEXT,
+                claimed_at INTEGER,
+                UNIQUE (email, position)
+            );
+            CREATE INDEX IF NOT EXISTS form_submissions_pending ON form_submissions (id) WHERE notified_at IS NULL;
+            """
+        )
+        # Files created before notifier claims existed lack their columns
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(form_submissions)")}
+        for column, kind in (("claimed_by", "TEXT"), ("claimed_at", "INTEGER")):
+            if column not in columns:
+                try:
+                    self._conn.execute(f"ALTER TABLE form_submissions ADD COLUMN {column} {kind}")
+                except sqlite3.OperationalError:
+                    # Another worker added it first
+                    pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def add_submissions(self, submissions: Iterable[Submission]) -> List[Submission]:
+        """Store a batch; returns the new ones (the first submission per email and position wins)."""
+        with self._lock:
+            batch: Dict[Tuple[str, str], Submission] = {}
+            for submission in submissions:
+                batch.setdefault((submission.email, submission.position), submission)
+            if not batch:
+                return []
+            known = set(
+                self._conn.execute(
+                    "SELECT email, position FROM form_submissions WHERE (email, position) IN "
+                    "(SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]') FROM json_each(?))",
+                    (json.dumps(list(batch)),),
+                )
+            )
+            new = [s for key, s in batch.items() if key not in known]
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO form_submissions (email, position, source, fields, submitted_at) VALUES (?, ?, ?, ?, ?)",
+                    [(s.email, s.position, s.source, json.dumps(s.fields, ensure_ascii=False), s.submitted_at) for s in new],
+                )
+            return new
+
+    def claim_notifications(self, owner: str, limit: int, lease_seconds: float = CLAIM_LEASE_SECONDS) -> List[Dict[str, Any]]:
+        """Claim up to ``limit`` un-notified rows for ``owner`` and return them in id order.
+
+        One UPDATE takes rows that are unclaimed, claimed by ``owner`` or whose
+        claim is older than ``lease_seconds``, so concurrent notifiers get
+        disjoint sets.
+        """
+        now = int(time.time())
+        with self._lock, self._conn:
+            # Take the write lock up front: a deferred read-then-write fails outright if another worker wrote meanwhile
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "UPDATE form_submissions SET claimed_by = ?, claimed_at = ? WHERE id IN ("
+                "SELECT id FROM form_submissions WHERE notified_at IS NULL "
+                "AND (claimed_at IS NULL OR claimed_by = ? OR claimed_at <= ?) ORDER BY id LIMIT ?"
+                ") RETURNING id, position, source, fields, submitted_at",
+                (owner, now, owner, now - lease_seconds, limit),
+            ).fetchall()
+        return [
+            {"id": row_id, "position": position, "source": source, "submitted_at": submitted_at, **json.loads(fields)}
+            for row_id, position, source, fields, submitted_at in sorted(rows)
+        ]
+
+    def mark_notified(self, ids: Sequence[int]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE form_submissions SET notified_at = ? WHERE id IN (SELECT value FROM json_each(?))",
+                (int(time.time()), json.dumps(list(ids))),
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM form_submissions").fetchone()[0])
+
+
+@lru_cache(maxsize=1)
+def get_submission_store() -> SubmissionStore:
+    """Process-wide store under DATA_DIR."""
+    return SubmissionStore(load_config().data_dir / "forms.sqlite")
+
+
+def _application_event(submission: Submission) -> Dict[str, Any]:
+    # One "application" event per email and position, however often the form is resubmitted or the batch retried
+    key = hashlib.sha1(f"{submission.email}\n{submission.position}".encode("utf-8")).hexdigest()
+    return {
+        "email": submission.email,
+        "position": submission.position,
+        "stage": "application",
+        "timestamp": submission.submitted_at,
+        "source": submission.source,
+        "event_id": f"form:{key}",
+    }
+
+
+def store_submissions(submissions: Sequence[Submission]) -> Tuple[int, int]:
+    """Record candidates at the "application" stage and write the batch; returns (stored, duplicates).
+
+    The pipeline and the submissions live in separate files, so the stage
+    events go first and are keyed by email and position: a retry after
+    either write failed records nothing twice and loses nothing.
+    """
+    first: Dict[Tuple[str, str], Submission] = {}
+    for submission in submissions:
+        first.setdefault((submission.email, submission.position), submission)
+    record_stage_events([_application_event(s) for s in first.values()])
+    new = get_submission_store().add_submissions(submissions)
+    return len(new), len(submissions) - len(new)
+
+
+class FormIngestor:
+    """Absorb bursts of form submissions without blocking the request path.
+
+    :meth:`offer` only validates capacity and enqueues. A writer task drains
+    the queue in batches of up to ``batch_size`` (waiting ``flush_seconds``
+    for a burst to build up) and stores each batch in one SQLite transaction
+    on a worker thread, retrying with backoff if the database write fails. A
+    notifier task claims newly stored submissions, posts them to
+    ``webhook_url`` in batches of ``notify_batch_size`` and marks them
+    notified only once delivered; with several workers each row is claimed by
+    one of them. When the queue has no room for a whole request, :meth:`offer`
+    refuses it so the sender can retry. On shutdown :meth:`drain` stores what
+    is still queued (see :class:`FormDrainMiddleware`). An accepted submission
+    is dropped only if storing it raises something other than a database
+    error, or if the drain runs out of time.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        webhook_url: Optional[str] = None,
+        queue_size: int = 20000,
+        batch_size: int = 500,
+        flush_seconds: float = 0.2,
+        notify_batch_size: int = 100,
+        timeout_seconds: float = 10.0,
+    ) -> None:
+        self.webhook_url = webhook_url
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.notify_batch_size = max(1, notify_batch_size)
+        self.timeout_seconds = timeout_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._stored: Optional[asyncio.Event] = None
+        self._draining = False
+        self._tasks: List[asyncio.Task] = []
+        self._client: Optional["httpx.AsyncClient"] = None
+        # Names this process's claims on pending rows in the shared store
+        self._owner = uuid.uuid4().hex
+        self._logger = logging.getLogger(__name__)
+        results = registry.counter("form_submissions_total", "Form submissions by outcome", ("result",))
+        self._accepted = results.labels("accepted")
+        self._rejected = results.labels("rejected")
+        self._refused = results.labels("refused")
+        self._stored_count = results.labels("stored")
+        self._duplicates = results.labels("duplicate")
+        self._failed = results.labels("failed")
+        notifications = registry.counter("form_notifications_total", "Submissions posted to the n8n webhook", ("result",))
+        self._notified = notifications.labels("sent")
+        self._notify_failed = notifications.labels("failed")
+        registry.callback("form_queue_depth", "Form submissions waiting to be stored", self.queue_depth)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def ensure_started(self) -> None:
+        if self._queue is None:
+            loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue(self.queue_size)
+            self._stored = asyncio.Event()
+            self._tasks.append(loop.create_task(self._write_loop()))
+            if self.webhook_url:
+                self._tasks.append(loop.create_task(self._notify_loop()))
+                # Deliver anything a previous process stored but did not get to notify
+                self._stored.set()
+
+    def offer(self, submissions: Sequence[Submission], rejected: int = 0) -> bool:
+        """Enqueue all of ``submissions`` or, if the queue lacks room for them, none."""
+        self.ensure_started()
+        self._rejected.inc(rejected)
+        if self.queue_size - self._queue.qsize() < len(submissions):
+            self._refused.inc(len(submissions))
+            return False
+        for submission in submissions:
+            self._queue.put_nowait(submission)
+        self._accepted.inc(len(submissions))
+        return True
+
+    async def _write_loop(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if not self._draining and self._queue.qsize() < self.batch_size - 1:
+                # Let a burst accumulate so it lands in a few transactions rather than thousands
+                await asyncio.sleep(self.flush_seconds)
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            stored, duplicates = await self._store(batch)
+            for _ in batch:
+                self._queue.task_done()
+            self._stored_count.inc(stored)
+            self._duplicates.inc(duplicates)
+            self._logger.info(
+                "form_batch",
+                extra={"extra": {"event": "form_batch", "stored": stored, "duplicates": duplicates, "queue_depth": self._queue.qsize()}},
+            )
+            if stored:
+                self._stored.set()
+
+    async def drain(self, timeout: float) -> None:
+        """Wait up to ``timeout`` seconds for every queued submission to be stored.
+
+        Stored rows the notifier has not posted yet stay pending in SQLite for
+        the next process.
+        """
+        if self._queue is None:
+            return
+        self._draining = True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            self._logger.warning(
+                "form_drain_incomplete",
+                extra={"extra": {"event": "form_drain_incomplete", "queue_depth": self._queue.qsize(), "timeout_seconds": timeout}},
+            )
+
+    async def _store(self, batch: List[Submission]) -> Tuple[int, int]:
+        """Store a batch on a worker thread; returns (stored, duplicates).
+
+        Database errors are retried with backoff. Anything else is not going
+        to pass on retry, so the batch is split to store every submission but
+        the failing one, which is logged and counted as ``failed``.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await asyncio.to_thread(store_submissions, batch)
+            except sqlite3.Error:
+                self._logger.exception("form_store_failed", extra={"extra": {"event": "form_store_failed", "batch": len(batch)}})
+                await asyncio.sleep(min(30.0, 0.5 * 2 ** attempt))
+                attempt = min(attempt + 1, 6)
+            except Exception:
+                if len(batch) == 1:
+                    self._logger.exception(
+                        "form_store_dropped", extra={"extra": {"event": "form_store_dropped", "position": batch[0].position}}
+                    )
+                    self._failed.inc()
+                    return 0, 0
+                self._logger.exception("form_store_failed", extra={"extra": {"event": "form_store_failed", "batch": len(batch)}})
+                stored = duplicates = 0
+                for submission in batch:
+                    one_stored, one_duplicate = await self._store([submission])
+                    stored += one_stored
+                    duplicates += one_duplicate
+                return stored, duplicates
+
+    def _http(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            # Imported on first delivery so httpx stays off the server startup path
+            import httpx
+
+            self._client = httpx.AsyncClient(timeout=self.timeout_seconds)
+        return self._client
+
+    async def _post(self, submissions: List[Dict[str, Any]]) -> bool:
+        body = json.dumps({"event": "form_submissions", "submissions": submissions}, ensure_ascii=False)
+        try:
+            response = await self._http().post(
+                self.webhook_url, content=body.encode("utf-8"), headers={"Content-Type": "application/json; charset=utf-8"}
+            )
+        except Exception:
+            return False
+        return response.status_code < 400
+
+    async def _notify_loop(self) -> None:
+        failures = 0
+        while True:
+            await self._stored.wait()
+            self._stored.clear()
+            while True:
+                try:
+                    pending = await asyncio.to_thread(get_submission_store().claim_notifications, self._owner, self.notify_batch_size)
+                except sqlite3.Error:
+                    self._logger.exception("form_claim_failed", extra={"extra": {"event": "form_claim_failed"}})
+                    failures = min(failures + 1, 7)
+                    await asyncio.sleep(min(60.0, 0.5 * 2 ** failures))
+                    continue
+                if not pending:
+                    break
+                if not await self._post(pending):
+                    self._notify_failed.inc(len(pending))
+                    failures = min(failures + 1, 7)
+                    await asyncio.sleep(min(60.0, 0.5 * 2 ** failures))
+                    continue
+                failures = 0
+                await asyncio.to_thread(get_submission_store().mark_notified, [s["id"] for s in pending])
+                self._notified.inc(len(pending))
+
+
+class FormDrainMiddleware:
+    """Store the submissions still queued in a :class:`FormIngestor` when the ASGI server shuts down.
+
+    Uvicorn sends ``lifespan.shutdown`` after in-flight requests finish, so
+    nothing is offered once the drain starts.
+    """
+
+    def __init__(self, app: Any, ingestor: FormIngestor, timeout_seconds: float) -> None:
+        self.app = app
+        self.ingestor = ingestor
+        self.timeout_seconds = timeout_seconds
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "lifespan":
+            await self.app(scope, self._on_shutdown(receive), send)
+            return
+        await self.app(scope, receive, send)
+
+    def _on_shutdown(self, receive: Any) -> Callable[[], Awaitable[Dict[str, Any]]]:
+        async def wrapped() -> Dict[str, Any]:
+            message = await receive()
+            if message["type"] == "lifespan.shutdown":
+                await self.ingestor.drain(self.timeout_seconds)
+            return message
+
+        return wrapped
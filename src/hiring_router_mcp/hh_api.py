@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Coroutine, Dict, List, Optional, TypeVar
+
+import httpx
+
+from .config import AppConfig, load_config
+from .skill_index import index_vacancies
+from .tracing import KIND_CLIENT, current_span, enabled as tracing_enabled, propagate, start_span
+
+T = TypeVar("T")
+
+# hh.ru serves at most 2000 results per search (page * per_page)
+MAX_RESULTS = 2000
+PER_PAGE = 100
+
+
+class HHApiError(RuntimeError):
+    pass
+
+
+class TokenBucket:
+    """Global async rate limiter shared by every request of a client.
+
+    Callers reserve a token immediately (the balance may go negative) and sleep
+    off their own deficit, so acquisition is O(1), needs no lock on a single
+    event loop and serves waiters in arrival order.
+    """
+
+    def __init__(self, rate_per_second: float, burst: Optional[float] = None) -> None:
+        self.rate = rate_per_second
+        self.capacity = burst if burst is not None else max(1.0, rate_per_second)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class ResponseCache:
+    """SQLite store of response bodies keyed by URL, with ETag and fetch time."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache (url TEXT PRIMARY KEY, etag TEXT, body TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT etag, body, fetched_at FROM http_cache WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "body": row[1], "fetched_at": row[2]}
+
+    def put(self, url: str, etag: Optional[str], body: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, etag, body, fetched_at) VALUES (?, ?, ?, ?)",
+                (url, etag, body, time.time()),
+            )
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE http_cache SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class HHClient:
+    """hh.ru vacancies API client with pooled keep-alive connections.
+
+    Requests run on a private event loop in a daemon thread, so synchronous
+    tools can call :meth:`run` from any thread (including one that already
+    runs an event loop) and the ``httpx.AsyncClient`` connection pool survives
+    between tool calls. Every request goes through one :class:`TokenBucket`;
+    GET responses are cached in SQLite and revalidated with ``If-None-Match``
+    once older than ``cache_ttl_seconds``. Cache reads and writes and skill
+    indexing run in worker threads, so disk I/O never holds up the other
+    lookups on the client loop.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://api.hh.ru",
+        api_key: Optional[str] = None,
+        user_agent: str = "hiring-router-mcp/0.1",
+        rate_per_second: float = 5.0,
+        cache_path: Optional[Path] = None,
+        cache_ttl_seconds: float = 3600.0,
+        max_connections: int = 10,
+        timeout_seconds: float = 10.0,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.user_agent = user_agent
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+        self._bucket = TokenBucket(rate_per_second)
+        self._cache = ResponseCache(cache_path) if cache_path else None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="hh-api", daemon=True)
+        self._thread.start()
+        self.requests_sent = 0
+        self.cache_hits = 0
+        self.not_modified = 0
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        if tracing_enabled():
+            # The client loop runs on its own thread; carry the caller's span over so requests nest under it
+            coro = propagate(coro, current_span())
+        future: Future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def close(self) -> None:
+        if self._client is not None:
+            self.run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        if self._cache is not None:
+            self._cache.close()
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            headers = {"User-Agent": self.user_agent, "HH-User-Agent": self.user_agent}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            )
+        return self._client
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        with start_span(f"GET hh.ru {path}", kind=KIND_CLIENT, attributes={"http.method": "GET", "http.route": path}) as span:
+            request = self._http().build_request("GET", path, params={k: v for k, v in (params or {}).items() if v is not None})
+            url = str(request.url)
+            cached = await asyncio.to_thread(self._cache.get, url) if self._cache else None
+            if cached and time.time() - cached["fetched_at"] < self.cache_ttl_seconds:
+                self.cache_hits += 1
+                if span is not None:
+                    span.set("hh.cache", "hit")
+                return json.loads(cached["body"])
+            if cached and cached["etag"]:
+                request.headers["If-None-Match"] = cached["etag"]
+
+            await self._bucket.acquire()
+            self.requests_sent += 1
+            try:
+                response = await self._http().send(request)
+            except httpx.HTTPError as exc:
+                raise HHApiError(f"hh.ru request failed: {exc}") from exc
+            if span is not None:
+                span.set("http.status_code", response.status_code)
+            if response.status_code == 304 and cached:
+                self.not_modified += 1
+                await asyncio.to_thread(self._cache.touch, url)
+                return json.loads(cached["body"])
+            if response.status_code >= 400:
+                raise HHApiError(f"hh.ru returned HTTP {response.status_code} for {path}")
+            if self._cache:
+                await asyncio.to_thread(self._cache.put, url, response.headers.get("ETag"), response.text)
+            return response.json()
+
+    async def resolve_area(self, location: Optional[str]) -> Optional[str]:
+        if not location:
+            return None
+        if location.isdigit():
+            return location
+        data = await self.get_json("/suggests/areas", {"text": location})
+        items = data.get("items") or []
+        return str(items[0]["id"]) if items else None
+
+    async def search_vacancies(self, params: Dict[str, Any], max_pages: int = 5) -> Dict[str, Any]:
+        """Fetch the first page, then the remaining pages concurrently."""
+        first = await self.get_json("/vacancies", {**params, "page": 0, "per_page": PER_PAGE})
+        pages = min(int(first.get("pages") or 1), max_pages, MAX_RESULTS // PER_PAGE)
+        rest = await asyncio.gather(
+            *(self.get_json("/vacancies", {**params, "page": page, "per_page": PER_PAGE}) for page in range(1, pages))
+        )
+        items = list(first.get("items") or [])
+        for page in rest:
+            items.extend(page.get("items") or [])
+        return {"found": first.get("found", len(items)), "items": items}
+
+    async def key_skills(self, vacancy_ids: List[str]) -> Dict[str, List[str]]:
+        details = await asyncio.gather(
+            *(self.get_json(f"/vacancies/{vacancy_id}") for vacancy_id in vacancy_ids), return_exceptions=True
+        )
+        return {
+            vacancy_id: [s.get("name") for s in (d.get("key_skills") or []) if s.get("name")]
+            for vacancy_id, d in zip(vacancy_ids, details)
+            if isinstance(d, dict)
+        }
+
+    async def market_snapshot(
+        self,
+        text: str,
+        location: Optional[str] = None,
+        experience_years: Optional[int] = None,
+        max_pages: int = 5,
+        detail_limit: int = 50,
+    ) -> Dict[str, Any]:
+        area = await self.resolve_area(location)
+        params = {"text": text, "area": area, "experience": experience_bucket(experience_years)}
+        search = await self.search_vacancies(params, max_pages=max_pages)
+        items = search["items"]
+        skills = await self.key_skills([str(item["id"]) for item in items[:detail_limit] if item.get("id")])
+        snapshot = {
+            "source": "hh.ru",
+            "query": {"text": text, "area": area, "experience": params["experience"]},
+            "found": search["found"],
+            "fetched": len(items),
+            "salary": salary_percentiles(items),
+            "top_skills": skill_frequencies(list(skills.values())),
+        }
+        try:
+            snapshot["indexed_vacancies"] = await asyncio.to_thread(index_vacancies, text, items, skills)
+        except sqlite3.Error:
+            pass
+        try:
+            from .salary_stats import bands_from_items, parse_hh_rates
+        except ImportError:
+            # numpy is optional (the "analytics" extra); simple percentiles above still apply
+            return snapshot
+        try:
+            rates = parse_hh_rates(await self.get_json("/dictionaries"))
+        except HHApiError:
+            rates = {}
+        snapshot["salary_bands"] = bands_from_items(items, rates=rates)
+        return snapshot
+
+    def stats(self) -> Dict[str, int]:
+        return {"requests_sent": self.requests_sent, "cache_hits": self.cache_hits, "not_modified": self.not_modified}
+
+
+def experience_bucket(years: Optional[int]) -> Optional[str]:
+    """Map years of experience to hh.ru's ``experience`` dictionary ids."""
+    if years is None:
+        return None
+    if years < 1:
+        return "noExperience"
+    if years < 3:
+        return "between1And3"
+    if years <= 6:
+        return "between3And6"
+    return "moreThan6"
+
+
+def salary_percentiles(items: List[Dict[str, Any]], currency: str = "RUR") -> Dict[str, Any]:
+    """p25/median/p75 of vacancy salary midpoints in one currency."""
+    points: List[float] = []
+    currencies: Counter = Counter()
+    for item in items:
+        salary = item.get("salary") or {}
+        low, high = salary.get("from"), salary.get("to")
+        if low is None and high is None:
+            continue
+        currencies[salary.get("currency")] += 1
+        if salary.get("currency") != currency:
+            continue
+        points.append((low + high) / 2 if low is not None and high is not None else (low or high))
+    result: Dict[str, Any] = {
+        "currency": currency,
+        "with_salary": sum(currencies.values()),
+        "by_currency": dict(currencies),
+        "sample_size": len(points),
+    }
+    if len(points) >= 2:
+        p25, median, p75 = statistics.quantiles(points, n=4, method="inclusive")
+        result.update(p25=round(p25), median=round(median), p75=round(p75))
+    elif points:
+        result.update(p25=points[0], median=points[0], p75=points[0])
+    return result
+
+
+def skill_frequencies(skill_lists: List[List[str]], top: int = 20) -> List[Dict[str, Any]]:
+    counts: Counter = Counter()
+    display: Dict[str, str] = {}
+    for skills in skill_lists:
+        # Count each skill once per vacancy, case-insensitively
+        names = {}
+        for skill in skills:
+            names.setdefault(skill.strip().lower(), skill.strip())
+        for key, name in names.items():
+            counts[key] += 1
+            display.setdefault(key, name)
+    total = len(skill_lists) or 1
+    return [
+        {"skill": display[key], "count": count, "share": round(count / total, 3)}
+        for key, count in counts.most_common(top)
+    ]
+
+
+def client_from_config(config: AppConfig) -> Optional[HHClient]:
+    if not config.hh_api_enabled:
+        return None
+    return HHClient(
+        base_url=config.hh_api_base_url,
+        api_key=config.hh_api_key,
+        rate_per_second=config.hh_rate_limit_per_second,
+        cache_path=config.data_dir / "hh_cache.sqlite",
+        cache_ttl_seconds=config.hh_cache_ttl_seconds,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_hh_client() -> Optional[HHClient]:
+    """Process-wide client, or None when live hh.ru lookups are disabled."""
+    return client_from_config(load_config())
+
+
+def fetch_market_snapshot(
+    text: str, location: Optional[str] = None, experience_years: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """Live market data for the tools; None if disabled, ``{"error": ...}`` on failure."""
+    client = get_hh_client()
+    if client is None:
+        return None
+    try:
+        return client.run(
+            client.market_snapshot(text, location=location, experience_years=experience_years),
+            timeout=client.timeout_seconds * 3,
+        )
+    except Exception as exc:
+        return {"source": "hh.ru", "error": str(exc)}
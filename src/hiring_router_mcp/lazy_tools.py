@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import inspect
+import json
+import logging
+import sys
+import threading
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.tools import Tool
+from mcp.server.fastmcp.utilities.func_metadata import ArgModelBase, FuncMetadata
+from pydantic import PrivateAttr
+
+from .streaming import result_signature
+
+MANIFEST_PATH = Path(__file__).with_name("tool_manifest.json")
+
+# Tool functions by defining module, in registration order
+TOOL_MODULES: Dict[str, Tuple[str, ...]] = {
+    "hiring_router_mcp.tools.recruiter": (
+        "market_research",
+        "generate_job_post",
+        "generate_application_form",
+        "generate_quiz",
+        "generate_homework",
+        "generate_candidate_journey",
+        "generate_funnel_report",
+        "role_skill_profile",
+        "shortlist_resumes",
+    ),
+    "hiring_router_mcp.tools.candidate": (
+        "candidate_assistant",
+        "resume_optimizer",
+        "interview_prep",
+        "salary_research",
+    ),
+    "hiring_router_mcp.tools.analytics": (
+        "get_request_analytics",
+        "export_logs",
+    ),
+}
+
+
+class LazyFunction:
+    """Stand-in for a tool function that imports its module on first use.
+
+    Calling it, or asking for its signature, imports the module once and
+    forwards to the real function.
+    """
+
+    def __init__(self, module: str, name: str) -> None:
+        self.__module__ = module
+        self.__name__ = name
+        self.__qualname__ = name
+        self.__doc__ = None
+        self._lazy_target: Optional[Callable[..., Any]] = None
+        self._lazy_lock = threading.Lock()
+
+    def resolve(self) -> Callable[..., Any]:
+        if self._lazy_target is None:
+            with self._lazy_lock:
+                if self._lazy_target is None:
+                    self._lazy_target = getattr(importlib.import_module(self.__module__), self.__name__)
+        return self._lazy_target
+
+    @property
+    def __signature__(self) -> inspect.Signature:
+        # Returned as-is by inspect.signature, so string annotations must be evaluated here
+        return result_signature(self.resolve())
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+
+def tool_functions(lazy: bool = False) -> Dict[str, Callable[..., Any]]:
+    functions: Dict[str, Callable[..., Any]] = {}
+    for module_name, names in TOOL_MODULES.items():
+        if lazy:
+            functions.update((name, LazyFunction(module_name, name)) for name in names)
+        else:
+            module = importlib.import_module(module_name)
+            functions.update((name, getattr(module, name)) for name in names)
+    return functions
+
+
+class LazyTool(Tool):
+    """Tool listed from manifest metadata; its argument model is built on first call.
+
+    Building the pydantic argument model and JSON schema is most of the cost of
+    registering a FastMCP tool, so the manifest carries the schemas and the
+    model is only created (via ``Tool.from_function``) when the tool is run.
+    """
+
+    _output_schema: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    _resolved: Optional[Tool] = PrivateAttr(default=None)
+
+    @cached_property
+    def output_schema(self) -> Optional[Dict[str, Any]]:
+        return self._output_schema
+
+    def resolve(self) -> Tool:
+        if self._resolved is None:
+            resolved = Tool.from_function(self.fn, name=self.name, description=self.description)
+            if resolved.parameters != self.parameters:
+                logging.getLogger(__name__).warning(
+                    "tool_manifest_stale",
+                    extra={"extra": {"event": "tool_manifest_stale", "tool": self.name}},
+                )
+            self._resolved = resolved
+        return self._resolved
+
+    async def run(self, arguments: Dict[str, Any], context: Any = None, convert_result: bool = False) -> Any:
+        return await self.resolve().run(arguments, context=context, convert_result=convert_result)
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Dict[str, Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as f:
+        return {entry["name"]: entry for entry in json.load(f)["tools"]}
+
+
+def add_lazy_tool(server: FastMCP, fn: Callable[..., Any], entry: Dict[str, Any]) -> None:
+    tool = LazyTool(
+        fn=fn,
+        name=entry["name"],
+        description=entry["description"],
+        parameters=entry["parameters"],
+        fn_metadata=FuncMetadata(arg_model=ArgModelBase),
+        is_async=inspect.iscoroutinefunction(fn),
+    )
+    tool._output_schema = entry.get("output_schema")
+    # FastMCP's public API only registers functions, which builds the schema we are deferring
+    server._tool_manager._tools[tool.name] = tool
+
+
+def build_manifest(server: FastMCP) -> Dict[str, Any]:
+    tools = []
+    for tool in server._tool_manager.list_tools():
+        entry = {
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": tool.parameters,
+            "output_schema": tool.output_schema,
+        }
+        # Lazy startup must pick the streaming wrapper without importing the tool's module
+        if getattr(tool.fn, "streaming", False):
+            entry["streaming"] = True
+        tools.append(entry)
+    return {"tools": tools}
+
+
+def main() -> None:
+    """Regenerate (or ``--check``) the manifest from an eagerly built server."""
+    parser = argparse.ArgumentParser(prog="hiring-router-manifest")
+    parser.add_argument("--check", action="store_true", help="exit 1 if the manifest is out of date")
+    args = parser.parse_args()
+
+    from .server import build_server
+
+    manifest = build_manifest(build_server(startup_mode="eager"))
+    rendered = json.dumps(manifest, ensure_ascii=False, indent=2) + "\n"
+    if args.check:
+        current = MANIFEST_PATH.read_text(encoding="utf-8") if MANIFEST_PATH.exists() else ""
+        if current != rendered:
+            print(f"{MANIFEST_PATH.name} is out of date; run hiring-router-manifest", file=sys.stderr)
+            sys.exit(1)
+        return
+    MANIFEST_PATH.write_text(rendered, encoding="utf-8")
+    print(f"wrote {len(manifest['tools'])} tools to {MANIFEST_PATH}")
@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from .log_segments import scan_segment, segment_files
+from .utils import end_timestamp_key, parse_moment, resolve_window, timestamp_key
+
+LOG_FILE_NAME = "requests.jsonl"
+
+EXPORT_FORMATS = ("ndjson", "arrow")
+COMPRESSIONS = ("gzip", "zstd", "none")
+
+# Output is flushed in chunks of about this size, so memory does not grow with the export
+CHUNK_BYTES = 64 * 1024
+ARROW_BATCH_ROWS = 8192
+
+# Typed Arrow columns; every other field of a record goes into "extra" as JSON
+ARROW_STRING_FIELDS = ("level", "logger", "message", "event", "tool", "client_id", "batch_id")
+
+MEDIA_TYPES = {
+    ("ndjson", "gzip"): ("application/gzip", ".ndjson.gz"),
+    ("ndjson", "zstd"): ("application/zstd", ".ndjson.zst"),
+    ("ndjson", "none"): ("application/x-ndjson", ".ndjson"),
+    ("arrow", "zstd"): ("application/vnd.apache.arrow.stream", ".arrows"),
+    ("arrow", "none"): ("application/vnd.apache.arrow.stream", ".arrows"),
+}
+
+
+def log_files(log_dir: Path, file_name: str = LOG_FILE_NAME) -> List[Tuple[Path, os.stat_result]]:
+    """The active log and its rotated backups, oldest first."""
+    found = []
+    for path in log_dir.glob(file_name + "*"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        found.append((path, st))
+    return sorted(found, key=lambda item: item[1].st_mtime)
+
+
+@dataclass(frozen=True)
+class ExportFilter:
+    """Records to export: a UTC ``[start, end)`` window and optional event/tool allow-lists."""
+
+    start: Optional[str] = None
+    end: Optional[str] = None
+    events: FrozenSet[str] = frozenset()
+    tools: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def from_args(
+        cls,
+        time_range: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        event: Optional[str] = None,
+        tool: Optional[str] = None,
+    ) -> "ExportFilter":
+        """Build from tool/query arguments; ``event`` and ``tool`` are comma-separated lists."""
+        start_dt, end_dt = resolve_window(time_range, start, end)
+        return cls(
+            start=timestamp_key(start_dt) if start_dt else None,
+            end=end_timestamp_key(end_dt) if end_dt else None,
+            events=_names(event),
+            tools=_names(tool),
+        )
+
+    def in_window(self, ts: str) -> bool:
+        return not ((self.start and ts < self.start) or (self.end and ts >= self.end))
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        if (self.start or self.end) and not self.in_window(str(record.get("timestamp", ""))[:19]):
+            return False
+        if self.events and record.get("event") not in self.events:
+            return False
+        return not self.tools or record.get("tool") in self.tools
+
+    def bounds(self) -> Tuple[Optional[float], Optional[float]]:
+        """The window as epoch seconds."""
+        return (
+            parse_moment(self.start).timestamp() if self.start else None,
+            parse_moment(self.end).timestamp() if self.end else None,
+        )
+
+    def files(self, log_dir: Path, segments: bool = False) -> List[Tuple[Path, os.stat_result]]:
+        start_epoch, end_epoch = self.bounds()
+        if segments:
+            return [(s.path, s.stat) for s in segment_files(log_dir, start_epoch, end_epoch)]
+        # A file last written before the window starts cannot hold matching records
+        return [(p, st) for p, st in log_files(log_dir) if start_epoch is None or st.st_mtime >= start_epoch]
+
+
+def _names(spec: Optional[str]) -> FrozenSet[str]:
+    return frozenset(name.strip() for name in (spec or "").split(",") if name.strip())
+
+
+def _scan(path: Path, offset: int) -> Iterator[Tuple[int, bytes]]:
+    """``(offset after line, raw line)`` for each complete line from ``offset``."""
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        return
+    with f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                # Partially written line; it belongs to a later export
+                return
+            offset += len(raw)
+            yield offset, raw
+
+
+def _records(path: Path, offset: int, segments: bool) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """``(offset after record, record or None if unparseable)`` from a JSONL file or a segment."""
+    if segments:
+        yield from scan_segment(path, offset)
+        return
+    for end, raw in _scan(path, offset):
+        yield end, _record(raw)
+
+
+def _record(raw: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        record = json.loads(raw)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+# JsonLogFormatter writes the timestamp first, so a time window can usually be checked without parsing
+_TS_PREFIX = b'{"timestamp": "'
+_TS_SLICE = slice(len(_TS_PREFIX), len(_TS_PREFIX) + 19)
+
+
+def iter_lines(
+    log_dir: Path, flt: ExportFilter, parse: bool = True, segments: bool = False
+) -> Iterator[Tuple[bytes, Optional[Dict[str, Any]]]]:
+    """Matching ``(raw line, record)`` pairs across all log files, oldest file first.
+
+    With ``parse=False`` lines that only need a time check are passed through
+    verbatim and ``record`` is None. With ``segments`` records come from the
+    segmented binary log and each line is their JSON encoding.
+    """
+    if segments:
+        start, end = flt.bounds()
+        for path, _ in flt.files(log_dir, segments=True):
+            for _, record in scan_segment(path, 0, start, end):
+                if flt.matches(record):
+                    yield (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"), record
+        return
+    windowed = bool(flt.start or flt.end)
+    must_parse = parse or bool(flt.events or flt.tools)
+    for path, _ in flt.files(log_dir):
+        for _, raw in _scan(path, 0):
+            if not must_parse and (not windowed or raw.startswith(_TS_PREFIX)):
+                if not windowed or flt.in_window(raw[_TS_SLICE].decode("ascii", "replace")):
+                    yield raw, None
+                continue
+            record = _record(raw)
+            if record is not None and flt.matches(record):
+                yield raw, record
+
+
+def _chunks(lines: Iterable[bytes]) -> Iterator[bytes]:
+    buffer: List[bytes] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def ndjson_stream(log_dir: Path, flt: ExportFilter, compression: str = "gzip", segments: bool = False) -> Iterator[bytes]:
+    """Matching records as (compressed) NDJSON, yielded in chunks as the files are read."""
+    chunks = _chunks(raw for raw, _ in iter_lines(log_dir, flt, parse=False, segments=segments))
+    if compression == "none":
+        yield from chunks
+        return
+    if compression == "gzip":
+        compressor: Any = zlib.compressobj(6, zlib.DEFLATED, 31)
+    else:
+        compressor = _zstd().ZstdCompressor(level=3).compressobj()
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+class _Sink:
+    """Write-only file object that hands Arrow's output back in pieces."""
+
+    def __init__(self) -> None:
+        self.parts: List[bytes] = []
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def arrow_stream(log_dir: Path, flt: ExportFilter, compression: str = "zstd", segments: bool = False) -> Iterator[bytes]:
+    """Matching records as an Arrow IPC stream of fixed-size record batches.
+
+    Common fields get typed columns (``timestamp`` as UTC microseconds,
+    ``duration_ms`` as float64); the rest of each record is kept in ``extra``
+    as JSON. Buffers are compressed inside the IPC stream.
+    """
+    pa = _pyarrow()
+    schema = pa.schema(
+        [pa.field("timestamp", pa.timestamp("us", tz="UTC"))]
+        + [pa.field(name, pa.string()) for name in ARROW_STRING_FIELDS]
+        + [pa.field("duration_ms", pa.float64()), pa.field("extra", pa.string())]
+    )
+    sink = _Sink()
+    options = pa.ipc.IpcWriteOptions(compression=None if compression == "none" else "zstd")
+    writer = pa.ipc.new_stream(sink, schema, options=options)
+
+    columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+
+    def flush_batch() -> bytes:
+        stamps = pa.array(columns["timestamp"], pa.string())
+        try:
+            stamps = stamps.cast(schema.field("timestamp").type)
+        except pa.ArrowInvalid:
+            stamps = pa.array([_moment(v) for v in columns["timestamp"]], schema.field("timestamp").type)
+        arrays = [stamps] + [pa.array(columns[name], schema.field(name).type) for name in schema.names[1:]]
+        writer.write_batch(pa.record_batch(arrays, schema=schema))
+        for values in columns.values():
+            values.clear()
+        return sink.take()
+
+    for _, record in iter_lines(log_dir, flt, segments=segments):
+        stamp = record.pop("timestamp", None)
+        columns["timestamp"].append(stamp if isinstance(stamp, str) else None)
+        for name in ARROW_STRING_FIELDS:
+            value = record.pop(name, None)
+            columns[name].append(None if value is None else str(value))
+        duration = record.pop("duration_ms", None)
+        columns["duration_ms"].append(float(duration) if isinstance(duration, (int, float)) else None)
+        columns["extra"].append(json.dumps(record, ensure_ascii=False, default=str) if record else None)
+        if len(columns["extra"]) >= ARROW_BATCH_ROWS:
+            yield flush_batch()
+    if columns["extra"]:
+        yield flush_batch()
+    writer.close()
+    yield sink.take()
+
+
+def _moment(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return parse_moment(value) if value else None
+    except ValueError:
+        return None
+
+
+def export_stream(
+    log_dir: Path, flt: ExportFilter, fmt: str = "ndjson", compression: Optional[str] = None, segments: bool = False
+) -> Tuple[Iterator[bytes], str, str]:
+    """``(chunks, media type, file suffix)``; raises ValueError on unknown options and
+    ImportError when the optional dependency a format needs is missing."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format {fmt!r}; use one of {', '.join(EXPORT_FORMATS)}")
+    compression = compression or ("gzip" if fmt == "ndjson" else "zstd")
+    if (fmt, compression) not in MEDIA_TYPES:
+        raise ValueError(f"Unsupported compression {compression!r} for {fmt}; use one of {', '.join(COMPRESSIONS)} (arrow: zstd or none)")
+    # Resolve optional imports now, so a missing package fails before the response starts
+    if fmt == "arrow":
+        _pyarrow()
+        chunks = arrow_stream(log_dir, flt, compression, segments)
+    else:
+        if compression == "zstd":
+            _zstd()
+        chunks = ndjson_stream(log_dir, flt, compression, segments)
+    media_type, suffix = MEDIA_TYPES[(fmt, compression)]
+    return chunks, media_type, suffix
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as exc:
+        raise ImportError("Arrow export needs pyarrow (pip install 'hiring-router-mcp[export]')") from exc
+    return pyarrow
+
+
+def _zstd() -> Any:
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ImportError("zstd compression needs zstandard (pip install 'hiring-router-mcp[export]')") from exc
+    return zstandard
+
+
+def _encode_cursor(state: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    """The state ``_encode_cursor`` packed, with every field checked; ValueError for anything else."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        file_key, offset, mtime = state["file"], state["offset"], state["mtime"]
+        valid = (
+            isinstance(file_key, list)
+            and len(file_key) == 2
+            and all(_is_int(part) for part in file_key)
+            and _is_int(offset)
+            and offset >= 0
+            and isinstance(mtime, (int, float))
+            and not isinstance(mtime, bool)
+            and all(state.get(name) is None or isinstance(state[name], str) for name in ("start", "end"))
+            and all(
+                isinstance(state.get(name, []), list) and all(isinstance(v, str) for v in state.get(name, []))
+                for name in ("events", "tools")
+            )
+        )
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid export cursor") from exc
+    if not valid:
+        raise ValueError("Invalid export cursor")
+    state["file"] = tuple(file_key)
+    return state
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def export_page(
+    log_dir: Path, flt: ExportFilter, cursor: Optional[str] = None, limit: int = 200, segments: bool = False
+) -> Dict[str, Any]:
+    """One page of matching records plus an opaque cursor for the next.
+
+    The cursor carries the filter and a position (file identity and byte
+    offset), so paging survives log rotation: rotated files keep their inode.
+    ``next_cursor`` is None once every file has been read to the end.
+    """
+    position: Optional[Tuple[int, int]] = None
+    offset, after_mtime = 0, None
+    if cursor:
+        state = _decode_cursor(cursor)
+        flt = ExportFilter(
+            start=state.get("start"),
+            end=state.get("end"),
+            events=frozenset(state.get("events", ())),
+            tools=frozenset(state.get("tools", ())),
+        )
+        position, offset, after_mtime = state["file"], state["offset"], state["mtime"]
+
+    files = flt.files(log_dir, segments)
+    keys = [(st.st_dev, st.st_ino) for _, st in files]
+    if position in keys:
+        files = files[keys.index(position):]
+    elif after_mtime is not None:
+        # The cursor's file has been deleted (backup expiry); carry on with anything newer
+        files = [(p, st) for p, st in files if st.st_mtime > after_mtime]
+        offset = 0
+
+    records: List[Dict[str, Any]] = []
+    for path, st in files:
+        key = (st.st_dev, st.st_ino)
+        start = offset if key == position else 0
+        for end, record in _records(path, start, segments):
+            if record is not None and flt.matches(record):
+                records.append(record)
+                if len(records) >= limit:
+                    state = {**asdict(flt), "file": list(key), "offset": end, "mtime": st.st_mtime}
+                    state["events"], state["tools"] = sorted(flt.events), sorted(flt.tools)
+                    return {"records": records, "next_cursor": _encode_cursor(state)}
+    return {"records": records, "next_cursor": None}
@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+# Segmented binary request log, written next to (or instead of) requests.jsonl when
+# LOG_FORMAT is "segments" or "both". Each segment is one append-only file under
+# <log_dir>/segments named requests.<first record, epoch µs>.<pid>.seg:
+#
+#   MAGIC, then one frame per record as it is logged:
+#     _FRAME header: body length, created (epoch s), duration_ms (NaN if absent), levelno,
+#                    byte lengths of logger, event, tool, client_id and message
+#     the five UTF-8 strings, then the remaining extra fields as a JSON object (omitted if none)
+#   on seal, a column block (8-byte aligned, little-endian) with one entry per frame:
+#     created f64, duration_ms f64, event/tool/client_id string ids u32, levelno u8,
+#     then the id -> string table as a JSON list (id 0 means absent)
+#   and a footer: _SEALED, min/max created, record count, column block offset, END_MAGIC
+#
+# A writer seals its segment at SEGMENT_MAX_BYTES or at the UTC day boundary. Readers
+# skip a whole segment by its time bounds (footer, or file name and mtime while it is
+# still being written) and aggregate sealed ones from the column block alone; frames
+# are memory-mapped only to rebuild full records or to read the segment being written.
+SEGMENT_DIR_NAME = "segments"
+SEGMENT_PREFIX = "requests."
+SEGMENT_SUFFIX = ".seg"
+SEGMENT_MAX_BYTES = 16 * 1024 * 1024
+# Same retention as the 14 daily JSONL backups
+SEGMENT_BACKUP_DAYS = 14
+
+MAGIC = b"HRSEG01\n"
+END_MAGIC = b"HRSEGEND"
+_FRAME = struct.Struct("<IddBHHHHI")
+_FOOTER = struct.Struct("<IddQQ8s")
+_SEALED = 0xFFFFFFFF
+_MAX_SHORT = 0xFFFF // 4  # characters that always fit a uint16 byte length
+_NAN = float("nan")
+# Records can reach the writer slightly out of order (threads, the non-blocking log
+# queue), so an unsealed segment's lower bound from its name is widened by this much
+_ORDER_SLACK_SECONDS = 60.0
+
+_LEVEL_NAMES: Dict[int, str] = {}
+_second_cache: Tuple[int, str] = (-1, "")
+
+
+def iso_timestamp(created: float) -> str:
+    """``YYYY-MM-DDTHH:MM:SS.ffffffZ`` (UTC); the date/time part is formatted once per second."""
+    global _second_cache
+    second = int(created)
+    cached = _second_cache
+    if cached[0] != second:
+        cached = _second_cache = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+    return f"{cached[1]}.{min(round((created - second) * 1e6), 999999):06d}Z"
+
+
+def segment_dir(log_dir: Path) -> Path:
+    return log_dir / SEGMENT_DIR_NAME
+
+
+def _column_value(extra: Dict[str, Any], name: str) -> Optional[str]:
+    # Short strings go into the header; anything else stays in the extra JSON
+    value = extra.get(name)
+    if value.__class__ is str and 0 < len(value) <= _MAX_SHORT:
+        del extra[name]
+        return value
+    return None
+
+
+def encode_record(
+    created: float, levelno: int, logger: str, message: str, fields: Mapping[str, Any]
+) -> Tuple[bytes, float, Optional[str], Optional[str], Optional[str]]:
+    """One frame plus the values that go into the column block: ``(frame, duration_ms
+    or NaN, event, tool, client_id)``. ``fields`` are the record's extra fields (as
+    JsonLogFormatter would merge them)."""
+    extra = dict(fields)
+    duration = extra.get("duration_ms")
+    if duration.__class__ is float or duration.__class__ is int:
+        del extra["duration_ms"]
+    else:
+        duration = _NAN
+    event = _column_value(extra, "event")
+    tool = _column_value(extra, "tool")
+    client_id = _column_value(extra, "client_id")
+    logger_bytes = logger[:_MAX_SHORT].encode("utf-8")
+    event_bytes = event.encode("utf-8") if event else b""
+    tool_bytes = tool.encode("utf-8") if tool else b""
+    client_bytes = client_id.encode("utf-8") if client_id else b""
+    text = message.encode("utf-8")
+    tail = json.dumps(extra, ensure_ascii=False, default=str).encode("utf-8") if extra else b""
+    strings = logger_bytes + event_bytes + tool_bytes + client_bytes + text + tail
+    head = _FRAME.pack(
+        _FRAME.size - 4 + len(strings), created, duration, min(max(levelno, 0), 255),
+        len(logger_bytes), len(event_bytes), len(tool_bytes), len(client_bytes), len(text),
+    )
+    return head + strings, float(duration), event, tool, client_id
+
+
+@dataclass
+class SegmentColumns:
+    """The fixed fields of a segment's records, one array entry per record."""
+
+    created: array
+    duration: array
+    event: array
+    tool: array
+    client_id: array
+    level: array
+    # String table for event/tool/client_id ids; strings[0] is None (absent)
+    strings: List[Optional[str]]
+
+    @classmethod
+    def empty(cls) -> "SegmentColumns":
+        return cls(array("d"), array("d"), array("I"), array("I"), array("I"), array("B"), [None])
+
+    def __len__(self) -> int:
+        return len(self.created)
+
+    def append(
+        self,
+        ids: Dict[Optional[str], int],
+        created: float,
+        duration: float,
+        levelno: int,
+        event: Optional[str],
+        tool: Optional[str],
+        client_id: Optional[str],
+    ) -> None:
+        self.created.append(created)
+        self.duration.append(duration)
+        self.event.append(self._id(ids, event))
+        self.tool.append(self._id(ids, tool))
+        self.client_id.append(self._id(ids, client_id))
+        self.level.append(levelno)
+
+    def _id(self, ids: Dict[Optional[str], int], value: Optional[str]) -> int:
+        sid = ids.get(value)
+        if sid is None:
+            sid = ids[value] = len(self.strings)
+            self.strings.append(value)
+        return sid
+
+    def to_bytes(self) -> bytes:
+        arrays = (self.created, self.duration, self.event, self.tool, self.client_id, self.level)
+        if sys.byteorder == "big":
+            arrays = tuple(array(a.typecode, a) for a in arrays)
+            for a in arrays:
+                a.byteswap()
+        return b"".join(a.tobytes() for a in arrays) + json.dumps(self.strings[1:], ensure_ascii=False).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, block: bytes, count: int) -> "SegmentColumns":
+        columns = cls.empty()
+        pos = 0
+        for a in (columns.created, columns.duration, columns.event, columns.tool, columns.client_id, columns.level):
+            size = count * a.itemsize
+            a.frombytes(block[pos : pos + size])
+            if sys.byteorder == "big":
+                a.byteswap()
+            pos += size
+        columns.strings.extend(json.loads(block[pos:]))
+        return columns
+
+
+class SegmentWriter:
+    """Append frames to the current segment; seal and start a new one on size or day change.
+
+    Not thread-safe on its own: :class:`~hiring_router_mcp.logging_setup.SegmentLogHandler`
+    calls it under the handler lock. Every process writes its own segments.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = SEGMENT_MAX_BYTES, backup_days: int = SEGMENT_BACKUP_DAYS) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backup_days = backup_days
+        self._file: Optional[IO[bytes]] = None
+        self._size = 0
+        self._day_end = 0.0
+        self._columns = SegmentColumns.empty()
+        self._ids: Dict[Optional[str], int] = {None: 0}
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, created: float, levelno: int, logger: str, message: str, fields: Mapping[str, Any]) -> None:
+        frame, duration, event, tool, client_id = encode_record(created, levelno, logger, message, fields)
+        if self._file is None or self._size >= self.max_bytes or created >= self._day_end:
+            self._roll(created)
+        assert self._file is not None
+        self._file.write(frame)
+        # Flushed per record like the JSONL handler, so readers in this process see it at once
+        self._file.flush()
+        self._size += len(frame)
+        self._columns.append(self._ids, created, duration, min(max(levelno, 0), 255), event, tool, client_id)
+
+    def close(self) -> None:
+        """Seal the current segment: append the column block and footer."""
+        if self._file is None:
+            return
+        columns = self._columns
+        if len(columns):
+            padding = -self._size % 8
+            offset = self._size + padding
+            self._file.write(b"\0" * padding + columns.to_bytes())
+            self._file.write(_FOOTER.pack(_SEALED, min(columns.created), max(columns.created), len(columns), offset, END_MAGIC))
+        self._file.close()
+        self._file = None
+
+    def _roll(self, created: float) -> None:
+        self.close()
+        self._purge()
+        path = self.directory / f"{SEGMENT_PREFIX}{int(created * 1e6):017d}.{os.getpid()}{SEGMENT_SUFFIX}"
+        self._file = path.open("ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._size = self._file.tell()
+        self._day_end = (created // 86400 + 1) * 86400
+        self._columns = SegmentColumns.empty()
+        self._ids = {None: 0}
+
+    def _purge(self) -> None:
+        cutoff = time.time() - self.backup_days * 86400
+        for segment in segment_files(self.directory.parent):
+            if segment.stat.st_mtime < cutoff:
+                try:
+                    segment.path.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+@dataclass(frozen=True)
+class Segment:
+    path: Path
+    stat: os.stat_result
+    first: float
+    last: float
+    sealed: bool
+
+
+def segment_start(path: Path) -> float:
+    """Creation time (epoch seconds) of a segment's first record, from its file name."""
+    return int(path.name[len(SEGMENT_PREFIX) :].split(".", 1)[0]) / 1e6
+
+
+def segment_files(log_dir: Path, start: Optional[float] = None, end: Optional[float] = None) -> List[Segment]:
+    """Segments that may hold records created in ``[start, end)`` (epoch seconds), oldest first."""
+    found = []
+    for path in segment_dir(log_dir).glob(SEGMENT_PREFIX + "*" + SEGMENT_SUFFIX):
+        try:
+            first = segment_start(path)
+            st = path.stat()
+        except (ValueError, FileNotFoundError):
+            continue
+        footer = _read_footer(path, st.st_size)
+        if footer is not None:
+            segment = Segment(path, st, footer[0], footer[1], True)
+        else:
+            segment = Segment(path, st, first - _ORDER_SLACK_SECONDS, st.st_mtime, False)
+        if (start is not None and segment.last < start) or (end is not None and segment.first >= end):
+            continue
+        found.append(segment)
+    # Zero-padded start times in the names sort chronologically
+    return sorted(found, key=lambda s: s.path.name)
+
+
+def _footer(data: bytes) -> Optional[Tuple[float, float, int, int]]:
+    """``(min created, max created, count, column block offset)`` if ``data`` ends with a footer."""
+    if len(data) < _FOOTER.size:
+        return None
+    sentinel, low, high, count, offset, end_magic = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+    return (low, high, count, offset) if sentinel == _SEALED and end_magic == END_MAGIC else None
+
+
+def _read_footer(path: Path, size: int) -> Optional[Tuple[float, float, int, int]]:
+    if size < len(MAGIC) + _FOOTER.size:
+        return None
+    try:
+        with path.open("rb") as f:
+            f.seek(size - _FOOTER.size)
+            return _footer(f.read(_FOOTER.size))
+    except OSError:
+        return None
+
+
+def _level_name(levelno: int) -> str:
+    name = _LEVEL_NAMES.get(levelno)
+    if name is None:
+        name = _LEVEL_NAMES[levelno] = logging.getLevelName(levelno)
+    return name
+
+
+def _frames(buf: Any, offset: int, limit: int) -> Iterator[Tuple[int, Tuple[Any, ...]]]:
+    """``(frame start, header fields)`` for each complete frame in ``buf[offset:limit]``."""
+    pos = max(offset, len(MAGIC))
+    while pos + _FRAME.size <= limit:
+        header = _FRAME.unpack_from(buf, pos)
+        if header[0] == _SEALED or pos + 4 + header[0] > limit:
+            # Footer, or a partially written frame that belongs to a later read
+            return
+        yield pos, header
+        pos += 4 + header[0]
+
+
+def _open_segment(f: IO[bytes]) -> Optional[Tuple[mmap.mmap, int, Optional[Tuple[float, float, int, int]]]]:
+    size = os.fstat(f.fileno()).st_size
+    if size <= len(MAGIC):
+        return None
+    buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if buf[: len(MAGIC)] != MAGIC:
+        buf.close()
+        return None
+    footer = _footer(buf[max(0, size - _FOOTER.size) :]) if size >= len(MAGIC) + _FOOTER.size else None
+    return buf, size, footer
+
+
+def scan_segment(
+    path: Path,
+    offset: int = 0,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    full: bool = True,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """``(offset after frame, record)`` for each complete frame from ``offset``.
+
+    Records come out shaped like the JSONL ones. Frames outside ``[start, end)``
+    are skipped on their fixed header alone; with ``full=False`` the logger,
+    message and extra JSON are not decoded either.
+    """
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        return
+    with f:
+        opened = _open_segment(f)
+        if opened is None:
+            return
+        buf, size, footer = opened
+        with buf:
+            limit = footer[3] if footer else size
+            for pos, header in _frames(buf, offset, limit):
+                length, created, duration, levelno, n_logger, n_event, n_tool, n_client, n_message = header
+                frame_end = pos + 4 + length
+                if (start is not None and created < start) or (end is not None and created >= end):
+                    continue
+                p = pos + _FRAME.size
+                record: Dict[str, Any] = {"timestamp": iso_timestamp(created), "level": _level_name(levelno)}
+                if full:
+                    record["logger"] = buf[p : p + n_logger].decode("utf-8", "replace")
+                p += n_logger
+                for name, n in (("event", n_event), ("tool", n_tool), ("client_id", n_client)):
+                    if n:
+                        record[name] = buf[p : p + n].decode("utf-8", "replace")
+                        p += n
+                if duration == duration:
+                    record["duration_ms"] = duration
+                if full:
+                    record["message"] = buf[p : p + n_message].decode("utf-8", "replace")
+                    p += n_message
+                    if p < frame_end:
+                        try:
+                            extra = json.loads(buf[p:frame_end])
+                        except ValueError:
+                            extra = None
+                        if isinstance(extra, dict):
+                            record.update(extra)
+                yield frame_end, record
+
+
+def read_columns(path: Path, offset: int = 0) -> Tuple[SegmentColumns, int]:
+    """Fixed fields of the records from ``offset`` on, plus the offset to resume from.
+
+    A sealed segment read from the start comes straight from its column block;
+    otherwise (the segment being written, or the rest of one sealed since the
+    last read) the frame headers are memory-mapped and walked. Once a segment
+    is sealed the resume offset is its size, so it is never read again.
+    """
+    columns = SegmentColumns.empty()
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        return columns, offset
+    with f:
+        opened = _open_segment(f)
+        if opened is None:
+            return columns, offset
+        buf, size, footer = opened
+        with buf:
+            if footer and offset <= len(MAGIC):
+                return SegmentColumns.from_bytes(buf[footer[3] : size - _FOOTER.size], footer[2]), size
+            ids: Dict[Optional[str], int] = {None: 0}
+            resume = offset
+            for pos, header in _frames(buf, offset, footer[3] if footer else size):
+                length, created, duration, levelno, n_logger = header[:5]
+                p = pos + _FRAME.size + n_logger
+                names: List[Optional[str]] = []
+                for n in header[5:8]:
+                    names.append(buf[p : p + n].decode("utf-8", "replace") if n else None)
+                    p += n
+                columns.append(ids, created, duration, levelno, *names)
+                resume = pos + 4 + length
+            return columns, size if footer else resume
+
+
+def iter_segment_records(
+    log_dir: Path, start: Optional[float] = None, end: Optional[float] = None, full: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """Records created in ``[start, end)`` across all segments, skipping segments outside it."""
+    for segment in segment_files(log_dir, start, end):
+        inside = segment.sealed and (start is None or segment.first >= start) and (end is None or segment.last < end)
+        for _, record in scan_segment(segment.path, 0, None if inside else start, None if inside else end, full):
+            yield record
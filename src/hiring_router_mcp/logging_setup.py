@@ -1,21 +1,29 @@
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
-from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
-import hmac
-import hashlib
-from typing import Optional
+import queue
+import threading
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-import requests
+from .log_segments import SEGMENT_MAX_BYTES, SegmentWriter, iso_timestamp, segment_dir
+from .tracing import KIND_CLIENT, current_span, start_span, use_span
+from .utils import hmac_signature
+
+if TYPE_CHECKING:
+    import requests
 
 
 class JsonLogFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:  # noqa: D401
         data = {
-            "timestamp": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
+            "timestamp": iso_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -27,53 +35,360 @@ class JsonLogFormatter(logging.Formatter):
         return json.dumps(data, ensure_ascii=False)
 
 
+class SegmentLogHandler(logging.Handler):
+    """Append records to the segmented binary log (see :mod:`hiring_router_mcp.log_segments`).
+
+    Fixed fields are packed into a binary header and only the remaining extra
+    fields are serialized as JSON, so a record costs less to write and far
+    less to scan than a JSONL line.
+    """
+
+    def __init__(self, log_dir: Path, max_bytes: int = SEGMENT_MAX_BYTES) -> None:
+        super().__init__()
+        self.writer = SegmentWriter(segment_dir(log_dir), max_bytes=max_bytes)
+        self._exc_formatter = logging.Formatter()
+
+    def emit(self, record: logging.LogRecord) -> None:  # noqa: D401
+        try:
+            fields = record.extra if hasattr(record, "extra") and isinstance(record.extra, dict) else {}
+            if record.exc_info:
+                fields = {"exc_info": self._exc_formatter.formatException(record.exc_info), **fields}
+            self.writer.write(record.created, record.levelno, record.name, record.getMessage(), fields)
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        with self.lock:
+            self.writer.close()
+        super().close()
+
+
+def _new_session() -> "requests.Session":
+    # Imported on first delivery so requests stays off the server startup path
+    import requests
+
+    return requests.Session()
+
+
 class WebhookLogHandler(logging.Handler):
     def __init__(self, url: str, timeout_seconds: float = 2.0, secret: Optional[str] = None) -> None:
         super().__init__()
         self.url = url
         self.timeout_seconds = timeout_seconds
-        self.session = requests.Session()
         self.secret = secret
 
+    @cached_property
+    def session(self) -> "requests.Session":
+        return _new_session()
+
     def emit(self, record: logging.LogRecord) -> None:  # noqa: D401
         try:
             payload_str = self.format(record)
             # payload_str is JSON from JsonLogFormatter
             headers = {"Content-Type": "application/json; charset=utf-8"}
             if self.secret:
-                signature = hmac.new(self.secret.encode("utf-8"), payload_str.encode("utf-8"), hashlib.sha256).hexdigest()
-                headers["X-Signature"] = f"sha256={signature}"
-
-            self.session.post(
-                self.url,
-                data=payload_str.encode("utf-8"),
-                headers=headers,
-                timeout=self.timeout_seconds,
-            )
+                headers["X-Signature"] = hmac_signature(self.secret, payload_str.encode("utf-8"))
+
+            # Inside the tool's trace: on the caller's thread the span is current, and in non-blocking
+            # mode _RecordQueueHandler carries it over to the listener thread on the record
+            parent = getattr(record, "trace_span", current_span())
+            with use_span(parent), start_span("POST log webhook", kind=KIND_CLIENT) as span:
+                response = self.session.post(
+                    self.url,
+                    data=payload_str.encode("utf-8"),
+                    headers=headers,
+                    timeout=self.timeout_seconds,
+                )
+                if span is not None:
+                    span.set("http.status_code", response.status_code)
         except Exception:
             # Never raise from a handler; swallow to avoid logging recursion
             pass
 
 
-def setup_logging(log_dir: Path, level: str = "INFO", webhook_url: Optional[str] = None, webhook_secret: Optional[str] = None) -> None:
+class BatchingWebhookLogHandler(logging.Handler):
+    """Ship log records to the webhook from a background thread.
+
+    ``emit`` only formats the record and enqueues it; a worker thread drains the
+    queue into NDJSON batches (one POST per batch) signed with the same
+    ``X-Signature`` scheme as :class:`WebhookLogHandler`. When the queue is full
+    the record is dropped and counted instead of blocking the caller.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        url: str,
+        timeout_seconds: float = 2.0,
+        secret: Optional[str] = None,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+    ) -> None:
+        super().__init__()
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+        self.secret = secret
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max_queue_size)
+        self._flush_requested = threading.Event()
+        self._flushed = threading.Event()
+        self.enqueued = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self.retries = 0
+        self._worker = threading.Thread(target=self._run, name="webhook-log-shipper", daemon=True)
+        self._worker.start()
+
+    @cached_property
+    def session(self) -> "requests.Session":
+        # Only the worker thread posts, so lazy creation needs no lock
+        return _new_session()
+
+    def emit(self, record: logging.LogRecord) -> None:  # noqa: D401
+        try:
+            payload_str = self.format(record)
+        except Exception:
+            return
+        try:
+            self._queue.put_nowait(payload_str)
+            self.enqueued += 1
+        except queue.Full:
+            # Handler.handle() holds self.lock around emit, so counters stay consistent
+            self.dropped += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "sent": self.sent,
+            "failed": self.failed,
+            "batches": self.batches,
+            "retries": self.retries,
+        }
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        if not self._worker.is_alive():
+            return
+        self._flushed.clear()
+        self._flush_requested.set()
+        self._flushed.wait(timeout if timeout is not None else self._max_send_seconds())
+
+    def close(self) -> None:
+        if self._worker.is_alive():
+            try:
+                self._queue.put(self._STOP, timeout=self.timeout_seconds)
+            except queue.Full:
+                pass
+            self._worker.join(self._max_send_seconds() + self.flush_interval)
+        super().close()
+
+    def _max_send_seconds(self) -> float:
+        backoff = sum(self.backoff_seconds * (2 ** i) for i in range(self.max_retries))
+        return self.timeout_seconds * (self.max_retries + 1) + backoff
+
+    def _run(self) -> None:
+        batch: List[str] = []
+        deadline: Optional[float] = None
+        while True:
+            if self._flush_requested.is_set():
+                timeout = 0.0
+            elif deadline is None:
+                timeout = self.flush_interval
+            else:
+                timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._drain_and_send(batch)
+                self._flushed.set()
+                return
+            if isinstance(item, str):
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch and (item is None or len(batch) >= self.batch_size or time.monotonic() >= (deadline or 0.0)):
+                self._send(batch)
+                batch = []
+                deadline = None
+            if item is None and self._flush_requested.is_set():
+                self._flush_requested.clear()
+                self._flushed.set()
+
+    def _drain_and_send(self, batch: List[str]) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, str):
+                batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._send(batch)
+                batch = []
+        if batch:
+            self._send(batch)
+
+    def _send(self, batch: List[str]) -> None:
+        body = ("\n".join(batch) + "\n").encode("utf-8")
+        headers = {"Content-Type": "application/x-ndjson; charset=utf-8"}
+        if self.secret:
+            headers["X-Signature"] = hmac_signature(self.secret, body)
+
+        # Shipper thread: each batch is its own trace, off the request path
+        with start_span("POST log webhook batch", kind=KIND_CLIENT, attributes={"batch.size": len(batch)}) as span:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.retries += 1
+                    time.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+                try:
+                    response = self.session.post(self.url, data=body, headers=headers, timeout=self.timeout_seconds)
+                except Exception:
+                    continue
+                if response.status_code >= 500 or response.status_code == 429:
+                    continue
+                if span is not None:
+                    span.set("http.status_code", response.status_code)
+                    span.set("retries", attempt)
+                if response.status_code < 400:
+                    self.batches += 1
+                    self.sent += len(batch)
+                else:
+                    # Rejected (bad signature, wrong URL, malformed body): retrying would only be rejected again
+                    self.failed += len(batch)
+                return
+            self.failed += len(batch)
+
+
+class _RecordQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the real handlers.
+
+    The stock ``prepare`` renders the traceback into ``msg`` and drops
+    ``exc_info``; the queue never leaves the process, so the record is passed
+    through with only its message args resolved and JsonLogFormatter still
+    emits ``exc_info`` as its own field. The caller's span rides along as
+    ``trace_span``, so webhook posts made on the listener thread still nest
+    under it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.trace_span = current_span()
+        return record
+
+
+_listener: Optional[QueueListener] = None
+_webhook_handler: Optional[logging.Handler] = None
+
+
+def _stop_listener() -> None:
+    """Drain the queue and close the handlers behind the listener (also runs at exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for h in _listener.handlers:
+            h.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+def webhook_stats() -> Optional[Dict[str, int]]:
+    """Queue/delivery counters of the batching webhook handler, if one is installed."""
+    if isinstance(_webhook_handler, BatchingWebhookLogHandler):
+        return _webhook_handler.stats()
+    return None
+
+
+def log_queue_depth() -> Optional[int]:
+    """Records waiting for the QueueListener in non-blocking mode."""
+    if _listener is None:
+        return None
+    return _listener.queue.qsize()
+
+
+def setup_logging(
+    log_dir: Path,
+    level: str = "INFO",
+    webhook_url: Optional[str] = None,
+    webhook_secret: Optional[str] = None,
+    webhook_mode: str = "sync",
+    webhook_batch_size: int = 100,
+    webhook_flush_seconds: float = 1.0,
+    webhook_queue_size: int = 10000,
+    non_blocking: bool = False,
+    log_format: str = "jsonl",
+    segment_max_bytes: int = SEGMENT_MAX_BYTES,
+) -> None:
+    """Configure local file logging plus the optional webhook sink.
+
+    ``log_format`` picks the local sink: "jsonl" (requests.jsonl, the default),
+    "segments" (the segmented binary log) or "both". With ``non_blocking`` the root logger only enqueues records; a
+    QueueListener thread runs the file and webhook handlers, so callers never
+    wait on disk or network I/O.
+    """
+    global _listener, _webhook_handler
     log_dir.mkdir(parents=True, exist_ok=True)
     log_file = log_dir / "requests.jsonl"
-
-    handler = TimedRotatingFileHandler(
-        filename=str(log_file), when="D", interval=1, backupCount=14, encoding="utf-8"
-    )
     json_formatter = JsonLogFormatter()
-    handler.setFormatter(json_formatter)
+    handlers: List[logging.Handler] = []
+
+    if log_format != "segments":
+        handler = TimedRotatingFileHandler(
+            filename=str(log_file), when="D", interval=1, backupCount=14, encoding="utf-8"
+        )
+        handler.setFormatter(json_formatter)
+        handlers.append(handler)
+    if log_format in ("segments", "both"):
+        handlers.append(SegmentLogHandler(log_dir, max_bytes=segment_max_bytes))
 
     root = logging.getLogger()
     root.setLevel(getattr(logging, level.upper(), logging.INFO))
+    _stop_listener()
+    for existing in list(root.handlers):
+        existing.close()
     root.handlers.clear()
-    root.addHandler(handler)
+    _webhook_handler = None
 
     if webhook_url:
-        webhook_handler = WebhookLogHandler(webhook_url, secret=webhook_secret)
+        if webhook_mode == "batch":
+            webhook_handler: logging.Handler = BatchingWebhookLogHandler(
+                webhook_url,
+                secret=webhook_secret,
+                batch_size=webhook_batch_size,
+                flush_interval=webhook_flush_seconds,
+                max_queue_size=webhook_queue_size,
+            )
+        else:
+            webhook_handler = WebhookLogHandler(webhook_url, secret=webhook_secret)
         webhook_handler.setFormatter(json_formatter)
-        root.addHandler(webhook_handler)
+        handlers.append(webhook_handler)
+        _webhook_handler = webhook_handler
+
+    if non_blocking:
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        root.addHandler(_RecordQueueHandler(log_queue))
+    else:
+        for h in handlers:
+            root.addHandler(h)
 
 
 
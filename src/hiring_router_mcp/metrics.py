@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) matching the analytics duration histogram (DURATION_BUCKETS_MS)
+DEFAULT_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Counter:
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def samples(self, name: str, labels: str) -> Iterator[str]:
+        yield f"{name}{labels} {_num(self._value)}"
+
+
+class Gauge:
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def samples(self, name: str, labels: str) -> Iterator[str]:
+        yield f"{name}{labels} {_num(self._value)}"
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is one bisect and two adds under a per-series lock."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._bounds = tuple(buckets)
+        # Per-bucket (not cumulative) counts; the extra slot is +Inf
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def samples(self, name: str, labels: str) -> Iterator[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        inner = labels[1:-1] + "," if labels else ""
+        cumulative = 0
+        for bound, count in zip(self._bounds + (float("inf"),), counts):
+            cumulative += count
+            yield f'{name}_bucket{{{inner}le="{_num(bound)}"}} {cumulative}'
+        yield f"{name}_sum{labels} {_num(total)}"
+        yield f"{name}_count{labels} {cumulative}"
+
+
+class MetricFamily:
+    """One metric name with a fixed set of label names and a child series per label tuple.
+
+    Resolve children once with :meth:`labels` (e.g. per tool at registration) and
+    keep the reference: updates then touch only that child's lock.
+    """
+
+    def __init__(self, name: str, help_text: str, kind: str, labelnames: Sequence[str], factory: Callable[[], Any]) -> None:
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Any:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for key, child in sorted(self._children.items()):
+            yield from child.samples(self.name, _labels(self.labelnames, key))
+
+
+class _CallbackFamily:
+    """Metric whose value is read from ``fn`` at scrape time (None omits the sample)."""
+
+    def __init__(self, name: str, help_text: str, kind: str, fn: Callable[[], Optional[float]]) -> None:
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self._fn = fn
+
+    def render(self) -> Iterator[str]:
+        value = self._fn()
+        if value is None:
+            return
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield f"{self.name} {_num(value)}"
+
+
+class MetricsRegistry:
+    """In-process metrics rendered in the Prometheus text exposition format."""
+
+    def __init__(self, namespace: str = "hiring_router") -> None:
+        self.namespace = namespace
+        self._families: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, family: Any) -> Any:
+        with self._lock:
+            existing = self._families.get(family.name)
+            if existing is not None:
+                return existing
+            self._families[family.name] = family
+            return family
+
+    def _name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(MetricFamily(self._name(name), help_text, "counter", labelnames, Counter))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(MetricFamily(self._name(name), help_text, "gauge", labelnames, Gauge))
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> MetricFamily:
+        return self._register(MetricFamily(self._name(name), help_text, "histogram", labelnames, lambda: Histogram(buckets)))
+
+    def callback(self, name: str, help_text: str, fn: Callable[[], Optional[float]], kind: str = "gauge") -> None:
+        self._register(_CallbackFamily(self._name(name), help_text, kind, fn))
+
+    def render(self) -> str:
+        with self._lock:
+            families = list(self._families.values())
+        lines: List[str] = []
+        for family in families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag: how late a periodic ``asyncio.sleep`` wakes up."""
+
+    def __init__(self, registry: MetricsRegistry, interval: float = 0.5) -> None:
+        self.interval = interval
+        self._histogram = registry.histogram("event_loop_lag_seconds", "How late periodic event loop wakeups run").labels()
+        self._task: Optional[asyncio.Task] = None
+
+    def ensure_started(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self._histogram.observe(max(0.0, time.perf_counter() - start - self.interval))
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting open SSE streams and starting the loop-lag monitor."""
+
+    def __init__(self, app: Any, registry: MetricsRegistry, sse_path: str) -> None:
+        self.app = app
+        self.sse_path = sse_path
+        self._sessions = registry.gauge("sse_sessions_active", "Open SSE streams").labels()
+        self._monitor = LoopLagMonitor(registry)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        self._monitor.ensure_started()
+        if scope["type"] != "http" or scope["path"] != self.sse_path:
+            await self.app(scope, receive, send)
+            return
+        self._sessions.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._sessions.dec()
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
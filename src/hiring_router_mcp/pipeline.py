@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .config import load_config
+from .utils import parse_moment
+
+# Default hiring journey; the normalized names double as the funnel's stage order
+DEFAULT_JOURNEY = (
+    "Sourcing",
+    "Application",
+    "Screening",
+    "Technical Assessment",
+    "Onsite/Panel",
+    "Offer",
+    "Onboarding",
+)
+# Moving into one of these counts as a drop-off from the previous stage
+DROP_STAGES = ("rejected", "withdrawn", "declined")
+
+FUNNEL_GROUP_BY = ("stage", "position", "source", "week", "month")
+
+_NON_WORD = re.compile(r"[^0-9a-zа-я]+")
+
+# Epoch-second bounds of event timestamps: 1970-01-01 to 9999-12-31, the last moment datetime represents
+_MAX_TS = 253402300799
+
+# Rollup levels: which of position/source a row is broken down by (bit flags)
+_ALL, _BY_POSITION, _BY_SOURCE = 0, 1, 2
+_LEVELS = (_ALL, _BY_POSITION, _BY_SOURCE, _BY_POSITION | _BY_SOURCE)
+# Rollup grains in days. Weekly rows (epoch weeks, Thursday-aligned) cover the
+# bulk of a window and daily rows its ragged ends and week/month grouping.
+_DAY, _WEEK = 1, 7
+
+# Time in stage is counted in quarter-octave buckets from 15 minutes to ~200 days:
+# bucket i holds durations below _DWELL_EDGES[i], the last one everything longer.
+# Reporting each bucket's geometric midpoint keeps percentiles within ~9%.
+_DWELL_EDGES = tuple(900 * 2 ** (k / 4) for k in range(58))
+_DWELL_COLUMNS = tuple(f"d{i}" for i in range(len(_DWELL_EDGES) + 1))
+_VALUE_COLUMNS = ("entered", "advanced", "dropped", "dwell_seconds") + _DWELL_COLUMNS
+_KEY_COLUMNS = ("level", "grain", "period", "position", "source", "stage")
+_ENTERED, _ADVANCED, _DROPPED, _DWELL_SECONDS, _FIRST_BUCKET = range(5)
+
+_UPSERT_ROLLUP = (
+    f"INSERT INTO stage_rollup ({', '.join(_KEY_COLUMNS + _VALUE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * (len(_KEY_COLUMNS) + len(_VALUE_COLUMNS)))}) "
+    f"ON CONFLICT ({', '.join(_KEY_COLUMNS)}) DO UPDATE SET "
+    + ", ".join(f"{c} = {c} + excluded.{c}" for c in _VALUE_COLUMNS)
+)
+
+
+def normalize_stage(stage: str) -> str:
+    """"Technical Assessment" -> "technical_assessment", "Onsite/Panel" -> "onsite_panel"."""
+    return _NON_WORD.sub("_", (stage or "").strip().lower()).strip("_")
+
+
+STAGE_ORDER = tuple(normalize_stage(s) for s in DEFAULT_JOURNEY)
+
+
+@dataclass(frozen=True)
+class StageEvent:
+    candidate_id: str
+    position: str
+    stage: str
+    ts: int
+    source: str = ""
+    event_key: str = ""
+
+
+def parse_stage_event(raw: Mapping[str, Any], now: Optional[float] = None) -> StageEvent:
+    """Build a :class:`StageEvent` from webhook JSON; raises ValueError on bad input.
+
+    Candidates are identified by ``candidate_id`` or, failing that, a SHA-256 of
+    their lowercased ``email`` (raw emails are never stored). ``timestamp`` is an
+    ISO-8601 string or epoch seconds and defaults to now; ``event_id`` makes
+    re-deliveries idempotent.
+    """
+    if not isinstance(raw, Mapping):
+        raise ValueError("event must be an object")
+    candidate = raw.get("candidate_id")
+    if not candidate and raw.get("email"):
+        candidate = "sha256:" + hashlib.sha256(str(raw["email"]).strip().lower().encode("utf-8")).hexdigest()
+    position = str(raw.get("position") or "").strip()
+    stage = normalize_stage(str(raw.get("stage") or ""))
+    if not candidate or not position or not stage:
+        raise ValueError("candidate_id (or email), position and stage are required")
+    moment = raw.get("timestamp")
+    if moment is None:
+        ts = int(now if now is not None else time.time())
+    elif isinstance(moment, (int, float)):
+        # int() raises OverflowError for inf and 1e400, which callers would not report as a bad event
+        if not math.isfinite(moment) or not 0 <= moment <= _MAX_TS:
+            raise ValueError(f"timestamp must be epoch seconds between 0 and {_MAX_TS}")
+        ts = int(moment)
+    else:
+        ts = int(parse_moment(str(moment)).timestamp())
+        if not 0 <= ts <= _MAX_TS:
+            raise ValueError("timestamp must be between 1970-01-01 and 9999-12-31")
+    source = str(raw.get("source") or "").strip().lower()
+    key = str(raw.get("event_id") or "") or hashlib.sha1(f"{candidate}\n{position}\n{stage}\n{ts}".encode("utf-8")).hexdigest()
+    return StageEvent(str(candidate), position, stage, ts, source, key)
+
+
+def _add_transition(cells: Dict[int, int], ts: int, next_stage: Optional[str], next_ts: Optional[int], sign: int) -> None:
+    """Count one stage entry (and its outcome and time in stage once it has left) into rollup cells."""
+    cells[_ENTERED] = cells.get(_ENTERED, 0) + sign
+    if next_stage is None:
+        return
+    outcome = _DROPPED if next_stage in DROP_STAGES else _ADVANCED
+    cells[outcome] = cells.get(outcome, 0) + sign
+    dwell = max(next_ts - ts, 0)
+    cells[_DWELL_SECONDS] = cells.get(_DWELL_SECONDS, 0) + sign * dwell
+    bucket = _FIRST_BUCKET + bisect_right(_DWELL_EDGES, dwell)
+    cells[bucket] = cells.get(bucket, 0) + sign
+
+
+class PipelineStore:
+    """Candidate stage transitions in SQLite (WAL), with rollups for funnel reports.
+
+    ``stage_events`` keeps every transition, linked to the candidate's next
+    transition for the same position (``next_stage``/``next_ts``) as events
+    arrive, in any order. ``stage_rollup`` counts entries, outcomes and a
+    time-in-stage histogram per stage at each combination of position/source
+    breakdown, by day and by week of entry, so a report sums a few rows per
+    group and stage however many events are stored.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        value_columns = ",\n".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in _VALUE_COLUMNS)
+        self._conn.executescript(
+            f"""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS stage_events (
+                id INTEGER PRIMARY KEY,
+                event_key TEXT UNIQUE NOT NULL,
+                candidate_id TEXT NOT NULL,
+                position TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                source TEXT NOT NULL DEFAULT '',
+                ts INTEGER NOT NULL,
+                next_stage TEXT,
+                next_ts INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS stage_events_by_position ON stage_events (position, stage, ts);
+            CREATE INDEX IF NOT EXISTS stage_events_by_candidate ON stage_events (candidate_id, position, ts);
+            CREATE TABLE IF NOT EXISTS stage_rollup (
+                level INTEGER NOT NULL,
+                grain INTEGER NOT NULL,
+                period INTEGER NOT NULL,
+                position TEXT NOT NULL,
+                source TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                {value_columns},
+                PRIMARY KEY ({', '.join(_KEY_COLUMNS)})
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def record_events(self, events: Iterable[StageEvent]) -> int:
+        """Insert a batch of transitions; returns how many were new (known event keys are skipped)."""
+        with self._lock:
+            batch = list({e.event_key: e for e in events}.values())
+            if not batch:
+                return 0
+            known = {
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT event_key FROM stage_events WHERE event_key IN (SELECT value FROM json_each(?))",
+                    (json.dumps([e.event_key for e in batch]),),
+                )
+            }
+            batch = [e for e in batch if e.event_key not in known]
+            if not batch:
+                return 0
+
+            # Re-link each affected candidate timeline: existing rows plus the new events, by time
+            timelines: Dict[Tuple[str, str], List[list]] = defaultdict(list)
+            for row in self._conn.execute(
+                "SELECT id, candidate_id, position, stage, source, ts, next_stage, next_ts FROM stage_events "
+                "WHERE (candidate_id, position) IN "
+                "(SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]') FROM json_each(?))",
+                (json.dumps(sorted({(e.candidate_id, e.position) for e in batch})),),
+            ):
+                timelines[(row[1], row[2])].append(list(row))
+            for e in batch:
+                timelines[(e.candidate_id, e.position)].append(
+                    [None, e.candidate_id, e.position, e.stage, e.source, e.ts, None, None, e.event_key]
+                )
+
+            inserts: List[Tuple] = []
+            updates: List[Tuple] = []
+            # Rollup deltas per (day, position, source, stage), spread over levels and grains below
+            deltas: Dict[Tuple[int, str, str, str], Dict[int, int]] = defaultdict(dict)
+            for rows in timelines.values():
+                rows.sort(key=lambda r: (r[5], r[0] is None))
+                for i, row in enumerate(rows):
+                    row_id, candidate, position, stage, source, ts, old_stage, old_ts = row[:8]
+                    following = rows[i + 1] if i + 1 < len(rows) else None
+                    next_stage, next_ts = (following[3], following[5]) if following else (None, None)
+                    cells = deltas[(ts // 86400, position, source, stage)]
+                    if row_id is None:
+                        inserts.append((row[8], candidate, position, stage, source, ts, next_stage, next_ts))
+                    elif (next_stage, next_ts) != (old_stage, old_ts):
+                        updates.append((next_stage, next_ts, row_id))
+                        _add_transition(cells, ts, old_stage, old_ts, -1)
+                    else:
+                        continue
+                    _add_transition(cells, ts, next_stage, next_ts, 1)
+
+            rollup: Dict[Tuple, List[int]] = {}
+            for (day, position, source, stage), cells in deltas.items():
+                changed = [(column, n) for column, n in cells.items() if n]
+                if not changed:
+                    continue
+                for level in _LEVELS:
+                    by_position = position if level & _BY_POSITION else ""
+                    by_source = source if level & _BY_SOURCE else ""
+                    for key in (
+                        (level, _DAY, day, by_position, by_source, stage),
+                        (level, _WEEK, day // _WEEK, by_position, by_source, stage),
+                    ):
+                        values = rollup.get(key)
+                        if values is None:
+                            values = rollup[key] = [0] * len(_VALUE_COLUMNS)
+                        for column, n in changed:
+                            values[column] += n
+
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO stage_events (event_key, candidate_id, position, stage, source, ts, next_stage, next_ts) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    inserts,
+                )
+                self._conn.executemany("UPDATE stage_events SET next_stage = ?, next_ts = ? WHERE id = ?", updates)
+                self._conn.executemany(_UPSERT_ROLLUP, [key + tuple(values) for key, values in rollup.items()])
+            return len(inserts)
+
+    def event_count(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(entered), 0) FROM stage_rollup WHERE level = ? AND grain = ?", (_ALL, _WEEK)
+            ).fetchone()
+            return int(row[0])
+
+    def funnel(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        group_by: str = "stage",
+        position: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Per-stage entries, conversion, drop-off and time in stage for events entered in [start, end].
+
+        The window applies to the day a stage was entered (UTC days).
+        """
+        if group_by not in FUNNEL_GROUP_BY:
+            raise ValueError(f"Unsupported group_by {group_by!r}; use one of {', '.join(FUNNEL_GROUP_BY)}")
+        first_day = int(start.timestamp()) // 86400 if start is not None else 0
+        last_day = int(end.timestamp()) // 86400 if end is not None else _MAX_DAY
+        level = _BY_POSITION if position or group_by == "position" else _ALL
+        if group_by == "source":
+            level |= _BY_SOURCE
+        group = {
+            "stage": "''",
+            "position": "position",
+            "source": "source",
+            "week": "strftime('%Y-W%W', period * 86400, 'unixepoch')",
+            "month": "strftime('%Y-%m', period * 86400, 'unixepoch')",
+        }[group_by]
+        # Week and month groups need day boundaries, so only they read daily rows across the window
+        ranges = [(_DAY, first_day, last_day)] if group_by in ("week", "month") else _period_ranges(first_day, last_day)
+
+        parts, params = [], []
+        for grain, low, high in ranges:
+            parts.append(
+                f"SELECT {group} AS grp, stage, {', '.join(_VALUE_COLUMNS)} FROM stage_rollup "
+                "WHERE level = ? AND grain = ? AND period BETWEEN ? AND ?" + (" AND position = ?" if position else "")
+            )
+            params.extend([level, grain, low, high] + ([position] if position else []))
+        query = (
+            f"SELECT grp, stage, {', '.join(f'SUM({c})' for c in _VALUE_COLUMNS)} "
+            f"FROM ({' UNION ALL '.join(parts)}) GROUP BY grp, stage"
+        )
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        stages: Dict[str, Dict[str, Tuple[int, ...]]] = defaultdict(dict)
+        for row in rows:
+            if row[2]:
+                stages[row[0]][row[1]] = row[2:]
+        blank = "all" if group_by == "stage" else "unknown"
+        return {name or blank: _stage_report(totals) for name, totals in sorted(stages.items())}
+
+
+# Open-ended report windows; comfortably past any epoch day a timestamp maps to
+_MAX_DAY = 10 ** 7
+
+
+def _period_ranges(first_day: int, last_day: int) -> List[Tuple[int, int, int]]:
+    """Cover [first_day, last_day] with whole weeks plus the leftover days at either end."""
+    first_week = -(-first_day // _WEEK)
+    last_week = (last_day + 1) // _WEEK - 1
+    if first_week > last_week:
+        return [(_DAY, first_day, last_day)]
+    ranges = [(_WEEK, first_week, last_week)]
+    if first_day < first_week * _WEEK:
+        ranges.append((_DAY, first_day, first_week * _WEEK - 1))
+    if (last_week + 1) * _WEEK <= last_day:
+        ranges.append((_DAY, (last_week + 1) * _WEEK, last_day))
+    return ranges
+
+
+def _stage_rank(stage: str) -> Tuple[int, int, str]:
+    if stage in STAGE_ORDER:
+        return (0, STAGE_ORDER.index(stage), stage)
+    if stage in DROP_STAGES:
+        return (2, DROP_STAGES.index(stage), stage)
+    return (1, 0, stage)
+
+
+def _stage_report(stages: Mapping[str, Sequence[int]]) -> Dict[str, Any]:
+    ordered = sorted(stages, key=_stage_rank)
+    funnel_stages = [s for s in ordered if s not in DROP_STAGES]
+    first_entered = stages[funnel_stages[0]][_ENTERED] if funnel_stages else 0
+    report: List[Dict[str, Any]] = []
+    for stage in funnel_stages:
+        totals = stages[stage]
+        entered, advanced, dropped = totals[_ENTERED], totals[_ADVANCED], totals[_DROPPED]
+        report.append(
+            {
+                "stage": stage,
+                "entered": entered,
+                "advanced": advanced,
+                "dropped": dropped,
+                "in_stage": entered - advanced - dropped,
+                "conversion_rate": round(advanced / entered, 4) if entered else 0.0,
+                "drop_off_rate": round(dropped / entered, 4) if entered else 0.0,
+                "share_of_first_stage": round(entered / first_entered, 4) if first_entered else 0.0,
+                "time_in_stage_hours": _dwell_hours(totals),
+            }
+        )
+    return {
+        "stages": report,
+        "exits": {stage: stages[stage][_ENTERED] for stage in ordered if stage in DROP_STAGES},
+    }
+
+
+def _dwell_hours(totals: Sequence[int]) -> Optional[Dict[str, Any]]:
+    buckets = totals[_FIRST_BUCKET:]
+    count = sum(buckets)
+    if not count:
+        return None
+
+    def _quantile(q: float) -> float:
+        rank = q * (count - 1)
+        seen = 0
+        for index, n in enumerate(buckets):
+            seen += n
+            if seen > rank:
+                break
+        # Geometric midpoint of the bucket; the open-ended ones extend a quarter octave
+        low = _DWELL_EDGES[index - 1] if index else _DWELL_EDGES[0] / 2 ** 0.25
+        high = _DWELL_EDGES[index] if index < len(_DWELL_EDGES) else _DWELL_EDGES[-1] * 2 ** 0.25
+        return round((low * high) ** 0.5 / 3600, 1)
+
+    return {
+        "count": count,
+        "p50": _quantile(0.50),
+        "p90": _quantile(0.90),
+        "p99": _quantile(0.99),
+        "mean": round(totals[_DWELL_SECONDS] / count / 3600, 1),
+    }
+
+
+@lru_cache(maxsize=1)
+def get_pipeline_store() -> PipelineStore:
+    """Process-wide store under DATA_DIR."""
+    return PipelineStore(load_config().data_dir / "pipeline.sqlite")
+
+
+def record_stage_events(raw_events: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Validate webhook events and store the valid ones; invalid ones are reported by index."""
+    events: List[StageEvent] = []
+    errors: List[Dict[str, Any]] = []
+    now = time.time()
+    for index, raw in enumerate(raw_events):
+        try:
+            events.append(parse_stage_event(raw, now=now))
+        except ValueError as exc:
+            errors.append({"index": index, "error": str(exc)})
+    recorded = get_pipeline_store().record_events(events) if events else 0
+    return {"received": len(raw_events), "recorded": recorded, "duplicates": len(events) - recorded, "errors": errors}
+
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import cProfile
+import heapq
+import io
+import itertools
+import marshal
+import pstats
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+PROFILE_FORMATS = ("summary", "collapsed", "pstats")
+
+# pstats function key: (file name, line number, function name)
+Func = Tuple[str, int, str]
+# runcall's own profiler.disable() shows up as a root in every capture
+_DISABLE = ("~", 0, "<method 'disable' of '_lsprof.Profiler' objects>")
+
+
+@dataclass(frozen=True)
+class CallProfile:
+    tool: str
+    duration_ms: float
+    captured_at: str
+    stats: pstats.Stats
+
+    def top(self, limit: int = 15) -> List[Dict[str, Any]]:
+        rows = sorted(self.stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [
+            {"function": _label(func), "calls": nc, "tottime_ms": round(tt * 1000, 3), "cumtime_ms": round(ct * 1000, 3)}
+            for func, (_, nc, tt, ct, _) in rows
+        ]
+
+
+class ToolProfiler:
+    """Sampled cProfile capture of tool calls, keeping the slowest ``keep`` profiles.
+
+    One call in ``sample_every`` (per tool) runs under cProfile; a captured call
+    is kept only when it took at least ``slow_ms``, and the buffer holds the
+    ``keep`` slowest captures seen so far. Only one call is profiled at a time,
+    so a sampled call that overlaps another capture just runs unprofiled. The
+    server only creates a profiler when PROFILE_SAMPLE_RATE is set; otherwise
+    the tool wrapper's cost is a single ``is None`` check.
+    """
+
+    def __init__(self, sample_every: int, slow_ms: float = 0.0, keep: int = 20) -> None:
+        self.sample_every = max(1, sample_every)
+        self.slow_ms = slow_ms
+        self.keep = keep
+        self.sampled = 0
+        self.captured = 0
+        self._counters: Dict[str, Iterator[int]] = defaultdict(itertools.count)
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+        self._slowest: List[Tuple[float, int, CallProfile]] = []
+        self._seq = itertools.count()
+
+    def run(self, tool: str, func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        """Call ``func(*args, **kwargs)``, under cProfile when this call is sampled."""
+        if next(self._counters[tool]) % self.sample_every or not self._active.acquire(blocking=False):
+            return func(*args, **kwargs)
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self._active.release()
+            self._record(tool, duration_ms, profile)
+
+    def _record(self, tool: str, duration_ms: float, profile: cProfile.Profile) -> None:
+        self.sampled += 1
+        if duration_ms < self.slow_ms:
+            return
+        with self._lock:
+            if len(self._slowest) >= self.keep and duration_ms <= self._slowest[0][0]:
+                return
+            # Building Stats walks the raw profile, so only for calls that make the cut
+            stats = pstats.Stats(profile)
+            stats.stats.pop(_DISABLE, None)
+            captured = CallProfile(
+                tool,
+                round(duration_ms, 3),
+                datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+                stats,
+            )
+            entry = (duration_ms, next(self._seq), captured)
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heapreplace(self._slowest, entry)
+            self.captured += 1
+
+    def profiles(self, tool: Optional[str] = None, limit: Optional[int] = None) -> List[CallProfile]:
+        """Kept profiles, slowest first."""
+        with self._lock:
+            entries = sorted(self._slowest, reverse=True)
+        selected = [profile for _, _, profile in entries if tool is None or profile.tool == tool]
+        return selected[:limit] if limit else selected
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slowest.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_every": self.sample_every,
+            "slow_ms": self.slow_ms,
+            "keep": self.keep,
+            "sampled": self.sampled,
+            "captured": self.captured,
+            "buffered": len(self._slowest),
+        }
+
+    def dump(self, fmt: str, tool: Optional[str] = None, limit: Optional[int] = None) -> Any:
+        """Render kept profiles: "summary" (dict), "collapsed" (flamegraph text) or "pstats" (bytes).
+
+        "collapsed" and "pstats" merge the selected profiles into one.
+        """
+        if fmt not in PROFILE_FORMATS:
+            raise ValueError(f"Unsupported format {fmt!r}; use one of {', '.join(PROFILE_FORMATS)}")
+        selected = self.profiles(tool, limit)
+        if fmt == "summary":
+            return {
+                **self.stats(),
+                "profiles": [
+                    {"tool": p.tool, "duration_ms": p.duration_ms, "captured_at": p.captured_at, "top": p.top()}
+                    for p in selected
+                ],
+            }
+        merged = _merge(selected)
+        if fmt == "pstats":
+            # Same bytes as Stats.dump_stats, readable with pstats.Stats(<file>) or snakeviz
+            return marshal.dumps(merged.stats) if merged is not None else marshal.dumps({})
+        return collapsed_stacks(merged) if merged is not None else ""
+
+
+def _merge(profiles: List[CallProfile]) -> Optional[pstats.Stats]:
+    if not profiles:
+        return None
+    merged = pstats.Stats(stream=io.StringIO())
+    merged.add(*(profile.stats for profile in profiles))
+    return merged
+
+
+def _label(func: Func) -> str:
+    filename, line, name = func
+    if filename == "~":
+        # Built-ins are recorded as ("~", 0, "<built-in method ...>")
+        return name
+    module = filename.replace("\\", "/").rsplit("/", 1)[-1]
+    if module.endswith(".py"):
+        module = module[:-3]
+    return f"{module}.{name}:{line}"
+
+
+def collapsed_stacks(stats: pstats.Stats, max_depth: int = 64) -> str:
+    """Collapsed-stack text (``a;b;c <µs>`` per line) for flamegraph.pl, speedscope and friends.
+
+    cProfile records caller/callee edges rather than full stacks, so each
+    function's own time is spread over its call paths in proportion to the
+    time each caller spent in it.
+    """
+    raw = stats.stats
+    callees: Dict[Func, List[Tuple[Func, float]]] = defaultdict(list)
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees[caller].append((func, edge[3]))
+    roots = [func for func, (_, _, _, _, callers) in raw.items() if not callers]
+    totals: Dict[str, float] = defaultdict(float)
+
+    def walk(func: Func, stack: Tuple[str, ...], weight: float, seen: frozenset) -> None:
+        tottime = raw[func][2]
+        stack = stack + (_label(func),)
+        if tottime * weight > 0:
+            totals[";".join(stack)] += tottime * weight
+        if len(stack) >= max_depth:
+            return
+        for child, edge_cumtime in callees.get(func, ()):
+            child_cumtime = raw[child][3]
+            # Recursion is folded into the first occurrence of the function on the path;
+            # paths worth less than a microsecond are dropped so shared helpers do not fan out
+            if child in seen or child_cumtime <= 0 or weight * edge_cumtime < 1e-6:
+                continue
+            walk(child, stack, weight * edge_cumtime / child_cumtime, seen | {child})
+
+    for root in roots:
+        walk(root, (), 1.0, frozenset({root}))
+    lines = [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(totals.items())]
+    return "\n".join(line for line in lines if not line.endswith(" 0")) + "\n"
@@ -0,0 +1,517 @@
+from __future__ import annotations
+
+import logging
+import math
+import multiprocessing
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import load_config
+from .skill_index import get_skill_index, normalize_role, tokenize
+
+SECTION_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "summary": ("summary", "professional summary", "profile", "about", "about me", "objective", "о себе", "обо мне", "цель"),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment", "employment history", "work history",
+        "опыт работы", "опыт", "трудовая деятельность", "места работы",
+    ),
+    "education": ("education", "academic background", "образование"),
+    "skills": (
+        "skills", "technical skills", "key skills", "core skills", "competencies", "tech stack",
+        "навыки", "ключевые навыки", "профессиональные навыки", "технологии", "стек",
+    ),
+    "projects": ("projects", "personal projects", "проекты"),
+    "certifications": ("certifications", "certificates", "courses", "training", "сертификаты", "курсы", "повышение квалификации"),
+    "languages": ("languages", "языки", "знание языков", "иностранные языки"),
+    "contacts": ("contacts", "contact", "contact information", "контакты", "контактная информация"),
+}
+# ATS parsers look for these by name
+REQUIRED_SECTIONS = ("experience", "education", "skills")
+
+# Skill vocabulary, recognised in any role; display form as written here
+SKILL_VOCABULARY = (
+    "python", "java", "kotlin", "javascript", "typescript", "golang", "c++", "c#", "php", "ruby", "rust", "scala", "swift", "1c",
+    "sql", "postgresql", "mysql", "clickhouse", "mongodb", "redis", "elasticsearch", "kafka", "rabbitmq", "celery",
+    "django", "fastapi", "flask", "asyncio", "spring", "hibernate", "node.js", "react", "vue", "angular", "redux", "next.js",
+    "html", "css", "webpack", "jest", "pytest", "selenium", "postman", "rest api", "graphql", "grpc", "microservices",
+    "docker", "kubernetes", "terraform", "ansible", "linux", "bash", "git", "ci/cd", "jenkins", "aws", "gcp", "azure",
+    "prometheus", "grafana", "maven", "pandas", "numpy", "scikit-learn", "pytorch", "tensorflow", "machine learning",
+    "deep learning", "nlp", "statistics", "etl", "airflow", "spark", "excel", "tableau", "power bi", "a/b testing",
+    "figma", "prototyping", "user research", "design systems", "adobe", "jira", "confluence", "agile", "scrum", "kanban",
+    "roadmap", "stakeholder management", "prioritization", "analytics", "testing", "test automation", "api testing",
+    "sourcing", "interviewing", "onboarding", "employer branding", "english", "communication", "mentoring",
+)
+
+# Fallback role profiles while the skill index has too few documents for a role
+ROLE_FAMILIES: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...] = (
+    (("python", "django", "fastapi", "flask", "backend", "бэкенд"),
+     ("python", "django", "fastapi", "sql", "postgresql", "docker", "git", "rest api", "redis", "linux", "asyncio", "pytest", "celery", "kubernetes")),
+    (("frontend", "javascript", "react", "vue", "фронтенд", "web"),
+     ("javascript", "typescript", "react", "html", "css", "redux", "webpack", "git", "rest api", "jest", "next.js")),
+    (("java", "kotlin", "spring"),
+     ("java", "spring", "sql", "hibernate", "kafka", "docker", "microservices", "git", "maven", "kubernetes")),
+    (("data", "analyst", "аналитик", "bi"),
+     ("sql", "python", "excel", "tableau", "power bi", "pandas", "statistics", "a/b testing", "etl", "clickhouse")),
+    (("ml", "scientist", "learning"),
+     ("python", "machine learning", "pandas", "numpy", "pytorch", "scikit-learn", "sql", "statistics", "deep learning", "nlp")),
+    (("devops", "sre", "platform", "infrastructure"),
+     ("linux", "docker", "kubernetes", "terraform", "ansible", "ci/cd", "aws", "prometheus", "grafana", "bash")),
+    (("qa", "test", "tester", "тестировщик"),
+     ("testing", "test automation", "selenium", "pytest", "sql", "api testing", "postman", "jira", "ci/cd")),
+    (("product", "project", "manager", "менеджер"),
+     ("roadmap", "stakeholder management", "agile", "scrum", "jira", "analytics", "a/b testing", "user research", "prioritization")),
+    (("designer", "дизайнер", "ux", "ui"),
+     ("figma", "prototyping", "user research", "design systems", "adobe")),
+    (("recruiter", "hr", "рекрутер", "talent"),
+     ("sourcing", "interviewing", "stakeholder management", "onboarding", "employer branding")),
+)
+GENERIC_SKILLS = ("git", "sql", "agile", "english", "communication")
+
+# A role profile comes from the skill index once the role has this many documents
+MIN_INDEX_DOCUMENTS = 5
+# shortlist batches smaller than this are scored inline; pool dispatch costs more than it saves
+PARALLEL_MIN_RESUMES = 64
+# Inline scoring still goes in chunks of this size, so shortlist_resumes can report progress between them
+INLINE_CHUNK_SIZE = 50
+
+_SECTION_BY_ALIAS = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+_HEADING = re.compile(
+    r"^\s*(?:#{1,6}\s*)?[*_]*\s*(?P<name>"
+    + "|".join(re.escape(alias) for alias in sorted(_SECTION_BY_ALIAS, key=len, reverse=True))
+    + r")\s*[*_]*\s*(?::\s*(?P<rest>.*))?$",
+    re.IGNORECASE,
+)
+_BULLET = re.compile(r"^\s*(?:[-*•·▪◦‣–—]|\d{1,2}[.)])\s+")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE = re.compile(r"(?<!\d)(?:\+\d{1,3}[\s-]?)?\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{2}[\s-]?\d{2}(?!\d)")
+_PROFILE_LINK = re.compile(r"\b(linkedin\.com|github\.com|gitlab\.com|hh\.ru|t\.me|habr\.com)/\S+", re.IGNORECASE)
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|янв|фев|мар|апр|ма[йяе]|июн|июл|авг|сен|окт|ноя|дек)[a-zа-я]*\.?"
+_PRESENT = r"(?:present|now|current|today|по\s+настоящее(?:\s+время)?|настоящее\s+время|по\s+н\.\s?в\.?|н\.\s?в\.?|сейчас)"
+
+
+def _point(tag: str) -> str:
+    return rf"(?:(?P<{tag}m>{_MONTH})\s+|(?P<{tag}n>0?[1-9]|1[0-2])[./])?(?P<{tag}y>(?:19|20)\d{{2}})"
+
+
+_DATE_RANGE = re.compile(
+    rf"{_point('s')}\s*(?:-|–|—|to|until|по|до)\s*(?:{_point('e')}|(?P<present>{_PRESENT}))",
+    re.IGNORECASE,
+)
+# Cheap pre-check: the range pattern is only run on lines that contain a year
+_YEAR = re.compile(r"(?:19|20)\d\d")
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6, "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+    "янв": 1, "фев": 2, "мар": 3, "апр": 4, "май": 5, "мая": 5, "мае": 5, "июн": 6, "июл": 7, "авг": 8, "сен": 9,
+    "окт": 10, "ноя": 11, "дек": 12,
+}
+_TITLE_WORD = re.compile(
+    r"\b(?:developer|engineer|programmer|manager|analyst|designer|architect|lead|consultant|specialist|administrator|"
+    r"scientist|tester|qa|devops|director|head|intern|recruiter|разработчик|программист|инженер|менеджер|аналитик|"
+    r"дизайнер|архитектор|тестировщик|руководитель|специалист|администратор|директор|стаж[её]р|тимлид|рекрутер)\b",
+    re.IGNORECASE,
+)
+_TITLE_SPLIT = re.compile(r"\s+(?:at|@|в|—|–|-|\|)\s+|,\s*|\s*\|\s*|\(.*?\)")
+_QUANTIFIED = re.compile(
+    r"\d+(?:[.,]\d+)?\s?(?:%|x\b|×|k\b|m\b|млн|тыс|\+)|[$€₽]\s?\d|"
+    r"\d+(?:[.,]\d+)?\s?(?:rps|ms|мс|users|clients|customers|people|engineers|servers|hours|пользовател|клиент|человек|час|руб|usd|eur)",
+    re.IGNORECASE,
+)
+_ACTION_VERB = re.compile(
+    r"^(?:built|led|lead|design|implement|reduc|increas|improv|develop|launch|migrat|automat|optimi[sz]|creat|manag|"
+    r"deliver|own|drove|driv|architect|scal|mentor|introduc|cut|grew|rebuilt|wrote|set up|"
+    r"разработ|внедр|руковод|оптимиз|сократ|увелич|запуст|автоматиз|созда|спроектир|перев|улучш|настро|организ|подготов|вел)",
+    re.IGNORECASE,
+)
+# Table borders, tab-aligned columns and multi-cell pipe rows come out of ATS parsers scrambled
+_LAYOUT = re.compile(r"\t|[│┃┆┊╎║]|\|[^|\n]*\|")
+
+
+def _term(skill: str) -> str:
+    # tokenize yields unigrams, then the bigram for two-word skills
+    return tokenize(skill)[-1]
+
+
+_DISPLAY: Dict[str, str] = {}
+for _skill in SKILL_VOCABULARY:
+    _DISPLAY.setdefault(_term(_skill), _skill)
+
+
+def display_term(term: str) -> str:
+    return _DISPLAY.get(term, term)
+
+
+@dataclass(frozen=True)
+class RoleProfile:
+    """Weighted skill terms (``tokenize`` form) a resume is matched against."""
+
+    role: str
+    source: str
+    terms: Tuple[Tuple[str, float], ...]
+
+
+@lru_cache(maxsize=256)
+def _base_profile(role_key: str, documents: int) -> RoleProfile:
+    # Keyed on the role's document count, so a growing skill index yields a fresh profile
+    index = get_skill_index()
+    if documents and index is not None:
+        # Bigrams of neighbouring words ("fastapi postgresql") are not skills unless the vocabulary says so
+        top = [t for t in index.top_terms(role_key, 60) if " " not in t["term"] or t["term"] in _DISPLAY][:30]
+        return RoleProfile(role_key, "skill_index", tuple((t["term"], float(t["share"])) for t in top))
+    skills: List[str] = []
+    for keywords, family in ROLE_FAMILIES:
+        if any(re.search(rf"\b{re.escape(keyword)}\b", role_key) for keyword in keywords):
+            skills.extend(s for s in family if s not in skills)
+    return RoleProfile(role_key, "builtin" if skills else "generic", tuple((_term(s), 1.0) for s in skills or GENERIC_SKILLS))
+
+
+def role_profile(role: str, vacancy_text: Optional[str] = None) -> RoleProfile:
+    """Skill profile for ``role``: skill index terms when there is enough data, else a built-in family.
+
+    With ``vacancy_text``, skills the vacancy names (known skills or profile
+    terms) are added or weighted double.
+    """
+    role_key = normalize_role(role)
+    index = get_skill_index()
+    documents = index.role_documents(role_key) if index is not None else 0
+    profile = _base_profile(role_key, documents if documents >= MIN_INDEX_DOCUMENTS else 0)
+    if not vacancy_text:
+        return profile
+    weights = dict(profile.terms)
+    top = max(weights.values(), default=1.0)
+    for term in set(tokenize(vacancy_text)):
+        if term in weights or term in _DISPLAY:
+            weights[term] = 2 * max(weights.get(term, 0.0), top)
+    return RoleProfile(role_key, profile.source + "+vacancy", tuple(sorted(weights.items(), key=lambda item: -item[1])))
+
+
+def segment(text: str) -> Dict[str, List[str]]:
+    """Split resume text into sections by their headings; lines before the first heading go to "header"."""
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        heading = _HEADING.match(line)
+        if heading:
+            current = _SECTION_BY_ALIAS[" ".join(heading.group("name").lower().replace("ё", "е").split())]
+            sections.setdefault(current, [])
+            if heading.group("rest"):
+                sections[current].append(heading.group("rest"))
+            continue
+        sections[current].append(line)
+    return sections
+
+
+def _month(match: "re.Match[str]", tag: str, default: int) -> int:
+    name = match.group(tag + "m")
+    if name:
+        return _MONTHS.get(name[:3].lower(), default)
+    number = match.group(tag + "n")
+    return int(number) if number else default
+
+
+def date_ranges(lines: Sequence[str], today: Optional[date] = None) -> List[Tuple[int, int]]:
+    """Employment periods as (start, end) month ordinals (year * 12 + month - 1)."""
+    today = today or date.today()
+    now = today.year * 12 + today.month - 1
+    ranges = []
+    for line in lines:
+        if not _YEAR.search(line):
+            continue
+        for match in _DATE_RANGE.finditer(line.replace("ё", "е")):
+            # A bare year counts from mid-year, so "2019 – 2021" is two years
+            start = int(match.group("sy")) * 12 + _month(match, "s", 7) - 1
+            end = now if match.group("present") else int(match.group("ey")) * 12 + _month(match, "e", 7) - 1
+            end = min(end, now)
+            if start <= end:
+                ranges.append((start, end))
+    return ranges
+
+
+def experience_months(ranges: Sequence[Tuple[int, int]]) -> int:
+    """Total months covered, with overlapping periods counted once."""
+    total = 0
+    current: Optional[List[int]] = None
+    for start, end in sorted(ranges):
+        if current is not None and start <= current[1]:
+            current[1] = max(current[1], end)
+            continue
+        if current is not None:
+            total += current[1] - current[0]
+        current = [start, end]
+    if current is not None:
+        total += current[1] - current[0]
+    return total
+
+
+def _titles(lines: Sequence[str]) -> List[str]:
+    titles: List[str] = []
+    for line in lines:
+        if len(line) > 100 or _BULLET.match(line) or not _TITLE_WORD.search(line):
+            continue
+        for part in _TITLE_SPLIT.split(_DATE_RANGE.sub(" ", line)):
+            part = (part or "").strip(" .:;*_#")
+            if part and _TITLE_WORD.search(part) and part not in titles:
+                titles.append(part)
+                break
+    return titles[:10]
+
+
+def _ordinal_label(ordinal: int) -> str:
+    return f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}"
+
+
+def _check(name: str, score: float, detail: str) -> Dict[str, Any]:
+    score = max(0.0, min(1.0, score))
+    return {"check": name, "passed": score >= 1.0, "score": round(score, 2), "detail": detail}
+
+
+# Points per check, out of 100
+ATS_WEIGHTS = {
+    "email": 10, "phone": 5, "sections": 20, "dates": 10, "bullets": 10,
+    "quantified": 15, "action_verbs": 10, "length": 10, "layout": 10,
+}
+
+
+def _ats_checks(
+    text: str,
+    contact: Dict[str, Any],
+    sections: Dict[str, List[str]],
+    ranges: Sequence[Tuple[int, int]],
+    bullets: Sequence[str],
+    achievements: Sequence[str],
+    words: int,
+) -> List[Dict[str, Any]]:
+    missing = [name for name in REQUIRED_SECTIONS if name not in sections]
+    with_verbs = sum(1 for line in bullets if _ACTION_VERB.match(_BULLET.sub("", line)))
+    layout_lines = sum(1 for line in text.splitlines() if _LAYOUT.search(line))
+    if words < 150:
+        length = words / 150
+    elif words > 1200:
+        length = max(0.0, 1 - (words - 1200) / 1200)
+    else:
+        length = 1.0
+    return [
+        _check("email", 1.0 if contact["email"] else 0.0, "email address in the resume"),
+        _check("phone", 1.0 if contact["phone"] else 0.0, "phone number in the resume"),
+        _check("sections", 1 - len(missing) / len(REQUIRED_SECTIONS),
+               f"missing headings: {', '.join(missing)}" if missing else "standard section headings"),
+        _check("dates", 1.0 if ranges else 0.0, f"{len(ranges)} parseable date ranges"),
+        _check("bullets", len(bullets) / 3, f"{len(bullets)} bullet points"),
+        _check("quantified", len(achievements) / 3, f"{len(achievements)} bullets with numbers"),
+        _check("action_verbs", with_verbs / len(bullets) / 0.5 if bullets else 0.0,
+               f"{with_verbs} of {len(bullets)} bullets start with an action verb"),
+        _check("length", length, f"{words} words (150-1200 reads best)"),
+        _check("layout", 1.0 if layout_lines <= 2 else 0.0, f"{layout_lines} table or column lines"),
+    ]
+
+
+def analyze_resume(text: str, profile: Optional[RoleProfile] = None, today: Optional[date] = None) -> Dict[str, Any]:
+    """Sections, skills, titles, dates, quantified achievements, ATS score and (with ``profile``) keyword match.
+
+    ``score`` is 0-1: 60% keyword match and 40% ATS score, or the ATS score
+    alone without a profile.
+    """
+    sections = segment(text)
+    experience = sections.get("experience") or [line for lines in sections.values() for line in lines]
+    ranges = date_ranges(experience, today)
+    body = experience + sections.get("projects", [])
+    bullets = [line for line in body if _BULLET.match(line)]
+    achievements = [_BULLET.sub("", line).strip() for line in (bullets or body) if _QUANTIFIED.search(line)]
+    present = set(tokenize(text))
+    words = len(text.split())
+    contact = {
+        "email": bool(_EMAIL.search(text)),
+        "phone": bool(_PHONE.search(text)),
+        "links": sorted({m.group(1).lower() for m in _PROFILE_LINK.finditer(text)}),
+    }
+
+    checks = _ats_checks(text, contact, sections, ranges, bullets, achievements, words)
+    ats_score = round(sum(ATS_WEIGHTS[c["check"]] * c["score"] for c in checks))
+    skills = [display_term(term) for term in _DISPLAY if term in present]
+    keyword_match = None
+    score = ats_score / 100
+    if profile is not None:
+        total = sum(weight for _, weight in profile.terms)
+        matched = [term for term, _ in profile.terms if term in present]
+        missing = [term for term, _ in profile.terms if term not in present]
+        match_score = sum(weight for term, weight in profile.terms if term in present) / total if total else 0.0
+        keyword_match = {
+            "role": profile.role,
+            "source": profile.source,
+            "score": round(match_score, 3),
+            "matched": [display_term(t) for t in matched],
+            "missing": [display_term(t) for t in missing],
+        }
+        skills.extend(display_term(t) for t in matched if display_term(t) not in skills)
+        score = 0.6 * match_score + 0.4 * ats_score / 100
+    return {
+        "sections": [name for name in sections if name != "header"],
+        "contact": contact,
+        "skills": skills,
+        "titles": _titles(experience),
+        "dates": [{"start": _ordinal_label(s), "end": _ordinal_label(e)} for s, e in sorted(ranges, reverse=True)],
+        "experience_years": round(experience_months(ranges) / 12, 1),
+        "achievements": achievements[:10],
+        "ats": {"score": ats_score, "checks": checks},
+        "keyword_match": keyword_match,
+        "score": round(score, 3),
+    }
+
+
+_ADVICE = {
+    "email": "Add an email address to the header",
+    "phone": "Add a phone number to the header",
+    "sections": "Use standard section headings (Experience, Education, Skills) so ATS parsers find each part",
+    "dates": "Give every position a date range, e.g. 03.2021 – present",
+    "bullets": "List responsibilities and results as bullet points under each position",
+    "quantified": "Quantify results (%, money, users, time saved) in at least three bullets",
+    "action_verbs": "Start bullets with action verbs (built, led, reduced, launched)",
+    "length": "Keep the resume between 150 and 1200 words",
+    "layout": "Avoid tables, columns and tab-aligned layouts; ATS parsers read them out of order",
+}
+
+
+def improvement_steps(analysis: Dict[str, Any], limit: int = 8) -> List[str]:
+    """Fixes for failed ATS checks (largest point loss first) and missing role keywords."""
+    failed = sorted(
+        (c for c in analysis["ats"]["checks"] if not c["passed"]),
+        key=lambda c: -ATS_WEIGHTS[c["check"]] * (1 - c["score"]),
+    )
+    steps = [_ADVICE[c["check"]] for c in failed]
+    keyword_match = analysis.get("keyword_match")
+    if keyword_match and keyword_match["missing"]:
+        steps.insert(
+            0,
+            f"Mention these {keyword_match['role']} keywords where they genuinely apply: "
+            + ", ".join(keyword_match["missing"][:8]),
+        )
+    return steps[:limit]
+
+
+def _summary(candidate_id: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    keyword_match = analysis["keyword_match"] or {}
+    return {
+        "id": candidate_id,
+        "score": analysis["score"],
+        "keyword_score": keyword_match.get("score"),
+        "ats_score": analysis["ats"]["score"],
+        "experience_years": analysis["experience_years"],
+        "titles": analysis["titles"][:3],
+        "matched": keyword_match.get("matched", []),
+        "missing": keyword_match.get("missing", [])[:5],
+    }
+
+
+def _score_chunk(profile: RoleProfile, chunk: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    # Runs in pool workers: one pickled profile per chunk rather than per resume
+    return [_summary(candidate_id, analyze_resume(text, profile)) for candidate_id, text in chunk]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # forkserver/spawn: forking a server with live logging, tracing and event-loop threads can deadlock
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            context = multiprocessing.get_context(method)
+            if method == "forkserver":
+                context.set_forkserver_preload([__name__])
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _pool_workers = workers
+        return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def default_workers() -> int:
+    return load_config().resume_workers or multiprocessing.cpu_count()
+
+
+def score_chunks(
+    resumes: Sequence[Tuple[str, str]],
+    profile: RoleProfile,
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Score ``(candidate_id, text)`` pairs chunk by chunk, yielding ``(mode, rows)`` as each chunk finishes.
+
+    Batches of at least ``PARALLEL_MIN_RESUMES`` are split into chunks (about
+    four per worker, so uneven resume lengths still balance) and scored in a
+    shared process pool; smaller ones, or ``workers=1``, run inline in chunks
+    of ``INLINE_CHUNK_SIZE``. Chunks come back in input order; closing the
+    generator early cancels pool chunks that have not started.
+    """
+    workers = max(1, workers or default_workers())
+    if workers > 1 and len(resumes) >= PARALLEL_MIN_RESUMES:
+        size = math.ceil(len(resumes) / (workers * 4))
+        chunks = [resumes[i:i + size] for i in range(0, len(resumes), size)]
+        done = 0
+        try:
+            pool = _get_pool(workers)
+            for rows in pool.map(_score_chunk, [profile] * len(chunks), chunks):
+                done += 1
+                yield "process_pool", rows
+            return
+        except BrokenProcessPool:
+            logging.getLogger(__name__).warning(
+                "resume_pool_broken", extra={"extra": {"event": "resume_pool_broken", "workers": workers}}
+            )
+            _reset_pool()
+        # The chunks the pool did not finish are scored inline
+        resumes = [pair for chunk in chunks[done:] for pair in chunk]
+    for i in range(0, len(resumes), INLINE_CHUNK_SIZE):
+        yield "inline", _score_chunk(profile, resumes[i:i + INLINE_CHUNK_SIZE])
+
+
+def shortlist(
+    scored: List[Dict[str, Any]], profile: RoleProfile, top_n: int, mode: str, workers: int, start: float
+) -> Dict[str, Any]:
+    """Rank ``score_chunks`` rows in place and summarise the run that began at ``start`` (``perf_counter``)."""
+    scored.sort(key=lambda row: (-row["score"], -(row["keyword_score"] or 0.0)))
+    for rank, row in enumerate(scored, 1):
+        row["rank"] = rank
+    return {
+        "role": profile.role,
+        "profile_source": profile.source,
+        "scored": len(scored),
+        "mode": mode,
+        "workers": workers if mode == "process_pool" else 1,
+        "duration_ms": int((time.perf_counter() - start) * 1000),
+        "shortlist": scored[:top_n],
+    }
+
+
+def rank_resumes(
+    resumes: Sequence[Tuple[str, str]],
+    profile: RoleProfile,
+    top_n: int = 20,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Score ``(candidate_id, text)`` pairs against one profile and return the ``top_n`` best, ranked."""
+    workers = max(1, workers or default_workers())
+    start = time.perf_counter()
+    mode = "inline"
+    scored: List[Dict[str, Any]] = []
+    for mode, rows in score_chunks(resumes, profile, workers):
+        scored.extend(rows)
+    return shortlist(scored, profile, top_n, mode, workers, start)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Route:
+    name: str
+    keywords: Tuple[str, ...]
+    weight: float = 1.0
+    # Sample task descriptions for the semantic router (ROUTING_ENGINE=semantic)
+    examples: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class RouteTable:
+    routes: Tuple[Route, ...]
+    fallback: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RouteMatch:
+    route: Optional[str]
+    matched_keywords: Tuple[str, ...] = ()
+    score: float = 0.0
+    scores: Dict[str, float] = field(default_factory=dict)
+    engine: str = "keyword"
+
+
+# Keyword routes per user type. Table order breaks ties between equal scores.
+DEFAULT_ROUTING_TABLE: Dict[str, RouteTable] = {
+    "recruiter": RouteTable(
+        routes=(
+            Route("market_research", ("market research", "salary", "hh.ru", "research")),
+            Route("generate_job_post", ("job post", "vacancy", "description")),
+            Route("generate_application_form", ("application form", "apply form", "form")),
+            Route("generate_quiz", ("quiz", "assessment", "test")),
+            Route("generate_homework", ("homework", "take-home", "assignment")),
+            Route("generate_candidate_journey", ("candidate journey", "process", "pipeline")),
+            Route("generate_funnel_report", ("funnel", "report", "analytics")),
+        ),
+    ),
+    "candidate": RouteTable(
+        routes=(
+            Route("resume_optimizer", ("resume", "cv", "ats")),
+            Route("interview_prep", ("interview", "prep", "questions")),
+            Route("salary_research", ("salary", "market", "range")),
+        ),
+        fallback="candidate_assistant",
+    ),
+}
+
+# Descriptions for user types without their own table use this one
+DEFAULT_USER_TYPE = "candidate"
+
+
+def _trie_pattern(words: Sequence[str]) -> str:
+    """Build a prefix-factored alternation so matching cost is bounded by keyword length, not count."""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def render(node: Dict[str, Any]) -> str:
+        terminal = "" in node
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Greedy optional: the longest keyword at a position wins, shorter ones are implied
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class _CompiledTable:
+    def __init__(self, table: RouteTable) -> None:
+        self.table = table
+        self.order = {route.name: i for i, route in enumerate(table.routes)}
+        self.weights = {route.name: route.weight for route in table.routes}
+        owners: Dict[str, List[str]] = {}
+        for route in table.routes:
+            for keyword in route.keywords:
+                owners.setdefault(keyword.lower(), []).append(route.name)
+        self.owners = {k: tuple(v) for k, v in owners.items()}
+        # A hit on the longest keyword at a position also counts every keyword that is its prefix
+        self.implied: Dict[str, FrozenSet[str]] = {
+            k: frozenset(other for other in owners if k.startswith(other)) for k in owners
+        }
+        pattern = _trie_pattern(list(owners)) if owners else "(?!)"
+        self.regex = re.compile("(?=(" + pattern + "))")
+
+    def match(self, text: str) -> RouteMatch:
+        hits = set()
+        for m in self.regex.finditer(text.lower()):
+            found = m.group(1)
+            if found:
+                hits.update(self.implied[found])
+
+        matched: Dict[str, List[str]] = {}
+        for keyword in hits:
+            for route in self.owners[keyword]:
+                matched.setdefault(route, []).append(keyword)
+        scores = {route: len(keywords) * self.weights[route] for route, keywords in matched.items()}
+        if not scores:
+            return RouteMatch(route=self.table.fallback)
+        winner = min(scores, key=lambda route: (-scores[route], self.order[route]))
+        return RouteMatch(
+            route=winner,
+            matched_keywords=tuple(sorted(matched[winner])),
+            score=scores[winner],
+            scores=scores,
+        )
+
+
+class KeywordRouter:
+    """Route task descriptions to tools with one regex pass per description.
+
+    Every user type's keywords are compiled into a single trie-shaped lookahead
+    regex, so all keyword hits (overlapping ones included) are found in one scan
+    whose per-character cost does not grow with the number of routes. The route
+    with the highest score (distinct keyword hits times route weight) wins; ties
+    go to the route listed first.
+    """
+
+    def __init__(self, tables: Optional[Mapping[str, RouteTable]] = None) -> None:
+        self._tables = {
+            user_type.lower(): _CompiledTable(table)
+            for user_type, table in (tables or DEFAULT_ROUTING_TABLE).items()
+        }
+
+    @property
+    def tables(self) -> Dict[str, RouteTable]:
+        return {user_type: compiled.table for user_type, compiled in self._tables.items()}
+
+    @property
+    def route_names(self) -> FrozenSet[str]:
+        names = set()
+        for compiled in self._tables.values():
+            names.update(route.name for route in compiled.table.routes)
+            if compiled.table.fallback:
+                names.add(compiled.table.fallback)
+        return frozenset(names)
+
+    def match(self, user_type: str, text: str) -> RouteMatch:
+        compiled = self._tables.get((user_type or "").lower()) or self._tables[DEFAULT_USER_TYPE]
+        return compiled.match(text or "")
+
+    @classmethod
+    def from_file(cls, path: Optional[Path]) -> "KeywordRouter":
+        """Build a router from the default table extended by an optional JSON file.
+
+        The file maps user types to
+        ``{"routes": [{"name", "keywords", "weight", "examples"}], "fallback"}``.
+        Keywords and examples for an existing route are appended to it; unknown
+        routes are added after the defaults.
+        """
+        if path is None:
+            return cls()
+        with Path(path).open("r", encoding="utf-8") as f:
+            overrides = json.load(f)
+        return cls(merge_routing_tables(DEFAULT_ROUTING_TABLE, overrides))
+
+
+def merge_routing_tables(base: Mapping[str, RouteTable], overrides: Mapping[str, Any]) -> Dict[str, RouteTable]:
+    merged: Dict[str, RouteTable] = dict(base)
+    for user_type, spec in overrides.items():
+        user_type = user_type.lower()
+        current = merged.get(user_type, RouteTable(routes=()))
+        routes = {route.name: route for route in current.routes}
+        order = [route.name for route in current.routes]
+        for item in spec.get("routes", []):
+            name = item["name"]
+            existing = routes.get(name)
+            keywords = tuple(k.lower() for k in item.get("keywords", []))
+            examples = tuple(item.get("examples", []))
+            if existing is None:
+                order.append(name)
+                routes[name] = Route(name, keywords, float(item.get("weight", 1.0)), examples)
+            else:
+                extra = tuple(k for k in keywords if k not in existing.keywords)
+                routes[name] = Route(
+                    name,
+                    existing.keywords + extra,
+                    float(item.get("weight", existing.weight)),
+                    existing.examples + tuple(e for e in examples if e not in existing.examples),
+                )
+        merged[user_type] = RouteTable(
+            routes=tuple(routes[name] for name in order),
+            fallback=spec.get("fallback", current.fallback),
+        )
+    return merged
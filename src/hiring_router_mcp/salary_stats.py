@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+# Order matters: the index is the stored code
+CURRENCIES = ("RUR", "USD", "EUR", "KZT", "BYR", "UZS", "AZN", "GEL", "KGS", "UAH")
+EXPERIENCE_BUCKETS = ("noExperience", "between1And3", "between3And6", "moreThan6")
+
+# Units of each currency per 1 RUR, in hh.ru's /dictionaries "rate" convention.
+# Used when live rates are not supplied.
+DEFAULT_RATES = {
+    "RUR": 1.0,
+    "USD": 0.0111,
+    "EUR": 0.0102,
+    "KZT": 5.6,
+    "BYR": 0.0357,
+    "UZS": 140.0,
+    "AZN": 0.0189,
+    "GEL": 0.0300,
+    "KGS": 0.97,
+    "UAH": 0.46,
+}
+
+# Russian personal income tax; hh.ru salaries are flagged gross or net
+INCOME_TAX = 0.13
+
+QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+
+
+@dataclass
+class VacancyFrame:
+    """Vacancies as parallel NumPy columns.
+
+    ``salary_from``/``salary_to`` are float64 with NaN for missing bounds,
+    ``currency`` and ``experience`` are int8 codes into :data:`CURRENCIES` and
+    :data:`EXPERIENCE_BUCKETS` (-1 when unknown), ``region`` is the hh.ru area id
+    (-1 when unknown) and ``gross`` flags amounts quoted before tax.
+    """
+
+    salary_from: np.ndarray
+    salary_to: np.ndarray
+    currency: np.ndarray
+    experience: np.ndarray
+    region: np.ndarray
+    gross: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.salary_from.shape[0])
+
+    @classmethod
+    def from_hh_items(cls, items: Sequence[Mapping[str, Any]]) -> "VacancyFrame":
+        n = len(items)
+        salary_from = np.full(n, np.nan)
+        salary_to = np.full(n, np.nan)
+        currency = np.full(n, -1, dtype=np.int8)
+        experience = np.full(n, -1, dtype=np.int8)
+        region = np.full(n, -1, dtype=np.int32)
+        gross = np.zeros(n, dtype=bool)
+        currency_codes = {code: i for i, code in enumerate(CURRENCIES)}
+        experience_codes = {code: i for i, code in enumerate(EXPERIENCE_BUCKETS)}
+        # Ingest is the only per-row step; every statistic below is columnar
+        for i, item in enumerate(items):
+            salary = item.get("salary") or {}
+            if salary.get("from") is not None:
+                salary_from[i] = salary["from"]
+            if salary.get("to") is not None:
+                salary_to[i] = salary["to"]
+            currency[i] = currency_codes.get(salary.get("currency"), -1)
+            gross[i] = bool(salary.get("gross"))
+            experience[i] = experience_codes.get((item.get("experience") or {}).get("id"), -1)
+            area_id = (item.get("area") or {}).get("id")
+            if area_id is not None and str(area_id).isdigit():
+                region[i] = int(area_id)
+        return cls(salary_from, salary_to, currency, experience, region, gross)
+
+
+def rate_vector(rates: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    merged = {**DEFAULT_RATES, **(rates or {})}
+    return np.array([merged.get(code, np.nan) for code in CURRENCIES], dtype=np.float64)
+
+
+def normalized_salaries(
+    frame: VacancyFrame,
+    rates: Optional[Mapping[str, float]] = None,
+    basis: str = "net",
+) -> np.ndarray:
+    """Monthly salary midpoints in RUR on a gross or net basis (NaN where unknown)."""
+    midpoint = np.where(
+        np.isnan(frame.salary_from),
+        frame.salary_to,
+        np.where(np.isnan(frame.salary_to), frame.salary_from, (frame.salary_from + frame.salary_to) / 2),
+    )
+    per_rur = rate_vector(rates)
+    known = frame.currency >= 0
+    divisor = np.full(len(frame), np.nan)
+    divisor[known] = per_rur[frame.currency[known]]
+    rub = midpoint / divisor
+    if basis == "net":
+        return np.where(frame.gross, rub * (1 - INCOME_TAX), rub)
+    if basis == "gross":
+        return np.where(frame.gross, rub, rub / (1 - INCOME_TAX))
+    raise ValueError(f"Unknown basis {basis!r}; use 'net' or 'gross'")
+
+
+def _sorted_by_group(values: np.ndarray, groups: np.ndarray) -> tuple:
+    """Order rows by (group, value): one float sort, then a stable radix sort on the small int codes."""
+    by_value = np.argsort(values, kind="stable")
+    values, groups = values[by_value], groups[by_value]
+    by_group = np.argsort(groups, kind="stable")
+    return values[by_group], groups[by_group], values
+
+
+def _interpolated(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Linear-interpolated quantiles for every (segment, q) pair at once."""
+    positions = starts[:, None] + q[None, :] * (counts[:, None] - 1)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, (starts + counts - 1)[:, None])
+    frac = positions - lower
+    return sorted_values[lower] * (1 - frac) + sorted_values[upper] * frac
+
+
+def _bands(sorted_values: np.ndarray, codes: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: np.ndarray) -> Dict[int, Dict[str, Any]]:
+    matrix = _interpolated(sorted_values, starts, counts, q)
+    sums = np.add.reduceat(sorted_values, starts)
+    return {
+        int(code): {
+            "count": int(count),
+            "mean": float(total / count),
+            "quantiles": {f"p{round(qq * 100)}": float(v) for qq, v in zip(q, row)},
+        }
+        for code, count, total, row in zip(codes, counts, sums, matrix)
+    }
+
+
+def grouped_quantiles(values: np.ndarray, groups: np.ndarray, quantiles: Sequence[float] = QUANTILES) -> Dict[int, Dict[str, Any]]:
+    """Quantiles of ``values`` per group code with no per-row Python loop.
+
+    Rows are ordered by (group, value); each group's quantile positions are then
+    computed for all groups and quantiles at once and linearly interpolated,
+    matching ``np.quantile(..., method="linear")`` within each group.
+    """
+    mask = ~np.isnan(values)
+    if not mask.any():
+        return {}
+    sorted_values, sorted_groups, _ = _sorted_by_group(values[mask], groups[mask])
+    codes, starts, counts = np.unique(sorted_groups, return_index=True, return_counts=True)
+    return _bands(sorted_values, codes, starts, counts, np.asarray(quantiles, dtype=np.float64))
+
+
+def grouped_histograms(values: np.ndarray, groups: np.ndarray, bins: int = 10) -> Dict[str, Any]:
+    """Shared bin edges and per-group counts from a single ``bincount``."""
+    mask = ~np.isnan(values)
+    values, groups = values[mask], groups[mask]
+    if values.size == 0:
+        return {"edges": [], "counts": {}}
+    codes, group_index = np.unique(groups, return_inverse=True)
+    edges = np.histogram_bin_edges(values, bins=bins)
+    # np.histogram semantics: half-open bins except the last, which includes its right edge
+    bin_index = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, bins - 1)
+    counts = np.bincount(group_index * bins + bin_index, minlength=codes.size * bins).reshape(codes.size, bins)
+    return {
+        "edges": [round(float(e)) for e in edges],
+        "counts": {int(code): counts[i].tolist() for i, code in enumerate(codes)},
+    }
+
+
+def salary_bands(
+    frame: VacancyFrame,
+    rates: Optional[Mapping[str, float]] = None,
+    basis: str = "net",
+    group_by: str = "experience",
+    bins: int = 10,
+) -> Dict[str, Any]:
+    """Salary bands (RUR, monthly) overall and per experience bucket or region."""
+    salaries = normalized_salaries(frame, rates, basis)
+    if group_by == "experience":
+        groups, labels = frame.experience, dict(enumerate(EXPERIENCE_BUCKETS))
+    elif group_by == "region":
+        groups, labels = frame.region, {}
+    else:
+        raise ValueError(f"Unknown group_by {group_by!r}; use 'experience' or 'region'")
+
+    q = np.asarray(QUANTILES, dtype=np.float64)
+    mask = ~np.isnan(salaries)
+    overall = None
+    per_group: Dict[int, Dict[str, Any]] = {}
+    if mask.any():
+        sorted_values, sorted_groups, value_sorted = _sorted_by_group(salaries[mask], groups[mask])
+        overall = _bands(value_sorted, np.zeros(1), np.zeros(1, dtype=np.int64), np.array([value_sorted.size]), q)[0]
+        codes, starts, counts = np.unique(sorted_groups, return_index=True, return_counts=True)
+        per_group = _bands(sorted_values, codes, starts, counts, q)
+    histogram = grouped_histograms(salaries, groups, bins=bins)
+
+    def _label(code: int) -> str:
+        return labels.get(code, "unknown" if code < 0 else str(code))
+
+    return {
+        "currency": "RUR",
+        "basis": basis,
+        "vacancies": len(frame),
+        "with_salary": int(np.count_nonzero(~np.isnan(salaries))),
+        "overall": _round_band(overall) if overall else None,
+        "group_by": group_by,
+        "bands": {_label(code): _round_band(band) for code, band in per_group.items()},
+        "histogram": {
+            "edges": histogram["edges"],
+            "counts": {_label(code): counts for code, counts in histogram["counts"].items()},
+        },
+    }
+
+
+def _round_band(band: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "count": band["count"],
+        "mean": round(band["mean"]),
+        **{name: round(value) for name, value in band["quantiles"].items()},
+    }
+
+
+def bands_from_items(items: Iterable[Mapping[str, Any]], rates: Optional[Mapping[str, float]] = None, basis: str = "net") -> Dict[str, Any]:
+    return salary_bands(VacancyFrame.from_hh_items(list(items)), rates=rates, basis=basis)
+
+
+def parse_hh_rates(dictionaries: Mapping[str, Any]) -> Dict[str, float]:
+    """Extract ``{code: rate}`` from an hh.ru ``/dictionaries`` payload."""
+    rates: Dict[str, float] = {}
+    for entry in dictionaries.get("currency") or []:
+        code, rate = entry.get("code"), entry.get("rate")
+        if code and rate:
+            rates[code] = float(rate)
+    return rates
+
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .routing import DEFAULT_USER_TYPE, KeywordRouter, RouteMatch, RouteTable
+from .skill_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Bump when tokenization or weighting changes so persisted indexes are rebuilt
+INDEX_VERSION = 1
+DEFAULT_CONFIDENCE = 0.1
+
+# Example utterances per route, scored against task descriptions alongside the
+# route's keywords. Routing table files may add more under "examples".
+DEFAULT_ROUTE_EXAMPLES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "recruiter": {
+        "market_research": (
+            "what do companies pay for this role",
+            "help me price a senior position",
+            "compensation benchmark for engineers in our city",
+            "how competitive is the hiring market for data scientists",
+            "how many open vacancies are there for this profile on hh.ru",
+            "which skills and salaries do competitors offer",
+            "сколько платят разработчикам на рынке",
+            "анализ рынка труда и зарплатные вилки",
+            "сколько вакансий сейчас открыто по этой профессии",
+        ),
+        "generate_job_post": (
+            "write a job ad for a backend developer",
+            "draft the public posting for an opening",
+            "job description with responsibilities and requirements",
+            "announce a new position on our careers page",
+            "we are hiring a product manager, write the listing",
+            "составь текст вакансии для разработчика",
+            "описание вакансии с обязанностями и требованиями",
+            "нужно объявление о найме",
+        ),
+        "generate_application_form": (
+            "create an application form for candidates",
+            "questionnaire candidates fill in when they apply",
+            "intake form with fields for portfolio and contacts",
+            "collect candidate applications through a web form",
+            "анкета для кандидатов",
+            "форма отклика на вакансию",
+        ),
+        "generate_quiz": (
+            "screening quiz for applicants",
+            "multiple choice questions to check knowledge",
+            "short knowledge test for the first round",
+            "assess candidates with a quick test",
+            "тест для проверки знаний кандидатов",
+            "опросник с вариантами ответов",
+        ),
+        "generate_homework": (
+            "take home assignment for engineers",
+            "practical task candidates complete at home",
+            "coding exercise to send after the screening call",
+            "test task with evaluation criteria",
+            "тестовое задание для кандидата",
+            "домашнее задание для разработчика",
+        ),
+        "generate_candidate_journey": (
+            "design our hiring process from sourcing to offer",
+            "stages of the interview loop with durations",
+            "map the steps a candidate goes through",
+            "plan the recruitment workflow for the team",
+            "этапы процесса найма от отклика до оффера",
+            "путь кандидата по этапам собеседований",
+        ),
+        "generate_funnel_report": (
+            "conversion between hiring stages",
+            "where do we lose candidates in the funnel",
+            "time to hire metrics for last quarter",
+            "recruiting dashboard with stage statistics",
+            "отчет по воронке найма",
+            "конверсия по этапам подбора",
+        ),
+    },
+    "candidate": {
+        "resume_optimizer": (
+            "improve my resume",
+            "make my cv pass applicant tracking systems",
+            "rewrite my experience section with stronger bullets",
+            "check my resume against the job description",
+            "улучши мое резюме",
+            "помоги переписать резюме под вакансию",
+        ),
+        "interview_prep": (
+            "prepare me for a technical interview",
+            "practice behavioral questions",
+            "what will they ask me at the system design round",
+            "mock interview for a developer position",
+            "подготовка к собеседованию",
+            "какие вопросы зададут на интервью",
+        ),
+        "salary_research": (
+            "how much should I ask for",
+            "what is a fair pay for my level",
+            "negotiate my offer and compensation",
+            "am I underpaid compared to the market",
+            "какую зарплату просить",
+            "сколько я стою на рынке",
+        ),
+        "candidate_assistant": (
+            "help me find a job",
+            "I want to change my career",
+            "where should I start looking for work",
+            "advice on my job search",
+            "помоги найти работу",
+            "хочу сменить профессию",
+        ),
+    },
+}
+
+
+def route_examples(tables: Mapping[str, RouteTable]) -> Dict[str, Dict[str, List[str]]]:
+    """Training utterances per user type and route: keywords, table examples and the defaults."""
+    examples: Dict[str, Dict[str, List[str]]] = {}
+    for user_type, table in tables.items():
+        defaults = DEFAULT_ROUTE_EXAMPLES.get(user_type, {})
+        routes = {route.name: [*route.keywords, *route.examples, *defaults.get(route.name, ())] for route in table.routes}
+        if table.fallback and table.fallback not in routes:
+            routes[table.fallback] = list(defaults.get(table.fallback, ()))
+        examples[user_type] = {name: texts for name, texts in routes.items() if texts}
+    return examples
+
+
+def fingerprint(examples: Mapping[str, Mapping[str, Sequence[str]]]) -> str:
+    payload = json.dumps([INDEX_VERSION, examples], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SemanticIndex:
+    """TF-IDF route centroids, one matrix per user type.
+
+    Every example utterance becomes an L2-normalised TF-IDF vector over the
+    shared vocabulary (terms from :func:`skill_index.tokenize`); a route's row is
+    the normalised mean of its examples. Scoring a description is one
+    matrix-vector product giving the cosine similarity to every route.
+    """
+
+    def __init__(
+        self,
+        vocabulary: Sequence[str],
+        idf: np.ndarray,
+        routes: Mapping[str, Sequence[str]],
+        matrices: Mapping[str, np.ndarray],
+        key: str,
+    ) -> None:
+        self.vocabulary = list(vocabulary)
+        self.terms = {term: i for i, term in enumerate(self.vocabulary)}
+        self.idf = idf
+        self.routes = {user_type: tuple(names) for user_type, names in routes.items()}
+        self.matrices = dict(matrices)
+        self.key = key
+
+    @classmethod
+    def build(cls, examples: Mapping[str, Mapping[str, Sequence[str]]]) -> "SemanticIndex":
+        documents = [tokenize(text) for routes in examples.values() for texts in routes.values() for text in texts]
+        vocabulary = sorted({term for terms in documents for term in terms})
+        terms = {term: i for i, term in enumerate(vocabulary)}
+        df = np.zeros(len(vocabulary))
+        for doc in documents:
+            df[[terms[t] for t in set(doc)]] += 1
+        # Smoothed idf, as in scikit-learn's TfidfVectorizer
+        idf = np.log((1 + len(documents)) / (1 + df)) + 1
+        index = cls(vocabulary, idf, {}, {}, fingerprint(examples))
+        for user_type, routes in examples.items():
+            rows = []
+            for texts in routes.values():
+                centroid = np.mean([index._vector(text) for text in texts], axis=0)
+                rows.append(centroid / (np.linalg.norm(centroid) or 1.0))
+            index.routes[user_type] = tuple(routes)
+            index.matrices[user_type] = np.asarray(rows, dtype=np.float32)
+        return index
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        ids = [self.terms[t] for t in tokenize(text) if t in self.terms]
+        if ids:
+            np.add.at(vector, ids, 1.0)
+            vector *= self.idf
+            vector /= np.linalg.norm(vector)
+        return vector
+
+    def scores(self, user_type: str, text: str) -> Dict[str, float]:
+        matrix = self.matrices.get(user_type)
+        if matrix is None:
+            user_type = DEFAULT_USER_TYPE
+            matrix = self.matrices[user_type]
+        similarity = matrix @ self._vector(text)
+        return {name: float(score) for name, score in zip(self.routes[user_type], similarity)}
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {"vocabulary": np.array(self.vocabulary, dtype=str), "idf": self.idf, "key": np.array(self.key)}
+        for user_type, matrix in self.matrices.items():
+            arrays[f"routes.{user_type}"] = np.array(self.routes[user_type], dtype=str)
+            arrays[f"matrix.{user_type}"] = matrix
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            np.savez(f, **arrays)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SemanticIndex":
+        with np.load(path, allow_pickle=False) as data:
+            user_types = [name.split(".", 1)[1] for name in data.files if name.startswith("matrix.")]
+            return cls(
+                data["vocabulary"].tolist(),
+                data["idf"],
+                {u: data[f"routes.{u}"].tolist() for u in user_types},
+                {u: data[f"matrix.{u}"] for u in user_types},
+                str(data["key"]),
+            )
+
+    @classmethod
+    def load_or_build(cls, path: Path, examples: Mapping[str, Mapping[str, Sequence[str]]]) -> "SemanticIndex":
+        """Reuse the index at ``path`` when it was built from the same examples, else rebuild and persist."""
+        key = fingerprint(examples)
+        try:
+            index = cls.load(path)
+            if index.key == key:
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+        index = cls.build(examples)
+        try:
+            index.save(path)
+        except OSError as exc:
+            logger.warning("routing_index_not_saved", extra={"extra": {"event": "routing_index_not_saved", "error": str(exc)}})
+        return index
+
+
+class SemanticRouter:
+    """Route by TF-IDF similarity to example utterances, falling back to keywords.
+
+    The best-scoring route wins when its cosine similarity reaches
+    ``threshold``; below that the keyword router decides, so literal keyword
+    matches and the table's fallback route still apply to descriptions the
+    examples do not cover.
+    """
+
+    def __init__(self, keywords: KeywordRouter, index: SemanticIndex, threshold: float = DEFAULT_CONFIDENCE) -> None:
+        self.keywords = keywords
+        self.index = index
+        self.threshold = threshold
+
+    @property
+    def route_names(self) -> FrozenSet[str]:
+        return self.keywords.route_names
+
+    def match(self, user_type: str, text: str) -> RouteMatch:
+        scores = self.index.scores((user_type or "").lower(), text or "")
+        best = max(scores, key=scores.__getitem__) if scores else None
+        if best is None or scores[best] < self.threshold:
+            return self.keywords.match(user_type, text)
+        return RouteMatch(route=best, score=round(scores[best], 4), scores=scores, engine="semantic")
+
+    @classmethod
+    def from_keyword_router(
+        cls, keywords: KeywordRouter, path: Path, threshold: float = DEFAULT_CONFIDENCE
+    ) -> "SemanticRouter":
+        return cls(keywords, SemanticIndex.load_or_build(path, route_examples(keywords.tables)), threshold)
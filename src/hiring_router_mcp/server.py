@@ -1,125 +1,473 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import functools
+import inspect
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from dataclasses import asdict
-from typing import Any, Dict, List, Optional
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
+from mcp import types
 from mcp.server.fastmcp import FastMCP
+from mcp.shared.exceptions import McpError
 import time
 import uuid
 import hashlib
 
+from .admission import ADMISSION_ERROR_CODE, AdmissionController, AdmissionRejected, current_client_id
+from .batch import BatchRunner, current_batch_id
+from .cache import ResultCache, canonical_key
 from .config import load_config
-from .logging_setup import setup_logging
-from .tools.analytics import get_request_analytics, export_logs
-from .tools.candidate import (
-    candidate_assistant,
-    resume_optimizer,
-    interview_prep,
-    salary_research,
-)
-from .tools.recruiter import (
-    market_research,
-    generate_job_post,
-    generate_application_form,
-    generate_quiz,
-    generate_homework,
-    generate_candidate_journey,
-    generate_funnel_report,
+from .lazy_tools import LazyFunction, LazyTool, add_lazy_tool, load_manifest, tool_functions
+from .logging_setup import log_queue_depth, setup_logging, webhook_stats
+from .metrics import MetricsRegistry
+from .profiling import ToolProfiler
+from .routing import KeywordRouter
+from .streaming import ClientDisconnected, Progress, ProgressSink, is_streaming, result_signature, run_streaming
+from .tracing import KIND_SERVER, STATUS_ERROR, current_trace_id, setup_tracing, start_span
+
+
+# Tools whose output depends only on their arguments; cached when TOOL_CACHE_TTL_SECONDS > 0
+CACHEABLE_TOOLS = frozenset(
+    {
+        "market_research",
+        "generate_quiz",
+        "generate_homework",
+        "interview_prep",
+        "salary_research",
+    }
 )
 
+# Tools that wait on hh.ru requests; with live lookups on they run in a worker thread even in
+# TOOL_EXECUTION_MODE=sync, so a cold market snapshot cannot stall every session on the event loop
+HH_API_TOOLS = frozenset({"market_research", "salary_research"})
+
+
+def _cacheable_result(result: Any) -> bool:
+    """False for results carrying a failed hh.ru lookup, so one timeout is not served for the whole TTL."""
+    if not isinstance(result, dict):
+        return True
+    market_data = result.get("market_data")
+    return not (isinstance(market_data, dict) and "error" in market_data)
+
 
-def build_server() -> FastMCP:
+def _webhook_stat(key: str) -> Optional[int]:
+    stats = webhook_stats()
+    return stats[key] if stats else None
+
+
+def build_server(startup_mode: Optional[str] = None) -> FastMCP:
     config = load_config()
+    # "lazy": tool schemas come from tool_manifest.json and tool modules load on first call
+    lazy = (startup_mode or config.tool_startup_mode) == "lazy"
     setup_logging(
         config.log_dir,
         config.log_level,
         webhook_url=config.log_webhook_url,
         webhook_secret=config.log_webhook_secret,
+        webhook_mode=config.log_webhook_mode,
+        webhook_batch_size=config.log_webhook_batch_size,
+        webhook_flush_seconds=config.log_webhook_flush_seconds,
+        webhook_queue_size=config.log_webhook_queue_size,
+        non_blocking=config.tool_execution_mode == "async",
+        log_format=config.log_format,
+        segment_max_bytes=config.log_segment_max_bytes,
+    )
+    # TRACING_EXPORTER=file|otlp; spans are exported in batches from a background thread
+    span_processor = setup_tracing(
+        config.tracing_exporter,
+        config.log_dir,
+        service_name=config.service_name,
+        otlp_endpoint=config.otlp_endpoint,
+        batch_size=config.trace_batch_size,
+        flush_seconds=config.trace_flush_seconds,
+        max_queue_size=config.trace_queue_size,
     )
 
     server = FastMCP("hiring-router")
     client_id = config.log_client_id
+    result_cache = ResultCache(config.tool_cache_max_entries, config.tool_cache_max_bytes)
+
+    # Served at /metrics by server_http_sse
+    metrics = MetricsRegistry()
+    server.metrics = metrics
+    tool_calls = metrics.counter("tool_calls_total", "Tool invocations", ("tool",))
+    tool_errors = metrics.counter("tool_errors_total", "Tool invocations that raised", ("tool",))
+    tool_duration = metrics.histogram("tool_duration_seconds", "Tool latency, cache hits included", ("tool",))
+    tool_cancellations = metrics.counter(
+        "tool_cancellations_total", "Streaming tool calls stopped before finishing", ("tool", "reason")
+    )
+    metrics.callback("tool_cache_hits_total", "Result cache hits", lambda: result_cache.hits, kind="counter")
+    metrics.callback("tool_cache_misses_total", "Result cache misses", lambda: result_cache.misses, kind="counter")
+    metrics.callback("webhook_queue_depth", "Log records waiting for the batching webhook shipper", lambda: _webhook_stat("queue_depth"))
+    metrics.callback("webhook_dropped_total", "Log records dropped because the webhook queue was full", lambda: _webhook_stat("dropped"), kind="counter")
+    metrics.callback("webhook_failed_total", "Log records the webhook rejected (4xx) or did not take after retries", lambda: _webhook_stat("failed"), kind="counter")
+    metrics.callback("log_queue_depth", "Log records waiting for the non-blocking log listener", log_queue_depth)
+    if span_processor is not None:
+        metrics.callback("trace_spans_exported_total", "Spans handed to the trace exporter", lambda: span_processor.exported, kind="counter")
+        metrics.callback("trace_spans_dropped_total", "Spans dropped because the export queue was full", lambda: span_processor.dropped, kind="counter")
+
+    def _cache_ttl(tool_name: str) -> float:
+        if tool_name in config.tool_cache_ttls:
+            return config.tool_cache_ttls[tool_name]
+        if tool_name in CACHEABLE_TOOLS:
+            return config.tool_cache_ttl_seconds
+        return 0.0
+
+    # Opt-in (PROFILE_SAMPLE_RATE=N profiles one call in N per tool); None keeps the wrappers profiler-free
+    profiler = (
+        ToolProfiler(config.profile_sample_rate, config.profile_slow_ms, config.profile_keep)
+        if config.profile_sample_rate > 0
+        else None
+    )
+    # Read by the /debug/profiles route in server_http_sse
+    server.profiler = profiler
+
+    executor = (
+        ThreadPoolExecutor(max_workers=config.tool_thread_pool_size, thread_name_prefix="tool")
+        if config.tool_execution_mode == "async"
+        else None
+    )
+    # Logged wrappers by tool name; batch_generate dispatches through these
+    registered: Dict[str, Any] = {}
+    tools = tool_functions(lazy=lazy)
+    manifest = load_manifest() if lazy else {}
+
+    def _add_tool(fn):
+        entry = manifest.get(fn.__name__)
+        if entry is None:
+            server.tool()(fn)
+        else:
+            add_lazy_tool(server, fn, entry)
+        return fn
+
+    def _annotate(span, request_id, cache_key, cache_hit):
+        span.set("request_id", request_id)
+        if cache_key:
+            span.set("cache_hit", cache_hit)
+
+    def _request_context():
+        try:
+            return server._mcp_server.request_context
+        except LookupError:
+            return None
 
     def _register_with_logging(func):
         tool_name = func.__name__
+        cache_ttl = _cache_ttl(tool_name)
+        logger = logging.getLogger(__name__)
+        # Resolved once so the per-call cost is a lock and an add
+        calls = tool_calls.labels(tool_name)
+        errors = tool_errors.labels(tool_name)
+        latency = tool_duration.labels(tool_name)
+        span_name = f"tool {tool_name}"
+        span_attributes = {"mcp.tool.name": tool_name}
 
-        @wraps(func)
-        def wrapped(*args, **kwargs):
+        def _log_call(args, kwargs):
+            calls.inc()
             request_id = str(uuid.uuid4())
-            start = time.perf_counter()
-            arg_keys = list(kwargs.keys())
-            logger = logging.getLogger(__name__)
+            record = {
+                "event": "tool_call",
+                "request_id": request_id,
+                "client_id": current_client_id.get() or client_id,
+                "tool": tool_name,
+                "arg_keys": list(kwargs.keys()),
+            }
+            batch_id = current_batch_id.get()
+            if batch_id:
+                record["batch_id"] = batch_id
+            trace_id = current_trace_id()
+            if trace_id:
+                record["trace_id"] = trace_id
+            with start_span("log tool_call"):
+                logger.info("tool_call", extra={"extra": record})
+            cache_key = canonical_key(tool_name, kwargs) if cache_ttl > 0 and not args else None
+            return request_id, cache_key
 
-            logger.info(
-                "tool_call",
+        def _log_result(request_id, start, result, cache_key, cache_hit):
+            elapsed = time.perf_counter() - start
+            latency.observe(elapsed)
+            duration_ms = int(elapsed * 1000)
+            record = {
+                "event": "tool_result",
+                "request_id": request_id,
+                "client_id": current_client_id.get() or client_id,
+                "tool": tool_name,
+                "result_type": type(result).__name__,
+                "duration_ms": duration_ms,
+            }
+            if cache_key:
+                record["cache_hit"] = cache_hit
+            batch_id = current_batch_id.get()
+            if batch_id:
+                record["batch_id"] = batch_id
+            trace_id = current_trace_id()
+            if trace_id:
+                record["trace_id"] = trace_id
+            with start_span("log tool_result"):
+                logger.info("tool_result", extra={"extra": record})
+
+        def _log_cancelled(request_id, start, reason):
+            elapsed = time.perf_counter() - start
+            tool_cancellations.labels(tool_name, reason).inc()
+            latency.observe(elapsed)
+            record = {
+                "event": "tool_cancelled",
+                "request_id": request_id,
+                "client_id": current_client_id.get() or client_id,
+                "tool": tool_name,
+                "reason": reason,
+                "duration_ms": int(elapsed * 1000),
+            }
+            trace_id = current_trace_id()
+            if trace_id:
+                record["trace_id"] = trace_id
+            logger.info("tool_cancelled", extra={"extra": record})
+
+        def _log_error(request_id, start):
+            # Must be called from an except block so the traceback is attached
+            elapsed = time.perf_counter() - start
+            errors.inc()
+            latency.observe(elapsed)
+            duration_ms = int(elapsed * 1000)
+            logger.exception(
+                "tool_error",
                 extra={
                     "extra": {
-                        "event": "tool_call",
+                        "event": "tool_error",
                         "request_id": request_id,
-                        "client_id": client_id,
+                        "client_id": current_client_id.get() or client_id,
                         "tool": tool_name,
-                        "arg_keys": arg_keys,
+                        "duration_ms": duration_ms,
                     }
                 },
             )
-            try:
-                result = func(*args, **kwargs)
-                duration_ms = int((time.perf_counter() - start) * 1000)
-                logger.info(
-                    "tool_result",
-                    extra={
-                        "extra": {
-                            "event": "tool_result",
-                            "request_id": request_id,
-                            "client_id": client_id,
-                            "tool": tool_name,
-                            "result_type": type(result).__name__,
-                            "duration_ms": duration_ms,
-                        }
-                    },
-                )
-                return result
-            except Exception:
-                duration_ms = int((time.perf_counter() - start) * 1000)
-                logger.exception(
-                    "tool_error",
-                    extra={
-                        "extra": {
-                            "event": "tool_error",
-                            "request_id": request_id,
-                            "client_id": client_id,
-                            "tool": tool_name,
-                            "duration_ms": duration_ms,
-                        }
-                    },
-                )
-                raise
-
-        server.tool()(wrapped)
+
+        # Generator tools stream Progress to the client; the manifest says which, so lazy tools stay unimported
+        streaming = manifest[tool_name].get("streaming", False) if tool_name in manifest else is_streaming(func)
+        limit = config.tool_concurrency_limits.get(tool_name, config.tool_max_concurrency)
+        semaphore = asyncio.Semaphore(limit) if limit > 0 and executor is not None else None
+        offload = executor is not None or (config.hh_api_enabled and tool_name in HH_API_TOOLS)
+
+        if streaming:
+
+            @wraps(func)
+            async def wrapped(*args, **kwargs):
+                with start_span(span_name, attributes=span_attributes) as span:
+                    start = time.perf_counter()
+                    # Streamed results are never cached; the cache key is ignored
+                    request_id, _ = _log_call(args, kwargs)
+                    # Batch items share the batch's request; only batch_generate itself reports progress
+                    sink = ProgressSink(None if current_batch_id.get() else _request_context(), tool_name)
+                    target = func.resolve() if isinstance(func, LazyFunction) else func
+                    try:
+                        if semaphore is None:
+                            result = await run_streaming(target, args, kwargs, sink, executor, config.stream_poll_seconds)
+                        else:
+                            async with semaphore:
+                                result = await run_streaming(target, args, kwargs, sink, executor, config.stream_poll_seconds)
+                        _log_result(request_id, start, result, None, False)
+                        if span is not None:
+                            _annotate(span, request_id, None, False)
+                            span.set("progress_notifications", sink.sent)
+                        return result
+                    except ClientDisconnected:
+                        _log_cancelled(request_id, start, "client_disconnected")
+                        raise
+                    except asyncio.CancelledError:
+                        # The SSE transport's teardown can cancel the handler before a poll sees the disconnect
+                        _log_cancelled(request_id, start, "client_disconnected" if sink.disconnected else "cancelled")
+                        raise
+                    except Exception:
+                        _log_error(request_id, start)
+                        raise
+
+            wrapped.streaming = True
+            if not isinstance(func, LazyFunction):
+                # FastMCP reads the schema from the signature; a LazyFunction supplies this one itself
+                wrapped.__signature__ = result_signature(func)
+
+        elif not offload:
+
+            @wraps(func)
+            def wrapped(*args, **kwargs):
+                with start_span(span_name, attributes=span_attributes) as span:
+                    start = time.perf_counter()
+                    request_id, cache_key = _log_call(args, kwargs)
+                    try:
+                        result = result_cache.get(cache_key) if cache_key else None
+                        cache_hit = result is not None
+                        if not cache_hit:
+                            result = func(*args, **kwargs) if profiler is None else profiler.run(tool_name, func, args, kwargs)
+                            if cache_key and _cacheable_result(result):
+                                result_cache.put(cache_key, result, cache_ttl)
+                        _log_result(request_id, start, result, cache_key, cache_hit)
+                        if span is not None:
+                            _annotate(span, request_id, cache_key, cache_hit)
+                        return result
+                    except Exception:
+                        _log_error(request_id, start)
+                        raise
+
+        else:
+
+            async def _run_in_pool(args, kwargs):
+                # Copy the caller's context so contextvars survive the hop to the worker thread
+                if profiler is None:
+                    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+                else:
+                    # cProfile only sees the thread it is enabled on, so sampling happens in the worker
+                    call = functools.partial(contextvars.copy_context().run, profiler.run, tool_name, func, args, kwargs)
+                # Without TOOL_EXECUTION_MODE=async only HH_API_TOOLS get here; they use the loop's default executor
+                return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+            @wraps(func)
+            async def wrapped(*args, **kwargs):
+                with start_span(span_name, attributes=span_attributes) as span:
+                    start = time.perf_counter()
+                    request_id, cache_key = _log_call(args, kwargs)
+                    try:
+                        result = result_cache.get(cache_key) if cache_key else None
+                        cache_hit = result is not None
+                        if not cache_hit:
+                            if semaphore is None:
+                                result = await _run_in_pool(args, kwargs)
+                            else:
+                                async with semaphore:
+                                    result = await _run_in_pool(args, kwargs)
+                            if cache_key and _cacheable_result(result):
+                                result_cache.put(cache_key, result, cache_ttl)
+                        _log_result(request_id, start, result, cache_key, cache_hit)
+                        if span is not None:
+                            _annotate(span, request_id, cache_key, cache_hit)
+                        return result
+                    except Exception:
+                        _log_error(request_id, start)
+                        raise
+
+        _add_tool(wrapped)
+        registered[tool_name] = wrapped
 
     # Register tools with logging wrappers
-    _register_with_logging(market_research)
-    _register_with_logging(generate_job_post)
-    _register_with_logging(generate_application_form)
-    _register_with_logging(generate_quiz)
-    _register_with_logging(generate_homework)
-    _register_with_logging(generate_candidate_journey)
-    _register_with_logging(generate_funnel_report)
-
-    _register_with_logging(candidate_assistant)
-    _register_with_logging(resume_optimizer)
-    _register_with_logging(interview_prep)
-    _register_with_logging(salary_research)
-
-    _register_with_logging(get_request_analytics)
-    _register_with_logging(export_logs)
+    for func in tools.values():
+        _register_with_logging(func)
+
+    @_add_tool
+    def get_cache_stats() -> Dict[str, Any]:
+        """Hit/miss/eviction counters and per-tool TTLs of the tool result cache, plus the template render caches."""
+        stats = result_cache.stats()
+        ttls = {name: _cache_ttl(name) for name in sorted(CACHEABLE_TOOLS | set(config.tool_cache_ttls))}
+        stats["ttl_seconds"] = {name: ttl for name, ttl in ttls.items() if ttl > 0}
+        # Imported here so lazy startup does not load the template module (and sqlite3) early
+        from .content_templates import render_cache_info
+
+        stats["render_cache"] = render_cache_info()
+        return stats
+
+    @_add_tool
+    def get_tool_profiles(tool: Optional[str] = None, format: str = "summary", limit: int = 5) -> Dict[str, Any]:
+        """Slowest sampled tool-call profiles (needs PROFILE_SAMPLE_RATE).
+
+        Args:
+            tool: Only profiles of this tool.
+            format: "summary" (top functions per call) or "collapsed"
+                (flamegraph stack text, the selected calls merged).
+            limit: Number of profiles, slowest first.
+        """
+        if profiler is None:
+            return {"enabled": False, "message": "Profiling is off; set PROFILE_SAMPLE_RATE to sample 1 in N tool calls."}
+        if format == "collapsed":
+            return {"enabled": True, "format": "collapsed", "stacks": profiler.dump("collapsed", tool, limit)}
+        return {"enabled": True, **profiler.dump("summary", tool, limit)}
+
+    def _arg_metadata(name):
+        tool = server._tool_manager.get_tool(name)
+        # A tool listed from the manifest builds its argument model on first use
+        return (tool.resolve() if isinstance(tool, LazyTool) else tool).fn_metadata
+
+    batch_runner = BatchRunner(
+        registered,
+        max_items=config.batch_max_items,
+        max_concurrency=config.batch_max_concurrency,
+        client_id=client_id,
+        arg_metadata=_arg_metadata,
+    )
+    # Shared with the HTTP batch route in server_http_sse
+    server.batch_runner = batch_runner
+
+    async def batch_generate(items: List[Dict[str, Any]]) -> AsyncIterator[Union[Progress, Dict[str, Any]]]:
+        """Run many tool calls in one request, e.g. job posts for a dozen openings.
+
+        Args:
+            items: List of ``{"tool": <tool name>, "args": {...}}``. All items are
+                validated before any runs; a failing item is reported in its
+                result instead of failing the batch.
+        """
+        validated = batch_runner.validate(items)
+        results: List[Dict[str, Any]] = []
+        summary: Dict[str, Any] = {}
+        # Closing the stream (client gone, call cancelled) cancels the items still running
+        async with aclosing(batch_runner.stream(validated)) as records:
+            async for record in records:
+                if record["event"] == "item":
+                    results.append(record)
+                    # Each finished item reaches the client as a partial result right away
+                    yield Progress(len(results), len(validated), f"{record['tool']} #{record['index']}", partial=record)
+                else:
+                    summary = record
+        yield {**summary, "results": results}
+
+    # Registered after batch_runner copied the tool map, so batches cannot nest
+    _register_with_logging(batch_generate)
+
+    # Keyword router is compiled once per server; ROUTING_TABLE_PATH may extend it
+    router = KeywordRouter.from_file(config.routing_table_path)
+    if config.routing_engine == "semantic":
+        try:
+            from .semantic_routing import SemanticRouter
+        except ImportError:
+            # numpy is optional (the "analytics" extra); keyword routing still applies
+            logging.getLogger(__name__).warning(
+                "routing_engine_unavailable",
+                extra={"extra": {"event": "routing_engine_unavailable", "routing_engine": "semantic"}},
+            )
+        else:
+            # Persisted TF-IDF index, rebuilt only when the routes or their examples change
+            router = SemanticRouter.from_keyword_router(
+                router, config.data_dir / "routing_index.npz", config.routing_confidence
+            )
+    route_targets = {
+        name: tools[name]
+        for name in (
+            "market_research",
+            "generate_job_post",
+            "generate_application_form",
+            "generate_quiz",
+            "generate_homework",
+            "generate_candidate_journey",
+            "generate_funnel_report",
+            "candidate_assistant",
+            "resume_optimizer",
+            "interview_prep",
+            "salary_research",
+        )
+    }
+    unknown_routes = router.route_names - set(route_targets)
+    if unknown_routes:
+        raise ValueError(f"Routing table references unknown tools: {sorted(unknown_routes)}")
+
+    @functools.lru_cache(maxsize=None)
+    def _takes_description(name: str) -> bool:
+        # Checked per route on first use; inspecting a lazy tool imports its module
+        return "task_description" in inspect.signature(route_targets[name]).parameters
 
     # Tool inventory
-    @server.tool()
+    @_add_tool
     def get_available_tools(user_type: Optional[str] = None) -> Dict[str, Any]:
         recruiter_tools = [
             "market_research",
@@ -129,6 +477,8 @@ def build_server() -> FastMCP:
             "generate_homework",
             "generate_candidate_journey",
             "generate_funnel_report",
+            "role_skill_profile",
+            "shortlist_resumes",
         ]
         candidate_tools = [
             "candidate_assistant",
@@ -136,19 +486,20 @@ def build_server() -> FastMCP:
             "interview_prep",
             "salary_research",
         ]
-        analytics_tools = ["get_request_analytics", "export_logs"]
+        analytics_tools = ["get_request_analytics", "export_logs", "get_cache_stats", "get_tool_profiles"]
         full = {
             "recruiter": recruiter_tools,
             "candidate": candidate_tools,
             "analytics": analytics_tools,
+            "batch": ["batch_generate"],
         }
         if user_type and user_type.lower() in ("recruiter", "candidate"):
             return {user_type.lower(): full[user_type.lower()]}
         return full
 
     # Routing tool
-    @server.tool()
-    def route_hiring_task(user_type: str, task_description: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    @_add_tool
+    async def route_hiring_task(user_type: str, task_description: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Route a hiring task to appropriate tool based on decision tree.
 
         Args:
@@ -157,80 +508,134 @@ def build_server() -> FastMCP:
             context: Optional structured context.
         """
         # Privacy-preserving logging for routing: no raw text recorded
-        normalized = (task_description or "").lower()
         user_id = (context or {}).get("user_id") if isinstance(context, dict) else None
         user_hash = hashlib.sha256(str(user_id).encode("utf-8")).hexdigest() if user_id is not None else None
-        routed_to = None
-
-        if user_type.lower() == "recruiter":
-            if any(k in normalized for k in ["market research", "salary", "hh.ru", "research"]):
-                routed_to = "market_research"
-                result = market_research(**(context or {}))
-            elif any(k in normalized for k in ["job post", "vacancy", "description"]):
-                routed_to = "generate_job_post"
-                result = generate_job_post(**(context or {}))
-            elif any(k in normalized for k in ["application form", "apply form", "form"]):
-                routed_to = "generate_application_form"
-                result = generate_application_form(**(context or {}))
-            elif any(k in normalized for k in ["quiz", "assessment", "test"]):
-                routed_to = "generate_quiz"
-                result = generate_quiz(**(context or {}))
-            elif any(k in normalized for k in ["homework", "take-home", "assignment"]):
-                routed_to = "generate_homework"
-                result = generate_homework(**(context or {}))
-            elif any(k in normalized for k in ["candidate journey", "process", "pipeline"]):
-                routed_to = "generate_candidate_journey"
-                result = generate_candidate_journey(**(context or {}))
-            elif any(k in normalized for k in ["funnel", "report", "analytics"]):
-                routed_to = "generate_funnel_report"
-                result = generate_funnel_report(**(context or {}))
-            else:
-                logging.getLogger(__name__).info(
-                    "route_hiring_task",
-                    extra={
-                        "extra": {
-                            "event": "route_hiring_task",
-                            "user_type": user_type,
-                            "user_hash": user_hash,
-                            "description_length": len(task_description or ""),
-                            "context_keys": list((context or {}).keys()),
-                            "routed_to": None,
-                        }
-                    },
-                )
-                return {"status": "unrouted", "message": "No matching route found; please refine the task description."}
-        else:
-            if any(k in normalized for k in ["resume", "cv", "ats"]):
-                routed_to = "resume_optimizer"
-                result = resume_optimizer(**(context or {}))
-            elif any(k in normalized for k in ["interview", "prep", "questions"]):
-                routed_to = "interview_prep"
-                result = interview_prep(**(context or {}))
-            elif any(k in normalized for k in ["salary", "market", "range"]):
-                routed_to = "salary_research"
-                result = salary_research(**(context or {}))
-            else:
-                routed_to = "candidate_assistant"
-                result = candidate_assistant(task_description=task_description, **(context or {}))
-
-        logging.getLogger(__name__).info(
-            "route_hiring_task",
-            extra={
-                "extra": {
-                    "event": "route_hiring_task",
-                    "user_type": user_type,
-                    "user_hash": user_hash,
-                    "description_length": len(task_description or ""),
-                    "context_keys": list((context or {}).keys()),
-                    "routed_to": routed_to,
-                }
-            },
-        )
+        with start_span("route", attributes={"user_type": user_type}) as span:
+            match = router.match(user_type, task_description or "")
+            if span is not None:
+                span.set("routed_to", match.route)
+                span.set("route_engine", match.engine)
+                span.set("route_score", float(match.score))
+        routed_to = match.route
+
+        record = {
+            "event": "route_hiring_task",
+            "user_type": user_type,
+            "user_hash": user_hash,
+            "description_length": len(task_description or ""),
+            "context_keys": list((context or {}).keys()),
+            "routed_to": routed_to,
+            "matched_keywords": list(match.matched_keywords),
+            "route_score": match.score,
+            "route_engine": match.engine,
+        }
+        trace_id = current_trace_id()
+        if trace_id:
+            record["trace_id"] = trace_id
+        logging.getLogger(__name__).info("route_hiring_task", extra={"extra": record})
+
+        if routed_to is None:
+            return {"status": "unrouted", "message": "No matching route found; please refine the task description."}
+        kwargs = dict(context or {})
+        if _takes_description(routed_to):
+            kwargs.setdefault("task_description", task_description)
+        # Through the logging wrapper, so the routed call gets its own request_id, tool_call/tool_result
+        # records, cache lookup and span; in async execution mode the wrapper is a coroutine
+        result = registered[routed_to](**kwargs)
+        if inspect.isawaitable(result):
+            result = await result
         return result
 
+    # Opt-in: per-client token buckets and/or a global in-flight cap; None leaves calls unmetered
+    admission = (
+        AdmissionController(
+            metrics,
+            rate=config.client_rate_per_second,
+            burst=config.client_burst,
+            client_rates=config.client_rate_limits,
+            max_in_flight=config.max_in_flight_calls,
+            queue_size=config.admission_queue_size,
+            client_queue=config.admission_client_queue,
+            queue_timeout=config.admission_queue_timeout_seconds,
+        )
+        if config.client_rate_per_second > 0 or config.client_rate_limits or config.max_in_flight_calls > 0
+        else None
+    )
+    # Shared with the HTTP batch route in server_http_sse
+    server.admission = admission
+    _admit_tool_requests(server, admission, client_id)
+    if span_processor is not None:
+        _trace_tool_requests(server)
     return server
 
 
+def _client_id(server: FastMCP, default: Optional[str]) -> str:
+    """The caller of the current request: X-Client-Id header, then LOG_CLIENT_ID, then the MCP clientInfo name."""
+    try:
+        context = server._mcp_server.request_context
+    except LookupError:
+        return default or "anonymous"
+    # The HTTP request that carried the message (SSE transport); None over stdio
+    headers = getattr(context.request, "headers", None)
+    header = headers.get("x-client-id") if headers is not None else None
+    if header:
+        return header.strip()[:64]
+    if default:
+        return default
+    params = context.session.client_params
+    return params.clientInfo.name if params is not None else "anonymous"
+
+
+def _admit_tool_requests(server: FastMCP, admission: Optional[AdmissionController], default_client_id: Optional[str]) -> None:
+    """Tag every ``tools/call`` with its client id and, with admission control on, admit or shed it before it runs.
+
+    A shed call gets a JSON-RPC error (code ADMISSION_ERROR_CODE) whose data
+    carries ``status: 429``, the reason and ``retry_after`` seconds. Admission
+    happens once per request, so batch items and routed calls are not metered
+    again; a batch_generate call costs one token per item.
+    """
+    handler = server._mcp_server.request_handlers[types.CallToolRequest]
+    logger = logging.getLogger(__name__)
+
+    async def admitted(request: types.CallToolRequest) -> types.ServerResult:
+        client = _client_id(server, default_client_id)
+        # Each request runs in its own task, so this does not leak into other requests
+        current_client_id.set(client)
+        if admission is None:
+            return await handler(request)
+        items = (request.params.arguments or {}).get("items") if request.params.name == "batch_generate" else None
+        try:
+            admitted_at = await admission.acquire(client, len(items) if isinstance(items, list) else 1)
+        except AdmissionRejected as exc:
+            logger.info(
+                "admission_rejected",
+                extra={"extra": {"event": "admission_rejected", "tool": request.params.name, **exc.as_dict()}},
+            )
+            raise McpError(types.ErrorData(code=ADMISSION_ERROR_CODE, message=str(exc), data=exc.as_dict())) from None
+        try:
+            return await handler(request)
+        finally:
+            admission.release(admitted_at)
+
+    server._mcp_server.request_handlers[types.CallToolRequest] = admitted
+
+
+def _trace_tool_requests(server: FastMCP) -> None:
+    """Root every ``tools/call`` request in a server span; tool, routing, log and HTTP spans nest under it."""
+    handler = server._mcp_server.request_handlers[types.CallToolRequest]
+
+    async def traced(request: types.CallToolRequest) -> types.ServerResult:
+        name = request.params.name
+        attributes = {"rpc.system": "jsonrpc", "rpc.method": "tools/call", "mcp.tool.name": name}
+        with start_span(f"tools/call {name}", kind=KIND_SERVER, attributes=attributes) as span:
+            result = await handler(request)
+            if getattr(result.root, "isError", False):
+                span.status = STATUS_ERROR
+            return result
+
+    server._mcp_server.request_handlers[types.CallToolRequest] = traced
+
+
 def run() -> None:
     server = build_server()
     server.run()
@@ -1,16 +1,41 @@
 from __future__ import annotations
 
+import hmac
+import json
+import logging
+import math
 import os
+from datetime import datetime, timezone
 from typing import Any
 
+import anyio
+from starlette.background import BackgroundTask
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
-
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from .admission import AdmissionRejected, current_client_id
+from .batch import BatchValidationError
+from .config import load_config
+from .forms import FormDrainMiddleware, FormIngestor, parse_submissions
+from .log_export import ExportFilter, export_stream
+from .metrics import CONTENT_TYPE, MetricsMiddleware
+from .pipeline import record_stage_events
 from .server import build_server
+from .session_broker import SessionRoutingMiddleware, build_broker
+from .utils import verify_signature
 
 
 # Build the FastMCP server with all registered tools
 _server = build_server()
+_config = load_config()
+_forms = FormIngestor(
+    _server.metrics,
+    webhook_url=_config.n8n_webhook_url,
+    queue_size=_config.forms_queue_size,
+    batch_size=_config.forms_batch_size,
+    flush_seconds=_config.forms_flush_seconds,
+    notify_batch_size=_config.forms_notify_batch_size,
+)
 
 # Configure SSE endpoints under /mcp with explicit paths to match expectations
 _server.settings.sse_path = "/mcp/sse"
@@ -28,10 +53,187 @@ async def root(_: Request) -> Response:
     return JSONResponse({"service": "hiring-router-mcp", "status": "ok"})
 
 
+@_server.custom_route("/metrics", methods=["GET"])
+async def metrics(_: Request) -> Response:
+    return Response(_server.metrics.render(), media_type=CONTENT_TYPE)
+
+
+# Bulk generation without one MCP round-trip per item: POST {"items": [{"tool", "args"}, ...]}
+# and read back NDJSON, one line per item as it completes, then a batch_done summary line.
+# With admission control on, a shed batch gets 429 with Retry-After; X-Client-Id names the caller.
+@_server.custom_route("/mcp/batch", methods=["POST"])
+async def batch(request: Request) -> Response:
+    try:
+        payload = await request.json()
+    except ValueError:
+        return JSONResponse({"error": "body must be JSON"}, status_code=400)
+    items = payload.get("items") if isinstance(payload, dict) else payload
+    try:
+        validated = _server.batch_runner.validate(items)
+    except BatchValidationError as exc:
+        return JSONResponse({"error": str(exc), "items": exc.errors}, status_code=400)
+    client = (request.headers.get("x-client-id") or "").strip()[:64] or _config.log_client_id or "anonymous"
+    current_client_id.set(client)
+    admission = _server.admission
+    if admission is None:
+        release = None
+    else:
+        try:
+            admitted_at = await admission.acquire(client, len(validated))
+        except AdmissionRejected as exc:
+            return JSONResponse(
+                {"error": str(exc), **exc.as_dict()},
+                status_code=429,
+                headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+            )
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                admission.release(admitted_at)
+
+    async def lines():
+        try:
+            async for record in _server.batch_runner.stream(validated):
+                yield json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        finally:
+            if release is not None:
+                release()
+
+    # Whichever runs first releases the slot: the stream's finally, or the background task when the
+    # client disconnects before the stream starts
+    return StreamingResponse(
+        lines(), media_type="application/x-ndjson", background=BackgroundTask(release) if release is not None else None
+    )
+
+
+# Candidate stage transitions from application-form / ATS webhooks:
+# POST {"events": [{"candidate_id" | "email", "position", "stage", "timestamp", "source", "event_id"}, ...]}
+# (or a single event object). Signed with X-Signature when PIPELINE_WEBHOOK_SECRET is set.
+@_server.custom_route("/pipeline/events", methods=["POST"])
+async def pipeline_events(request: Request) -> Response:
+    body = await request.body()
+    if _config.pipeline_webhook_secret and not verify_signature(
+        _config.pipeline_webhook_secret, body, request.headers.get("x-signature")
+    ):
+        return JSONResponse({"error": "invalid signature"}, status_code=401)
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return JSONResponse({"error": "body must be JSON"}, status_code=400)
+    if isinstance(payload, dict):
+        payload = payload["events"] if "events" in payload else [payload]
+    if not isinstance(payload, list):
+        return JSONResponse({"error": "expected an event object or {\"events\": [...]}"}, status_code=400)
+    # SQLite writes stay off the event loop
+    result = await anyio.to_thread.run_sync(record_stage_events, payload)
+    logging.getLogger(__name__).info(
+        "pipeline_events",
+        extra={"extra": {"event": "pipeline_events", **{k: v for k, v in result.items() if k != "errors"}, "invalid": len(result["errors"])}},
+    )
+    return JSONResponse(result, status_code=200 if not result["errors"] else 207)
+
+
+# Application form submissions (see generate_application_form): one JSON object, a JSON list,
+# or NDJSON (Content-Type: application/x-ndjson) for bulk. Answers 202 once queued for storage
+# (the queue is drained on shutdown); 503 with Retry-After when the queue cannot take the whole request.
+@_server.custom_route("/forms/submit", methods=["POST"])
+async def forms_submit(request: Request) -> Response:
+    body = await request.body()
+    try:
+        if "ndjson" in request.headers.get("content-type", ""):
+            records = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            records = json.loads(body)
+    except ValueError:
+        return JSONResponse({"error": "body must be JSON or NDJSON"}, status_code=400)
+    if isinstance(records, dict):
+        records = [records]
+    if not isinstance(records, list):
+        return JSONResponse({"error": "expected a submission object, a list or NDJSON"}, status_code=400)
+    submissions, errors = parse_submissions(records)
+    if not _forms.offer(submissions, rejected=len(errors)):
+        return JSONResponse({"error": "submission queue is full, retry shortly"}, status_code=503, headers={"Retry-After": "1"})
+    return JSONResponse(
+        {"received": len(records), "accepted": len(submissions), "errors": errors}, status_code=202 if not errors else 207
+    )
+
+
+# Bulk log export: GET /logs/export?time_range=last_7_days&event=tool_result&tool=...&format=ndjson|arrow
+# &compression=gzip|zstd|none, streamed as the files are read. Needs Authorization: Bearer $LOG_EXPORT_TOKEN.
+@_server.custom_route("/logs/export", methods=["GET"])
+async def logs_export(request: Request) -> Response:
+    token = _config.log_export_token
+    if not token:
+        return JSONResponse({"error": "log export is disabled; set LOG_EXPORT_TOKEN"}, status_code=403)
+    if not hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {token}"):
+        return JSONResponse({"error": "invalid token"}, status_code=401)
+    params = request.query_params
+    try:
+        flt = ExportFilter.from_args(params.get("time_range"), params.get("start"), params.get("end"), params.get("event"), params.get("tool"))
+        chunks, media_type, suffix = export_stream(
+            _config.log_dir, flt, params.get("format", "ndjson"), params.get("compression"), segments=_config.log_format != "jsonl"
+        )
+    except ValueError as exc:
+        return JSONResponse({"error": str(exc)}, status_code=400)
+    except ImportError as exc:
+        return JSONResponse({"error": str(exc)}, status_code=501)
+    filename = "requests-" + datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + suffix
+    # A sync iterator: Starlette reads it in a worker thread, so file I/O and compression stay off the loop
+    return StreamingResponse(chunks, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+# Sampled tool-call profiles (PROFILE_SAMPLE_RATE): GET /debug/profiles?format=collapsed|pstats|summary
+# &tool=...&limit=N. collapsed is flamegraph.pl/speedscope input; pstats loads with pstats.Stats(<file>).
+# Needs Authorization: Bearer $PROFILE_TOKEN.
+@_server.custom_route("/debug/profiles", methods=["GET"])
+async def debug_profiles(request: Request) -> Response:
+    token = _config.profile_token
+    if not token:
+        return JSONResponse({"error": "profile dumps are disabled; set PROFILE_TOKEN"}, status_code=403)
+    if not hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {token}"):
+        return JSONResponse({"error": "invalid token"}, status_code=401)
+    if _server.profiler is None:
+        return JSONResponse({"error": "profiling is off; set PROFILE_SAMPLE_RATE"}, status_code=404)
+    params = request.query_params
+    fmt = params.get("format", "collapsed")
+    try:
+        limit = int(params["limit"]) if "limit" in params else None
+        dumped = _server.profiler.dump(fmt, params.get("tool"), limit)
+    except ValueError as exc:
+        return JSONResponse({"error": str(exc)}, status_code=400)
+    if fmt == "summary":
+        return JSONResponse(dumped)
+    if fmt == "pstats":
+        return Response(dumped, media_type="application/octet-stream", headers={"Content-Disposition": 'attachment; filename="tools.pstats"'})
+    return Response(dumped, media_type="text/plain; charset=utf-8")
+
+
 # Expose the ASGI app. This serves:
 # - GET  /mcp/sse       (SSE stream)
 # - POST /mcp/message   (client→server JSON-RPC over HTTP)
+# - POST /mcp/batch     (bulk tool calls, NDJSON results)
+# - GET  /metrics       (Prometheus text format)
+# - POST /pipeline/events (candidate stage transitions)
+# - POST /forms/submit  (application form submissions)
+# - GET  /logs/export   (streamed log export)
+# - GET  /debug/profiles (sampled tool-call profiles)
 app = _server.sse_app()
+app.add_middleware(MetricsMiddleware, registry=_server.metrics, sse_path=_server.settings.sse_path)
+# With several uvicorn workers (WEB_CONCURRENCY / SESSION_BROKER=unix) a message may reach a
+# worker other than the one holding its SSE stream; the broker hands it to the owner
+app.add_middleware(
+    SessionRoutingMiddleware,
+    broker=build_broker(_config.session_broker, _config.session_broker_dir),
+    registry=_server.metrics,
+    sse_path=_server.settings.sse_path,
+    message_path=_server.settings.message_path,
+    max_body_bytes=_server.settings.max_request_body_size,
+)
+# Accepted /forms/submit submissions still queued at shutdown (scale-down, redeploy) are stored first
+app.add_middleware(FormDrainMiddleware, ingestor=_forms, timeout_seconds=_config.forms_drain_seconds)
 
 
 if __name__ == "__main__":
@@ -43,6 +245,11 @@ if __name__ == "__main__":
     except ValueError:
         port = 8080
 
-    uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
+    workers = int(os.getenv("WEB_CONCURRENCY") or "1")
+    if workers > 1:
+        # Multiple workers need the import string; each one builds its own app
+        uvicorn.run("hiring_router_mcp.server_http_sse:app", host="0.0.0.0", port=port, log_level="info", workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
 
 
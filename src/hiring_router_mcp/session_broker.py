@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+import struct
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs
+
+from .metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+SESSION_BROKERS = ("local", "unix")
+
+# One forwarded request or reply: header JSON length, body length, then both
+_FRAME = struct.Struct("<II")
+# FastMCP's SSE transport announces the session as "...?session_id=<uuid hex>" in its endpoint event
+_SESSION_ID = re.compile(rb"session_id=([0-9a-f]{32})")
+# Remote owners remembered per worker; sessions are long-lived, so this rarely turns over
+_OWNER_CACHE_SIZE = 10000
+
+# (status, headers, body) of a response produced for a forwarded request
+Reply = Tuple[int, List[Tuple[str, str]], bytes]
+Deliver = Callable[[Dict[str, Any], bytes], Awaitable[Reply]]
+
+
+class SessionBroker:
+    """Tracks which worker owns each SSE session and hands messages to it.
+
+    This in-process default treats every session as local: with one worker,
+    the transport's own session table is all the routing needed.
+    """
+
+    async def start(self, deliver: Deliver) -> None:
+        """Start accepting forwarded messages; ``deliver`` runs one through the local app."""
+
+    def is_local(self, session_id: str) -> bool:
+        return True
+
+    async def register(self, session_id: str) -> None:
+        pass
+
+    async def unregister(self, session_id: str) -> None:
+        pass
+
+    async def forward(self, session_id: str, request: Dict[str, Any], body: bytes) -> Optional[Reply]:
+        """Reply from the owning worker, or None when no live worker owns the session."""
+        return None
+
+    async def close(self) -> None:
+        pass
+
+
+class UnixSocketSessionBroker(SessionBroker):
+    """Cross-process broker for ``uvicorn --workers N`` inside one container.
+
+    Every worker listens on its own Unix socket in ``directory`` and records the
+    sessions it owns as ``sessions/<id>`` files naming that socket. A message
+    POSTed to another worker is read there, sent over the owner's socket and
+    replayed through the owner's ASGI app, so the SSE transport sees it exactly
+    as if it had arrived directly. Connections between workers are pooled.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.socket_path = directory / f"worker-{os.getpid()}.sock"
+        self._sessions_dir = directory / "sessions"
+        self._local: Set[str] = set()
+        self._owners: Dict[str, str] = {}
+        self._idle: Dict[str, List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        self._sessions_dir.mkdir(parents=True, exist_ok=True)
+        # A leftover socket from an earlier process with the same pid
+        self.socket_path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._serve, path=str(self.socket_path))
+
+    def is_local(self, session_id: str) -> bool:
+        return session_id in self._local
+
+    async def register(self, session_id: str) -> None:
+        self._local.add(session_id)
+        path = self._sessions_dir / session_id
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(str(self.socket_path), encoding="utf-8")
+        tmp.replace(path)
+
+    async def unregister(self, session_id: str) -> None:
+        self._local.discard(session_id)
+        (self._sessions_dir / session_id).unlink(missing_ok=True)
+
+    async def forward(self, session_id: str, request: Dict[str, Any], body: bytes) -> Optional[Reply]:
+        owner = self._owner(session_id)
+        if owner is None or owner == str(self.socket_path):
+            return None
+        payload = _encode(request, body)
+        # A pooled connection may have been closed by the peer; retry once on a fresh one
+        for pooled in (True, False):
+            conn = self._take(owner) if pooled else None
+            if pooled and conn is None:
+                continue
+            try:
+                if conn is None:
+                    conn = await asyncio.open_unix_connection(owner)
+                reader, writer = conn
+                writer.write(payload)
+                await writer.drain()
+                header, reply_body = await _read_frame(reader)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                if conn is not None:
+                    conn[1].close()
+                continue
+            self._idle.setdefault(owner, []).append(conn)
+            return header["status"], [tuple(h) for h in header["headers"]], reply_body
+        # The owner is gone (worker restarted or crashed): forget the session
+        logger.warning("session_owner_unreachable", extra={"extra": {"event": "session_owner_unreachable", "owner": owner}})
+        self._owners.pop(session_id, None)
+        (self._sessions_dir / session_id).unlink(missing_ok=True)
+        return None
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for conns in self._idle.values():
+            for _, writer in conns:
+                writer.close()
+        self._idle.clear()
+        for session_id in list(self._local):
+            await self.unregister(session_id)
+        self.socket_path.unlink(missing_ok=True)
+
+    def _owner(self, session_id: str) -> Optional[str]:
+        owner = self._owners.get(session_id)
+        if owner is None:
+            try:
+                owner = (self._sessions_dir / session_id).read_text(encoding="utf-8").strip()
+            except (FileNotFoundError, ValueError):
+                return None
+            if not owner:
+                return None
+            if len(self._owners) >= _OWNER_CACHE_SIZE:
+                del self._owners[next(iter(self._owners))]
+            self._owners[session_id] = owner
+        return owner
+
+    def _take(self, owner: str) -> Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]:
+        conns = self._idle.get(owner)
+        return conns.pop() if conns else None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request, body = await _read_frame(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                assert self._deliver is not None
+                status, headers, reply_body = await self._deliver(request, body)
+                writer.write(_encode({"status": status, "headers": headers}, reply_body))
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def _encode(header: Dict[str, Any], body: bytes) -> bytes:
+    raw = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return _FRAME.pack(len(raw), len(body)) + raw + body
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Tuple[Dict[str, Any], bytes]:
+    header_length, body_length = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    header = json.loads(await reader.readexactly(header_length))
+    return header, await reader.readexactly(body_length)
+
+
+def build_broker(kind: str, directory: Path) -> SessionBroker:
+    if kind == "unix":
+        return UnixSocketSessionBroker(directory)
+    if kind != "local":
+        raise ValueError(f"Unsupported SESSION_BROKER {kind!r}; use one of {', '.join(SESSION_BROKERS)}")
+    return SessionBroker()
+
+
+class SessionRoutingMiddleware:
+    """ASGI middleware routing ``POST message_path`` to the worker that owns the SSE session.
+
+    SSE responses are watched for the transport's endpoint event so the new
+    session is registered with the broker before the client learns its id,
+    and unregistered when the stream ends. A message for a session this worker
+    does not own is forwarded; everything else passes straight through.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        broker: SessionBroker,
+        registry: MetricsRegistry,
+        sse_path: str,
+        message_path: str,
+        max_body_bytes: int,
+    ) -> None:
+        self.app = app
+        self.broker = broker
+        self.sse_path = sse_path
+        # FastMCP mounts the message endpoint, so clients post to it with a trailing slash
+        self.message_path = message_path.rstrip("/")
+        self.max_body_bytes = max_body_bytes
+        self._started: Optional[asyncio.Future] = None
+        self._pending: Set[asyncio.Task] = set()
+        forwarded = registry.counter("session_messages_forwarded_total", "Messages handed to the worker owning their SSE session", ("result",))
+        self._forwarded = forwarded.labels("ok")
+        self._unroutable = forwarded.labels("unroutable")
+        self._received = registry.counter("session_messages_received_total", "Messages forwarded here by another worker").labels()
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "lifespan":
+            await self.app(scope, self._on_shutdown(receive), send)
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self._started is None:
+            self._started = asyncio.ensure_future(self.broker.start(self._deliver))
+        await self._started
+        if scope["path"] == self.sse_path:
+            await self._stream(scope, receive, send)
+        elif scope["path"].rstrip("/") == self.message_path and scope["method"] == "POST":
+            await self._message(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    def _on_shutdown(self, receive: Any) -> Callable[[], Awaitable[Dict[str, Any]]]:
+        async def wrapped() -> Dict[str, Any]:
+            message = await receive()
+            if message["type"] == "lifespan.shutdown":
+                # Drop this worker's socket and session entries so peers stop forwarding here
+                await self.broker.close()
+            return message
+
+        return wrapped
+
+    async def _stream(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        session_id: Optional[str] = None
+
+        async def watch(message: Dict[str, Any]) -> None:
+            nonlocal session_id
+            if session_id is None and message["type"] == "http.response.body":
+                match = _SESSION_ID.search(message.get("body", b""))
+                if match:
+                    session_id = match.group(1).decode("ascii")
+                    await self.broker.register(session_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, watch)
+        finally:
+            if session_id is not None:
+                await self.broker.unregister(session_id)
+
+    async def _message(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        session_id = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("session_id", [""])[0]
+        if not session_id or self.broker.is_local(session_id):
+            await self.app(scope, receive, send)
+            return
+        chunks: List[bytes] = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if size > self.max_body_bytes:
+                await _respond(send, 413, [("content-type", "text/plain")], b"Request body too large")
+                return
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        request = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope.get("query_string", b"").decode("latin-1"),
+            "headers": [[k.decode("latin-1"), v.decode("latin-1")] for k, v in scope.get("headers", [])],
+            "client": list(scope["client"]) if scope.get("client") else None,
+        }
+        reply = await self.broker.forward(session_id, request, body)
+        if reply is None:
+            # No other worker owns it: let the local transport answer (404 for unknown sessions)
+            self._unroutable.inc()
+            await self.app(scope, _replay(body), send)
+            return
+        self._forwarded.inc()
+        await _respond(send, *reply)
+
+    async def _deliver(self, request: Dict[str, Any], body: bytes) -> Reply:
+        """Run a forwarded message through the local app; reply once the response is complete.
+
+        The transport answers 202 before handing the message to the session, which
+        can take a while, so the app call itself is left to finish in the background.
+        """
+        self._received.inc()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": request.get("method", "POST"),
+            "scheme": "http",
+            "path": request["path"],
+            "raw_path": request["path"].encode("latin-1"),
+            "root_path": "",
+            "query_string": request["query"].encode("latin-1"),
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in request["headers"]],
+            "client": tuple(request["client"]) if request.get("client") else None,
+            "server": None,
+        }
+        status = 500
+        headers: List[Tuple[str, str]] = []
+        chunks: List[bytes] = []
+        complete = asyncio.get_running_loop().create_future()
+
+        async def capture(message: Dict[str, Any]) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False) and not complete.done():
+                    complete.set_result(None)
+
+        task = asyncio.ensure_future(self.app(scope, _replay(body), capture))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        await asyncio.wait({task, complete}, return_when=asyncio.FIRST_COMPLETED)
+        if not complete.done() and task.done() and task.exception() is not None:
+            return 500, [("content-type", "text/plain")], b"Internal Server Error"
+        return status, headers, b"".join(chunks)
+
+
+def _replay(body: bytes) -> Callable[[], Awaitable[Dict[str, Any]]]:
+    """An ASGI ``receive`` that yields ``body`` once, then waits like an idle client."""
+    sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+async def _respond(send: Any, status: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+    raw_headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers if k.lower() != "content-length"]
+    raw_headers.append((b"content-length", str(len(body)).encode("ascii")))
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, Optional
+
+
+class LatencySketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch-style).
+
+    Values are counted in logarithmic buckets of width ``gamma``, so any
+    quantile is returned within ``relative_accuracy`` of the true value, memory
+    grows with the log of the value range rather than with the number of
+    samples, and two sketches merge by adding bucket counts.
+    """
+
+    __slots__ = ("relative_accuracy", "_gamma", "_log_gamma", "_bins", "zero_count", "count", "total", "max", "min")
+
+    # Values at or below this are counted as zero (durations are whole milliseconds)
+    MIN_VALUE = 1e-3
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.max: Optional[float] = None
+        self.min: Optional[float] = None
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value <= self.MIN_VALUE:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self._bins[index] = self._bins.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "LatencySketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other._bins.items():
+            self._bins[index] = self._bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self._bins):
+            seen += self._bins[index]
+            if rank < seen:
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(value, self.max) if self.max is not None else value
+        return self.max
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def summary(self, digits: int = 1) -> Dict[str, Optional[float]]:
+        def _round(value: Optional[float]) -> Optional[float]:
+            return round(value, digits) if value is not None else None
+
+        return {
+            "count": self.count,
+            "p50": _round(self.quantile(0.50)),
+            "p95": _round(self.quantile(0.95)),
+            "p99": _round(self.quantile(0.99)),
+            "mean": _round(self.mean()),
+            "max": _round(self.max),
+        }
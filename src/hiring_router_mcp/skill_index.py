@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .config import load_config
+
+_TAG = re.compile(r"<[^>]+>")
+# Keeps tech tokens such as c++, c#, node.js, 1c intact
+_TOKEN = re.compile(r"[a-zа-я0-9][a-zа-я0-9+#.\-]*[a-zа-я0-9+#]|[a-zа-я0-9]")
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be by for from has have in is it of on or our the to we with you your will
+    experience years year knowledge skills skill work working team good strong understanding ability
+    required requirements plus etc using use
+    и в во на с со по для от до из к у о об а но или не что как мы вы наш ваш это быть будет
+    опыт лет года год знание знания навыки навык работа работы умение понимание требования плюсом
+    """.split()
+)
+
+SENIORITY = frozenset(
+    "senior junior middle lead principal staff head chief intern trainee jr sr "
+    "старший младший ведущий главный стажер стажёр руководитель".split()
+)
+
+_RU_SUFFIXES = tuple(
+    sorted(
+        "ами ями ого его ому ему ыми ими ых их ой ей ий ый ая яя ое ее ые ие ов ев ам ям ах ях ом ем ую юю а я ы и у ю е о ь".split(),
+        key=len,
+        reverse=True,
+    )
+)
+_EN_SUFFIXES = ("ing", "ies", "es", "ed", "s")
+
+
+@lru_cache(maxsize=65536)
+def _stem(token: str) -> str:
+    """Light suffix stripping so inflected forms share a term (not a full stemmer)."""
+    if len(token) <= 4 or not token.isalpha():
+        return token
+    if "а" <= token[0] <= "я":
+        for suffix in _RU_SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+                return token[: -len(suffix)]
+        return token
+    for suffix in _EN_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+            return token[: -len(suffix)] + ("y" if suffix == "ies" else "")
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, stemmed unigrams plus bigrams of adjacent non-stopwords (RU and EN)."""
+    text = _TAG.sub(" ", text or "").lower().replace("ё", "е")
+    tokens = [_stem(t) for t in _TOKEN.findall(text)]
+    terms: List[str] = []
+    previous: Optional[str] = None
+    for token in tokens:
+        if token in STOPWORDS or token.isdigit():
+            previous = None
+            continue
+        terms.append(token)
+        if previous is not None:
+            terms.append(previous + " " + token)
+        previous = token
+    return terms
+
+
+def normalize_role(role: str) -> str:
+    """Role key without seniority words: "Senior Python Developer" -> "python developer"."""
+    words = _TOKEN.findall(_TAG.sub(" ", role or "").lower().replace("ё", "е"))
+    return " ".join(w for w in words if w not in SENIORITY) or "unknown"
+
+
+class SkillIndex:
+    """Per-role document frequencies of skill terms, persisted in SQLite.
+
+    Each document (job post or vacancy) contributes every distinct term once to
+    its role. Batches are aggregated in memory and written with one upsert per
+    distinct (role, term) pair, so ingest is incremental and cheap; documents
+    with a key already seen are skipped. ``role_terms`` is clustered on
+    ``(role_id, term_id)`` with a covering ``(role_id, df)`` index, so a top-k
+    query reads k index entries regardless of corpus size.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS roles (id INTEGER PRIMARY KEY, role TEXT UNIQUE NOT NULL, docs INTEGER NOT NULL DEFAULT 0);
+            CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, term TEXT UNIQUE NOT NULL);
+            CREATE TABLE IF NOT EXISTS role_terms (
+                role_id INTEGER NOT NULL, term_id INTEGER NOT NULL, df INTEGER NOT NULL,
+                PRIMARY KEY (role_id, term_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS role_terms_by_df ON role_terms (role_id, df DESC, term_id);
+            CREATE TABLE IF NOT EXISTS documents (doc_key TEXT PRIMARY KEY, role_id INTEGER NOT NULL) WITHOUT ROWID;
+            """
+        )
+        self._term_ids: Dict[str, int] = dict(self._conn.execute("SELECT term, id FROM terms"))
+        self._role_ids: Dict[str, int] = dict(self._conn.execute("SELECT role, id FROM roles"))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _ids(self, table: str, column: str, cache: Dict[str, int], values: Iterable[str]) -> Dict[str, int]:
+        """Ids of ``values``, inserting the uncached ones in the open transaction; the caller caches them after commit."""
+        ids: Dict[str, int] = {}
+        missing: List[Tuple[str]] = []
+        for value in set(values):
+            if value in cache:
+                ids[value] = cache[value]
+            else:
+                missing.append((value,))
+        if missing:
+            self._conn.executemany(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", missing)
+            ids.update(
+                self._conn.execute(
+                    f"SELECT {column}, id FROM {table} WHERE {column} IN (SELECT value FROM json_each(?))",
+                    (_json_list([m[0] for m in missing]),),
+                )
+            )
+        return ids
+
+    def add_documents(self, documents: Iterable[Tuple[str, str, str]]) -> int:
+        """Index ``(doc_key, role, text)`` triples; returns how many were new."""
+        with self._lock:
+            batch = list(documents)
+            keys = [key for key, _, _ in batch]
+            seen = {
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT doc_key FROM documents WHERE doc_key IN (SELECT value FROM json_each(?))", (_json_list(keys),)
+                )
+            }
+            pairs: Counter = Counter()
+            role_docs: Counter = Counter()
+            new_docs: List[Tuple[str, str]] = []
+            for key, role, text in batch:
+                if key in seen:
+                    continue
+                seen.add(key)
+                role_key = normalize_role(role)
+                role_docs[role_key] += 1
+                new_docs.append((key, role_key))
+                for term in set(tokenize(text)):
+                    pairs[(role_key, term)] += 1
+            if not new_docs:
+                return 0
+
+            with self._conn:
+                role_ids = self._ids("roles", "role", self._role_ids, role_docs)
+                term_ids = self._ids("terms", "term", self._term_ids, (term for _, term in pairs))
+                self._conn.executemany(
+                    "INSERT INTO documents (doc_key, role_id) VALUES (?, ?)",
+                    [(key, role_ids[role]) for key, role in new_docs],
+                )
+                self._conn.executemany(
+                    "UPDATE roles SET docs = docs + ? WHERE id = ?",
+                    [(count, role_ids[role]) for role, count in role_docs.items()],
+                )
+                self._conn.executemany(
+                    "INSERT INTO role_terms (role_id, term_id, df) VALUES (?, ?, ?) "
+                    "ON CONFLICT (role_id, term_id) DO UPDATE SET df = df + excluded.df",
+                    [(role_ids[role], term_ids[term], df) for (role, term), df in pairs.items()],
+                )
+            # Cached only once committed: ids from a rolled-back insert would name rows that do not exist
+            self._role_ids.update(role_ids)
+            self._term_ids.update(term_ids)
+            return len(new_docs)
+
+    def add_document(self, role: str, text: str, doc_key: Optional[str] = None) -> bool:
+        key = doc_key or "sha1:" + hashlib.sha1(f"{normalize_role(role)}\n{text}".encode("utf-8")).hexdigest()
+        return self.add_documents([(key, role, text)]) == 1
+
+    def _role_id(self, role: str) -> Optional[int]:
+        key = normalize_role(role)
+        role_id = self._role_ids.get(key)
+        if role_id is None:
+            # Another worker or process may have indexed the role since this one loaded its cache
+            with self._lock:
+                row = self._conn.execute("SELECT id FROM roles WHERE role = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                role_id = self._role_ids[key] = row[0]
+        return role_id
+
+    def role_documents(self, role: str) -> int:
+        role_id = self._role_id(role)
+        if role_id is None:
+            return 0
+        with self._lock:
+            row = self._conn.execute("SELECT docs FROM roles WHERE id = ?", (role_id,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def top_terms(self, role: str, k: int = 20, unigrams_only: bool = False) -> List[Dict[str, Any]]:
+        role_id = self._role_id(role)
+        if role_id is None:
+            return []
+        docs = self.role_documents(role)
+        query = (
+            "SELECT t.term, rt.df FROM role_terms rt INDEXED BY role_terms_by_df JOIN terms t ON t.id = rt.term_id "
+            "WHERE rt.role_id = ? " + ("AND instr(t.term, ' ') = 0 " if unigrams_only else "") + "ORDER BY rt.df DESC LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(query, (role_id, k)).fetchall()
+        return [{"term": term, "documents": df, "share": round(df / docs, 3) if docs else 0.0} for term, df in rows]
+
+    def coverage(self, role: str, text: str, k: int = 30) -> Dict[str, Any]:
+        """Share of the role's top-k terms (weighted by document frequency) present in ``text``."""
+        top = self.top_terms(role, k)
+        present: Set[str] = set(tokenize(text))
+        total = sum(t["documents"] for t in top)
+        matched = [t["term"] for t in top if t["term"] in present]
+        missing = [t["term"] for t in top if t["term"] not in present]
+        score = sum(t["documents"] for t in top if t["term"] in present) / total if total else 0.0
+        return {
+            "role": normalize_role(role),
+            "documents": self.role_documents(role),
+            "score": round(score, 3),
+            "matched": matched,
+            "missing": missing,
+        }
+
+
+def _json_list(values: Sequence[str]) -> str:
+    return json.dumps(list(values), ensure_ascii=False)
+
+
+@lru_cache(maxsize=1)
+def get_skill_index() -> Optional[SkillIndex]:
+    """Process-wide index under DATA_DIR, or None when disabled."""
+    config = load_config()
+    if not config.skill_index_enabled:
+        return None
+    return SkillIndex(config.data_dir / "skill_index.sqlite")
+
+
+# Job posts are indexed on one background thread, off the tool's thread (the event loop in sync execution mode)
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="skill-index")
+
+
+def _add_logged(index: SkillIndex, role: str, text: str) -> None:
+    try:
+        index.add_document(role, text)
+    except sqlite3.Error:
+        logging.getLogger(__name__).warning("skill_index_write_failed", exc_info=True)
+
+
+def index_job_post(role: Optional[str], requirements: Optional[Sequence[str]], responsibilities: Optional[Sequence[str]]) -> None:
+    """Queue a generated job post's requirements and responsibilities for the shared index."""
+    index = get_skill_index()
+    if index is None or not role or not (requirements or responsibilities):
+        return
+    _writer.submit(_add_logged, index, role, "\n".join(list(requirements or []) + list(responsibilities or [])))
+
+
+def index_vacancies(role: str, items: Sequence[Dict[str, Any]], key_skills: Optional[Dict[str, List[str]]] = None) -> int:
+    """Add hh.ru vacancies (title, requirement snippet, key skills) to the shared index."""
+    index = get_skill_index()
+    if index is None:
+        return 0
+    documents = []
+    for item in items:
+        vacancy_id = item.get("id")
+        if not vacancy_id:
+            continue
+        snippet = item.get("snippet") or {}
+        parts = [item.get("name") or "", snippet.get("requirement") or ""]
+        parts.extend((key_skills or {}).get(str(vacancy_id), []))
+        documents.append((f"hh:{vacancy_id}", role, "\n".join(parts)))
+    return index.add_documents(documents)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import inspect
+import threading
+import typing
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple, Union
+
+import anyio
+
+# Returned by a step once the generator is exhausted (or was closed before the step ran)
+_DONE = object()
+# Close-after-cancel tasks of abandoned async generators; the event loop only keeps weak references
+_closing: Set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True)
+class Progress:
+    """Yielded by a streaming tool while it works.
+
+    A streaming tool is a generator or async generator function: it yields
+    ``Progress`` items as it goes, and the last other item it yields is its
+    result. ``partial`` (JSON-serialisable) is forwarded to the client as soon
+    as it is yielded, e.g. one finished item of a batch.
+    """
+
+    progress: float
+    total: Optional[float] = None
+    message: Optional[str] = None
+    partial: Any = None
+
+
+class ClientDisconnected(Exception):
+    """The client's stream closed before a streaming tool finished."""
+
+
+def is_streaming(func: Callable[..., Any]) -> bool:
+    return inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func)
+
+
+def result_signature(func: Callable[..., Any]) -> inspect.Signature:
+    """``func``'s signature with string annotations evaluated.
+
+    For a streaming tool annotated ``Iterator[Union[Progress, R]]`` (or
+    ``AsyncIterator[...]``) the return annotation becomes ``R``, the type of
+    the final result, which is what FastMCP builds the output schema from.
+    """
+    signature = inspect.signature(func, eval_str=True)
+    if not is_streaming(func):
+        return signature
+    (item,) = typing.get_args(signature.return_annotation) or (Any,)
+    members = typing.get_args(item) if typing.get_origin(item) is Union else (item,)
+    results = tuple(member for member in members if member is not Progress)
+    return signature.replace(return_annotation=Union[results] if results else Any)
+
+
+def session_closed(session: Any) -> bool:
+    # The SSE transport closes the reading end of the session's write stream when the client goes away;
+    # nothing cancels the request handlers still running for it
+    stream = getattr(session, "_write_stream", None)
+    statistics = getattr(stream, "statistics", None)
+    return statistics is not None and statistics().open_receive_streams == 0
+
+
+class ProgressSink:
+    """Sends a streaming tool's Progress items to the client that made the request.
+
+    Progress becomes ``notifications/progress``, and a ``partial`` payload a
+    ``notifications/message`` log entry (logger = tool name) tied to the
+    request. Both are sent only when the request carried a progressToken, as
+    MCP requires for progress; without a request context (batch items, direct
+    calls) the items are dropped.
+    """
+
+    def __init__(self, request_context: Any, tool: str) -> None:
+        meta = getattr(request_context, "meta", None)
+        self._session = getattr(request_context, "session", None)
+        self._token = meta.progressToken if meta is not None else None
+        self._request_id = getattr(request_context, "request_id", None)
+        self.tool = tool
+        self.sent = 0
+
+    @property
+    def disconnected(self) -> bool:
+        return self._session is not None and session_closed(self._session)
+
+    async def send(self, item: Progress) -> None:
+        if self._token is None:
+            return
+        try:
+            await self._session.send_progress_notification(
+                self._token, item.progress, item.total, item.message, related_request_id=self._request_id
+            )
+            if item.partial is not None:
+                await self._session.send_log_message(
+                    level="info",
+                    data={"progress": item.progress, "total": item.total, "partial": item.partial},
+                    logger=self.tool,
+                    related_request_id=self._request_id,
+                )
+        except (anyio.BrokenResourceError, anyio.ClosedResourceError) as exc:
+            raise ClientDisconnected(self.tool) from exc
+        self.sent += 1
+
+
+class _SyncSteps:
+    """Steps a sync generator one ``next()`` at a time, possibly on worker threads.
+
+    A generator cannot be closed while a step is running in another thread, so
+    ``abandon`` closes it right away when idle and otherwise leaves it to the
+    running step to close once it returns.
+    """
+
+    def __init__(self, generator: typing.Generator[Any, None, None]) -> None:
+        self._generator = generator
+        self._context = contextvars.copy_context()
+        self._lock = threading.Lock()
+        self._running = False
+        self._abandoned = False
+
+    def step(self) -> Any:
+        with self._lock:
+            if self._abandoned:
+                return _DONE
+            self._running = True
+        try:
+            # One copied context for all steps, so contextvars set by the tool persist between them
+            return self._context.run(next, self._generator, _DONE)
+        finally:
+            with self._lock:
+                self._running = False
+                if self._abandoned:
+                    self._generator.close()
+
+    def abandon(self) -> None:
+        with self._lock:
+            self._abandoned = True
+            if not self._running:
+                self._generator.close()
+
+
+async def _close_after(step: Optional[asyncio.Future], generator: typing.AsyncGenerator[Any, None]) -> None:
+    if step is not None:
+        # The cancelled step raises inside the generator; aclose() then only has work if it never started
+        await asyncio.gather(step, return_exceptions=True)
+    await generator.aclose()
+
+
+def _steps(
+    func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any], executor: Optional[Executor]
+) -> Tuple[Callable[[], Awaitable[Any]], Callable[[Optional[asyncio.Future]], None]]:
+    if inspect.isasyncgenfunction(func):
+        agen = func(*args, **kwargs)
+
+        async def next_async() -> Any:
+            try:
+                return await agen.__anext__()
+            except StopAsyncIteration:
+                return _DONE
+
+        def abandon_async(step: Optional[asyncio.Future]) -> None:
+            task = asyncio.ensure_future(_close_after(step, agen))
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+
+        return next_async, abandon_async
+
+    steps = _SyncSteps(func(*args, **kwargs))
+    if executor is None:
+        # TOOL_EXECUTION_MODE=sync: steps run on the event loop like any sync tool; notifications go out in between
+
+        async def next_inline() -> Any:
+            return steps.step()
+
+        return next_inline, lambda step: steps.abandon()
+
+    def next_in_pool() -> Awaitable[Any]:
+        return asyncio.get_running_loop().run_in_executor(executor, steps.step)
+
+    return next_in_pool, lambda step: steps.abandon()
+
+
+async def run_streaming(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    sink: ProgressSink,
+    executor: Optional[Executor] = None,
+    poll_seconds: float = 0.5,
+) -> Any:
+    """Drive a streaming tool to completion, sending its Progress items to ``sink``, and return its result.
+
+    Sync generators step in ``executor`` (or inline when it is None). While a
+    step runs, the client connection is checked every ``poll_seconds``; if it
+    has gone, or the call is cancelled, the generator is closed (after its
+    in-flight step, for a sync generator in a worker thread) so abandoned
+    requests stop using workers, and ClientDisconnected is raised.
+    """
+    next_step, abandon = _steps(func, args, kwargs, executor)
+    result: Any = None
+    step: Optional[asyncio.Future] = None
+    finished = False
+    try:
+        while True:
+            step = asyncio.ensure_future(next_step())
+            while not (await asyncio.wait((step,), timeout=poll_seconds))[0]:
+                if sink.disconnected:
+                    raise ClientDisconnected(sink.tool)
+            item = step.result()
+            step = None
+            if item is _DONE:
+                finished = True
+                return result
+            if sink.disconnected:
+                raise ClientDisconnected(sink.tool)
+            if isinstance(item, Progress):
+                await sink.send(item)
+            else:
+                result = item
+    finally:
+        if not finished:
+            if step is not None:
+                step.cancel()
+            abandon(step)
@@ -1,45 +1,456 @@
 from __future__ import annotations
 
 import json
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
 from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
 
 from ..config import load_config
+from ..log_export import LOG_FILE_NAME, ExportFilter, export_page, log_files
+from ..log_segments import SegmentColumns, iso_timestamp, read_columns, segment_files, segment_start
+from ..sketches import LatencySketch
+from ..utils import end_timestamp_key, resolve_window, timestamp_key
 
+# Upper bounds (ms) of the duration histogram buckets; the last bucket is open-ended.
+DURATION_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
 
-def _read_logs() -> List[Dict[str, Any]]:
-    config = load_config()
-    log_file = config.log_dir / "requests.jsonl"
-    if not log_file.exists():
-        return []
-    lines: List[Dict[str, Any]] = []
-    with log_file.open("r", encoding="utf-8") as f:
-        for line in f:
+GROUP_BY_FIELDS = ("tool", "client_id", "event", "hour")
+
+
+@lru_cache(maxsize=1)
+def _log_dir() -> Path:
+    return load_config().log_dir
+
+
+@lru_cache(maxsize=1)
+def _read_segments() -> bool:
+    # With LOG_FORMAT=segments or both, analytics read the segmented binary log
+    return load_config().log_format != "jsonl"
+
+
+@dataclass
+class _FileStats:
+    """Counters accumulated from one physical log file (tracked by inode)."""
+
+    offset: int = 0
+    total: int = 0
+    by_level: Counter = field(default_factory=Counter)
+    by_event: Counter = field(default_factory=Counter)
+    by_tool: Counter = field(default_factory=Counter)
+    by_client: Counter = field(default_factory=Counter)
+    durations: Dict[str, List[int]] = field(default_factory=dict)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.total += 1
+        self.by_level[record.get("level")] += 1
+        if "event" in record:
+            self.by_event[record.get("event")] += 1
+        tool = record.get("tool")
+        if tool is not None:
+            if record.get("event") == "tool_call":
+                self.by_tool[tool] += 1
+            duration = record.get("duration_ms")
+            if isinstance(duration, (int, float)):
+                buckets = self.durations.setdefault(tool, [0] * (len(DURATION_BUCKETS_MS) + 1))
+                buckets[bisect_left(DURATION_BUCKETS_MS, duration)] += 1
+        if record.get("event") == "tool_call":
+            self.by_client[record.get("client_id")] += 1
+
+    def add_columns(self, columns: SegmentColumns) -> None:
+        """Same counts as :meth:`add` for every record of a segment's column block."""
+        strings = columns.strings
+        level_names = {levelno: logging.getLevelName(levelno) for levelno in set(columns.level)}
+        tool_call = strings.index("tool_call") if "tool_call" in strings else -1
+        self.total += len(columns)
+        for levelno, event, tool, client_id, duration in zip(
+            columns.level, columns.event, columns.tool, columns.client_id, columns.duration
+        ):
+            self.by_level[level_names[levelno]] += 1
+            if event:
+                self.by_event[strings[event]] += 1
+            if tool:
+                if event == tool_call:
+                    self.by_tool[strings[tool]] += 1
+                if duration == duration:
+                    buckets = self.durations.setdefault(strings[tool], [0] * (len(DURATION_BUCKETS_MS) + 1))
+                    buckets[bisect_left(DURATION_BUCKETS_MS, duration)] += 1
+            if event == tool_call:
+                self.by_client[strings[client_id]] += 1
+
+
+class LogAggregator:
+    """Incrementally aggregate ``requests.jsonl`` and its rotated backups.
+
+    Each file is tracked by ``(st_dev, st_ino)`` together with the byte offset
+    already consumed, so a refresh only parses lines appended since the last
+    call. ``TimedRotatingFileHandler`` renames the active file on rollover, which
+    keeps its inode: the tail of the old file is still picked up under its new
+    name and the fresh ``requests.jsonl`` starts at offset 0. Files are streamed
+    line by line and never loaded whole.
+
+    With ``segments`` the same bookkeeping runs over the segmented binary log
+    (see :mod:`hiring_router_mcp.log_segments`): sealed segments are counted
+    from their column block, the one being written from its frame headers.
+    """
+
+    def __init__(self, log_dir: Path, file_name: str = LOG_FILE_NAME, segments: bool = False) -> None:
+        self.log_dir = log_dir
+        self.file_name = file_name
+        self.segments = segments
+        self._files: Dict[Tuple[int, int], _FileStats] = {}
+        self._lock = threading.Lock()
+
+    def _candidates(self) -> List[Tuple[Path, os.stat_result]]:
+        if self.segments:
+            return [(segment.path, segment.stat) for segment in segment_files(self.log_dir)]
+        return log_files(self.log_dir, self.file_name)
+
+    def refresh(self) -> List[Tuple[int, int]]:
+        """Consume new lines from every log file; return the keys of today's file(s)."""
+        with self._lock:
+            present: Dict[Tuple[int, int], Path] = {}
+            for path, st in self._candidates():
+                key = (st.st_dev, st.st_ino)
+                present[key] = path
+                stats = self._files.get(key)
+                if stats is None or st.st_size < stats.offset:
+                    # New file, or truncated in place: start over
+                    stats = self._files[key] = _FileStats()
+                if st.st_size > stats.offset:
+                    self._consume(path, stats)
+            for key in list(self._files):
+                if key not in present:
+                    del self._files[key]
+
+            if self.segments:
+                # Segments are sealed at the UTC day boundary; today's are those started since midnight
+                midnight = time.time() // 86400 * 86400
+                return [key for key, path in present.items() if segment_start(path) >= midnight]
+            active = self.log_dir / self.file_name
             try:
-                lines.append(json.loads(line))
+                st = active.stat()
+            except FileNotFoundError:
+                return []
+            return [(st.st_dev, st.st_ino)]
+
+    def _consume(self, path: Path, stats: _FileStats) -> None:
+        if self.segments:
+            columns, stats.offset = read_columns(path, stats.offset)
+            stats.add_columns(columns)
+            return
+        with path.open("rb") as f:
+            f.seek(stats.offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    # Partially written line; pick it up on the next refresh
+                    break
+                stats.offset += len(raw)
+                try:
+                    record = json.loads(raw)
+                except Exception:
+                    continue
+                if isinstance(record, dict):
+                    stats.add(record)
+
+    def summary(self, include_rotated: bool = False) -> Dict[str, Any]:
+        current = self.refresh()
+        with self._lock:
+            if include_rotated:
+                selected = list(self._files.values())
+            else:
+                selected = [self._files[key] for key in current if key in self._files]
+
+            merged = _FileStats()
+            for stats in selected:
+                merged.total += stats.total
+                merged.by_level.update(stats.by_level)
+                merged.by_event.update(stats.by_event)
+                merged.by_tool.update(stats.by_tool)
+                merged.by_client.update(stats.by_client)
+                for tool, buckets in stats.durations.items():
+                    target = merged.durations.setdefault(tool, [0] * len(buckets))
+                    for i, count in enumerate(buckets):
+                        target[i] += count
+
+        labels = [f"le_{bound}" for bound in DURATION_BUCKETS_MS] + ["le_inf"]
+        return {
+            "total": merged.total,
+            "by_level": dict(merged.by_level),
+            "by_event": dict(merged.by_event),
+            "by_tool": dict(merged.by_tool),
+            "by_client": {str(k): v for k, v in merged.by_client.items()},
+            "duration_ms_histogram": {
+                tool: dict(zip(labels, buckets)) for tool, buckets in merged.durations.items()
+            },
+            "files": len(selected),
+        }
+
+    def latency_report(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        group_by: Tuple[str, ...] = ("tool",),
+    ) -> Dict[str, Any]:
+        """Latency percentiles, error rate and throughput per group in one streaming pass.
+
+        Each group keeps a :class:`LatencySketch`, so memory depends on the number
+        of groups, not on the number of records. Files last modified before
+        ``start`` (segments outside the window) cannot contain matching records
+        and are skipped unopened.
+        """
+        start_key = timestamp_key(start) if start else None
+        end_key = end_timestamp_key(end) if end else None
+
+        if self.segments:
+            groups, first_ts, last_ts = self._segment_groups(start, end, group_by)
+        else:
+            groups, first_ts, last_ts = self._line_groups(start, start_key, end_key, group_by)
+
+        if start and end:
+            window_seconds = (end - start).total_seconds()
+        elif first_ts and last_ts:
+            window_seconds = (
+                (end or datetime.fromisoformat(last_ts).replace(tzinfo=timezone.utc))
+                - (start or datetime.fromisoformat(first_ts).replace(tzinfo=timezone.utc))
+            ).total_seconds()
+        else:
+            window_seconds = 0.0
+        window_minutes = max(window_seconds / 60.0, 1 / 60.0)
+
+        rows = []
+        for key, group in groups.items():
+            row: Dict[str, Any] = dict(zip(group_by, key))
+            row.update(group.report(window_minutes))
+            rows.append(row)
+        rows.sort(key=lambda r: (r["latency_ms"]["p99"] is None, -(r["latency_ms"]["p99"] or 0)))
+        return {
+            "window": {
+                "start": start_key,
+                "end": end_key,
+                "first_record": first_ts,
+                "last_record": last_ts,
+                "seconds": round(window_seconds, 3),
+            },
+            "group_by": list(group_by),
+            "groups": rows,
+        }
+
+    def _line_groups(
+        self, start: Optional[datetime], start_key: Optional[str], end_key: Optional[str], group_by: Tuple[str, ...]
+    ) -> Tuple[Dict[Tuple[Any, ...], "_LatencyGroup"], Optional[str], Optional[str]]:
+        start_epoch = start.timestamp() if start else None
+        groups: Dict[Tuple[Any, ...], _LatencyGroup] = {}
+        first_ts: Optional[str] = None
+        last_ts: Optional[str] = None
+        for path, st in self._candidates():
+            if start_epoch is not None and st.st_mtime < start_epoch:
+                continue
+            for record in _iter_records(path):
+                ts = str(record.get("timestamp", ""))[:19]
+                if (start_key and ts < start_key) or (end_key and ts >= end_key):
+                    continue
+                event = record.get("event")
+                if event not in ("tool_call", "tool_result", "tool_error"):
+                    continue
+                key = tuple(_group_value(record, name, ts) for name in group_by)
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = _LatencyGroup()
+                group.add(event, record.get("duration_ms"))
+                if first_ts is None or ts < first_ts:
+                    first_ts = ts
+                if last_ts is None or ts > last_ts:
+                    last_ts = ts
+        return groups, first_ts, last_ts
+
+    def _segment_groups(
+        self, start: Optional[datetime], end: Optional[datetime], group_by: Tuple[str, ...]
+    ) -> Tuple[Dict[Tuple[Any, ...], "_LatencyGroup"], Optional[str], Optional[str]]:
+        # Works on the column blocks: string ids and epoch seconds, no per-record dicts
+        start_epoch = start.timestamp() if start else None
+        end_epoch = end.timestamp() if end else None
+        # Picks the group key out of a (tool, client_id, event, hour) tuple, in GROUP_BY_FIELDS order
+        pick = itemgetter(*(GROUP_BY_FIELDS.index(name) for name in group_by))
+        by_hour = "hour" in group_by
+        groups: Dict[Tuple[Any, ...], _LatencyGroup] = {}
+        first, last = math.inf, -math.inf
+        for segment in segment_files(self.log_dir, start_epoch, end_epoch):
+            # Segments wholly inside the window need no per-record time check
+            low = -math.inf if start_epoch is None or (segment.sealed and segment.first >= start_epoch) else start_epoch
+            high = math.inf if end_epoch is None or (segment.sealed and segment.last < end_epoch) else end_epoch
+            columns, _ = read_columns(segment.path)
+            strings = columns.strings
+            events = {i: name for i, name in enumerate(strings) if name in ("tool_call", "tool_result", "tool_error")}
+            local: Dict[Any, _LatencyGroup] = {}
+            for created, duration, event, tool, client_id in zip(
+                columns.created, columns.duration, columns.event, columns.tool, columns.client_id
+            ):
+                name = events.get(event)
+                if name is None or created < low or created >= high:
+                    continue
+                ids = pick((tool, client_id, event, int(created // 3600) if by_hour else 0))
+                group = local.get(ids)
+                if group is None:
+                    parts = ids if len(group_by) > 1 else (ids,)
+                    key = tuple(_hour_key(v) if field == "hour" else strings[v] for field, v in zip(group_by, parts))
+                    group = local[ids] = groups.setdefault(key, _LatencyGroup())
+                group.add(name, duration if duration == duration else None)
+                if created < first:
+                    first = created
+                if created > last:
+                    last = created
+        if first > last:
+            return groups, None, None
+        return groups, iso_timestamp(first)[:19], iso_timestamp(last)[:19]
+
+
+class _LatencyGroup:
+    __slots__ = ("calls", "results", "errors", "sketch")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.results = 0
+        self.errors = 0
+        self.sketch = LatencySketch()
+
+    def add(self, event: str, duration: Any) -> None:
+        if event == "tool_call":
+            self.calls += 1
+            return
+        if event == "tool_error":
+            self.errors += 1
+        else:
+            self.results += 1
+        if isinstance(duration, (int, float)):
+            self.sketch.add(duration)
+
+    def report(self, window_minutes: float) -> Dict[str, Any]:
+        completed = self.results + self.errors
+        return {
+            "calls": self.calls,
+            "completed": completed,
+            "errors": self.errors,
+            "error_rate": round(self.errors / completed, 4) if completed else 0.0,
+            "throughput_per_min": round(completed / window_minutes, 3),
+            "latency_ms": self.sketch.summary(),
+        }
+
+
+def _iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        return
+    with f:
+        for raw in f:
+            try:
+                record = json.loads(raw)
             except Exception:
                 continue
-    return lines
+            if isinstance(record, dict):
+                yield record
 
 
-def get_request_analytics() -> Dict[str, Any]:
-    logs = _read_logs()
-    by_level = Counter([l.get("level") for l in logs])
-    by_event = Counter([l.get("event") for l in logs if "event" in l])
-    return {
-        "total": len(logs),
-        "by_level": dict(by_level),
-        "by_event": dict(by_event),
-    }
+def _hour_key(hour: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:00:00Z", time.gmtime(hour * 3600))
+
+
+def _group_value(record: Dict[str, Any], name: str, ts: str) -> Any:
+    if name == "hour":
+        return ts[:13] + ":00:00Z" if ts else None
+    return record.get(name)
+
+
+_aggregators: Dict[str, LogAggregator] = {}
+_aggregators_lock = threading.Lock()
 
 
-def export_logs() -> Dict[str, Any]:
-    config = load_config()
-    log_dir = str(config.log_dir)
-    return {"export_path": log_dir}
+def get_aggregator(log_dir: Optional[Path] = None) -> LogAggregator:
+    log_dir = log_dir or _log_dir()
+    key = os.fspath(log_dir)
+    with _aggregators_lock:
+        aggregator = _aggregators.get(key)
+        if aggregator is None:
+            aggregator = _aggregators[key] = LogAggregator(log_dir, segments=_read_segments())
+        return aggregator
 
 
+def get_request_analytics(
+    include_rotated: bool = False,
+    time_range: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    group_by: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Summarize request logs, or report per-group latency over a time window.
 
+    Without window/grouping arguments this returns counts by level, event, tool
+    and client. With any of them it returns p50/p95/p99 latency, error rate and
+    throughput per group, computed in one streaming pass over all log files.
 
+    Args:
+        include_rotated: Also aggregate the rotated daily backups, not just today's file.
+        time_range: Relative window such as "last_24_hours" or "last_7_days".
+        start: Inclusive ISO-8601 start (UTC if no offset is given).
+        end: Exclusive ISO-8601 end (UTC if no offset is given).
+        group_by: Comma-separated subset of "tool", "client_id", "event", "hour".
+    """
+    if not (time_range or start or end or group_by):
+        return get_aggregator().summary(include_rotated=include_rotated)
 
+    fields = tuple(f.strip() for f in (group_by or "tool").split(",") if f.strip())
+    unknown = [f for f in fields if f not in GROUP_BY_FIELDS]
+    if unknown:
+        raise ValueError(f"Unsupported group_by {unknown}; choose from {list(GROUP_BY_FIELDS)}")
+    start_dt, end_dt = resolve_window(time_range, start, end)
+    return get_aggregator().latency_report(start_dt, end_dt, fields)
+
+
+def export_logs(
+    time_range: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    event: Optional[str] = None,
+    tool: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 200,
+) -> Dict[str, Any]:
+    """Page through request log records across the current and rotated log files.
+
+    Pass ``next_cursor`` back as ``cursor`` to continue (the cursor keeps the
+    filters). For bulk downloads use the ``download`` paths: GET /logs/export
+    streams the same records as gzip/zstd NDJSON or an Arrow IPC stream.
+
+    Args:
+        time_range: Relative window such as "last_24_hours" or "last_7_days".
+        start: Inclusive ISO-8601 start (UTC if no offset is given).
+        end: Exclusive ISO-8601 end (UTC if no offset is given).
+        event: Comma-separated events to keep, e.g. "tool_call,tool_error".
+        tool: Comma-separated tool names to keep.
+        cursor: ``next_cursor`` from the previous page.
+        limit: Records per page (1-1000).
+    """
+    flt = ExportFilter.from_args(time_range, start, end, event, tool)
+    page = export_page(_log_dir(), flt, cursor=cursor, limit=max(1, min(limit, 1000)), segments=_read_segments())
+    query = urlencode({k: v for k, v in {"time_range": time_range, "start": start, "end": end, "event": event, "tool": tool}.items() if v})
+    suffix = "&" + query if query else ""
+    return {
+        "count": len(page["records"]),
+        "records": page["records"],
+        "next_cursor": page["next_cursor"],
+        "download": {
+            "ndjson_gzip": "/logs/export?format=ndjson&compression=gzip" + suffix,
+            "arrow": "/logs/export?format=arrow" + suffix,
+        },
+    }
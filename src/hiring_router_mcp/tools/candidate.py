@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+from ..hh_api import fetch_market_snapshot
+from ..resume_analysis import analyze_resume, improvement_steps, role_profile
+from ..skill_index import get_skill_index
+
 
 def candidate_assistant(task_description: str, stage: Optional[str] = None) -> Dict[str, Any]:
     return {
@@ -17,7 +21,11 @@ def candidate_assistant(task_description: str, stage: Optional[str] = None) -> D
 
 
 def resume_optimizer(resume_text: Optional[str] = None, target_role: Optional[str] = None) -> Dict[str, Any]:
-    return {
+    """ATS review of a resume: parsed sections, skills, dates and achievements, an ATS score and role keyword match.
+
+    With ``resume_text``, ``instructions`` lists the concrete fixes for it instead of the generic advice.
+    """
+    result: Dict[str, Any] = {
         "type": "resume_prompt",
         "target_role": target_role or "Role",
         "instructions": [
@@ -27,6 +35,14 @@ def resume_optimizer(resume_text: Optional[str] = None, target_role: Optional[st
         ],
         "resume_text": resume_text or "",
     }
+    if resume_text:
+        analysis = analyze_resume(resume_text, role_profile(target_role) if target_role else None)
+        result["analysis"] = analysis
+        result["instructions"] = improvement_steps(analysis) or ["Resume passes the ATS checks; tailor the summary to each vacancy"]
+    index = get_skill_index()
+    if index is not None and resume_text and target_role and index.role_documents(target_role):
+        result["keyword_coverage"] = index.coverage(target_role, resume_text)
+    return result
 
 
 def interview_prep(role: Optional[str] = None, topics: Optional[List[str]] = None, days_until_interview: Optional[int] = None) -> Dict[str, Any]:
@@ -44,7 +60,7 @@ def interview_prep(role: Optional[str] = None, topics: Optional[List[str]] = Non
 
 
 def salary_research(role: Optional[str] = None, location: Optional[str] = None, experience_years: Optional[int] = None) -> Dict[str, Any]:
-    return {
+    result: Dict[str, Any] = {
         "type": "salary_research",
         "instructions": [
             "Use hh.ru and other sources to find salary ranges",
@@ -54,6 +70,13 @@ def salary_research(role: Optional[str] = None, location: Optional[str] = None,
         "role": role or "Role",
         "location": location or "Location",
     }
+    if role:
+        market_data = fetch_market_snapshot(role, location=location, experience_years=experience_years)
+        if market_data is not None:
+            result["market_data"] = market_data
+            if market_data.get("salary_bands"):
+                result["instructions"][1] = "Compare against the salary bands in market_data (p25/p50/p75, RUR/month, net)"
+    return result
 
 
 
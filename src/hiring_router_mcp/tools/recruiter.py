@@ -1,12 +1,37 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from ..config import load_config
+from ..content_templates import (
+    DEFAULT_RUBRIC,
+    DIFFICULTIES,
+    FAMILIES,
+    MAX_QUESTIONS,
+    default_topics,
+    render_homework,
+    render_job_post,
+    render_quiz,
+    resolve_topic,
+    role_family,
+    seniority_level,
+)
+from ..forms import APPLICATION_FORM_FIELDS
+from ..hh_api import fetch_market_snapshot
+from ..pipeline import DEFAULT_JOURNEY, get_pipeline_store
+from ..resume_analysis import default_workers, role_profile, score_chunks, shortlist
+from ..skill_index import get_skill_index, index_job_post
+from ..streaming import Progress
+from ..utils import resolve_window
 
 
 def market_research(query: Optional[str] = None, location: Optional[str] = None, role: Optional[str] = None, experience_years: Optional[int] = None) -> Dict[str, Any]:
     """Guide for HH.ru market research and salary stats.
 
     Returns an instruction set that Claude can follow to help the user perform manual research now.
+    When live hh.ru lookups are enabled, ``market_data`` carries salary percentiles and top skills
+    computed from the matching vacancies.
     """
     instructions = [
         "Open hh.ru and switch to the appropriate region.",
@@ -16,10 +41,18 @@ def market_research(query: Optional[str] = None, location: Optional[str] = None,
         "Check salary statistics page (Зарплаты) and record median, p25, p75.",
         "Summarize insights with bullet points and suggested compensation bands.",
     ]
-    return {"type": "instructions", "steps": instructions}
+    result: Dict[str, Any] = {"type": "instructions", "steps": instructions}
+    if role or query:
+        market_data = fetch_market_snapshot(role or query, location=location, experience_years=experience_years)
+        if market_data is not None:
+            result["market_data"] = market_data
+            if market_data.get("salary_bands"):
+                instructions[4] = "Use the salary bands in market_data (RUR/month, net, by experience) computed from the fetched vacancies."
+    return result
 
 
 def generate_job_post(company: Optional[str] = None, role: Optional[str] = None, seniority: Optional[str] = None, location: Optional[str] = None, requirements: Optional[List[str]] = None, responsibilities: Optional[List[str]] = None, benefits: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Job post rendered server-side into ``text`` from the template for the seniority level, plus its ``context``."""
     prompt_context = {
         "company": company or "Company",
         "role": role or "Role",
@@ -29,74 +62,146 @@ def generate_job_post(company: Optional[str] = None, role: Optional[str] = None,
         "responsibilities": responsibilities or ["Key responsibility 1", "Key responsibility 2"],
         "benefits": benefits or ["Competitive salary", "Flexible schedule"],
     }
-    return {"type": "content_prompt", "template": "job_post", "context": prompt_context}
+    # Every call feeds the index, which is why this tool is not in CACHEABLE_TOOLS
+    index_job_post(role, requirements, responsibilities)
+    text = render_job_post(
+        prompt_context["company"],
+        prompt_context["role"],
+        seniority_level(seniority, role or ""),
+        prompt_context["location"],
+        tuple(prompt_context["requirements"]),
+        tuple(prompt_context["responsibilities"]),
+        tuple(prompt_context["benefits"]),
+    )
+    return {"type": "content_prompt", "template": "job_post", "context": prompt_context, "text": text}
+
+
+def role_skill_profile(role: str, top_k: int = 20) -> Dict[str, Any]:
+    """Most frequent skills/keywords for a role across indexed job posts and hh.ru vacancies."""
+    index = get_skill_index()
+    if index is None:
+        return {"type": "skill_profile", "role": role, "documents": 0, "skills": [], "status": "index_disabled"}
+    return {
+        "type": "skill_profile",
+        "role": role,
+        "documents": index.role_documents(role),
+        "skills": index.top_terms(role, top_k),
+    }
+
+
+def shortlist_resumes(
+    resumes: List[Dict[str, str]], target_role: str, vacancy_text: Optional[str] = None, top_n: int = 20
+) -> Iterator[Union[Progress, Dict[str, Any]]]:
+    """Score many resumes against one vacancy and return a ranked shortlist.
+
+    Each item is ``{"id": ..., "text": ...}`` (``id`` defaults to the item's position). Scores combine
+    role keyword match (skills named in ``vacancy_text`` count double) and ATS-friendliness; large
+    batches are scored in parallel worker processes. Progress is reported as chunks finish.
+    """
+    limit = load_config().resume_max_batch
+    if len(resumes) > limit:
+        raise ValueError(f"{len(resumes)} resumes; the limit is {limit} (RESUME_MAX_BATCH)")
+    pairs = [(str(item.get("id", position)), item.get("text") or "") for position, item in enumerate(resumes)]
+    profile = role_profile(target_role, vacancy_text)
+    workers = default_workers()
+    start = time.perf_counter()
+    mode = "inline"
+    scored: List[Dict[str, Any]] = []
+    for mode, rows in score_chunks(pairs, profile, workers):
+        scored.extend(rows)
+        yield Progress(len(scored), len(pairs), f"scored {len(scored)} of {len(pairs)} resumes")
+    yield {"type": "resume_shortlist", "target_role": target_role, **shortlist(scored, profile, top_n, mode, workers, start)}
 
 
 def generate_application_form(position: Optional[str] = None, webhook_url: Optional[str] = None) -> Dict[str, Any]:
     """Return a workflow trigger spec for creating an application form (n8n-ready)."""
-    form_fields = [
-        {"name": "full_name", "label": "Full Name", "type": "text", "required": True},
-        {"name": "email", "label": "Email", "type": "email", "required": True},
-        {"name": "resume_url", "label": "Resume URL", "type": "url", "required": True},
-        {"name": "linkedin", "label": "LinkedIn", "type": "url", "required": False},
-        {"name": "portfolio", "label": "Portfolio", "type": "url", "required": False},
-    ]
+    form_fields = [dict(field) for field in APPLICATION_FORM_FIELDS]
     workflow = {
         "trigger": "webhook",
         "webhook_url": webhook_url or "${N8N_WEBHOOK_URL}",
         "steps": [
-            {"action": "store_submission"},
+            # The form posts here; new submissions are batched on to webhook_url for the steps below
+            {"action": "store_submission", "method": "POST", "path": "/forms/submit", "dedupe": ["email", "position"]},
             {"action": "notify_recruiter", "channel": "email"},
             {"action": "create_candidate_record"},
+            # Submissions enter the funnel at "application"; later stage changes feed generate_funnel_report here
+            {"action": "record_stage", "method": "POST", "path": "/pipeline/events"},
         ],
     }
     return {"type": "form_spec", "position": position or "Position", "fields": form_fields, "workflow": workflow}
 
 
 def generate_quiz(role: Optional[str] = None, topics: Optional[List[str]] = None, num_questions: int = 10, difficulty: str = "medium") -> Dict[str, Any]:
-    return {
+    """Quiz drawn from the local question bank: ``num_questions`` spread over ``topics`` at ``difficulty``.
+
+    ``difficulty`` is "easy", "medium", "hard" or "mixed". Without ``topics`` they follow from ``role``;
+    topics the bank does not cover are listed in ``uncovered_topics`` for the client to write questions for.
+    """
+    difficulty = difficulty.lower() if difficulty and difficulty.lower() in DIFFICULTIES + ("mixed",) else "medium"
+    num_questions = max(1, min(num_questions, MAX_QUESTIONS))
+    resolved = {topic: resolve_topic(topic) for topic in topics} if topics else {t: t for t in default_topics(role or "")}
+    bank_topics = tuple(dict.fromkeys(key for key in resolved.values() if key))
+    result: Dict[str, Any] = {
         "type": "quiz_spec",
         "role": role or "Role",
         "difficulty": difficulty,
         "num_questions": num_questions,
-        "topics": topics or ["Topic A", "Topic B"],
+        "topics": list(resolved),
+        "questions": [dict(q) for q in render_quiz(bank_topics, difficulty, num_questions)] if bank_topics else [],
     }
-
-
-def generate_homework(role: Optional[str] = None, objective: Optional[str] = None, deliverables: Optional[List[str]] = None, evaluation_rubric: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    uncovered = [topic for topic, key in resolved.items() if key is None]
+    if uncovered:
+        result["uncovered_topics"] = uncovered
+    return result
+
+
+def generate_homework(role: Optional[str] = None, objective: Optional[str] = None, deliverables: Optional[List[str]] = None, evaluation_rubric: Optional[Dict[str, int]] = None, seniority: Optional[str] = None) -> Dict[str, Any]:
+    """Take-home assignment with its full ``brief`` rendered server-side: objective, context, timebox by seniority and rubric."""
+    rubric = evaluation_rubric or dict(DEFAULT_RUBRIC)
+    objective = objective or FAMILIES[role_family(role or "")]["objective"]
+    deliverables = deliverables or ["GitHub repo", "README with instructions"]
+    level = seniority_level(seniority, role or "")
+    brief = render_homework(role or "Role", level, objective, tuple(deliverables), tuple(rubric.items()))
     return {
         "type": "homework_spec",
         "role": role or "Role",
-        "objective": objective or "Build a small app demonstrating core skills",
-        "deliverables": deliverables or ["GitHub repo", "README with instructions"],
-        "evaluation_rubric": evaluation_rubric or {"correctness": 40, "code_quality": 30, "tests": 20, "docs": 10},
+        "objective": objective,
+        "deliverables": deliverables,
+        "evaluation_rubric": rubric,
+        "seniority": level,
+        "brief": brief,
     }
 
 
-def generate_candidate_journey(stages: Optional[List[str]] = None) -> Dict[str, Any]:
-    return {
-        "type": "journey_spec",
-        "stages": stages
-        or [
-            "Sourcing",
-            "Application",
-            "Screening",
-            "Technical Assessment",
-            "Onsite/Panel",
-            "Offer",
-            "Onboarding",
-        ],
-    }
+def generate_candidate_journey(stages: Optional[List[str]] = None, position: Optional[str] = None) -> Dict[str, Any]:
+    """Hiring stages, plus observed conversion and time in stage when the pipeline store has data."""
+    result: Dict[str, Any] = {"type": "journey_spec", "stages": stages or list(DEFAULT_JOURNEY)}
+    observed = get_pipeline_store().funnel(*resolve_window("last_90_days", None, None), position=position)
+    if observed:
+        result["observed_last_90_days"] = observed["all"]["stages"]
+    return result
+
 
+def generate_funnel_report(time_range: str = "last_30_days", group_by: Optional[str] = None, position: Optional[str] = None) -> Dict[str, Any]:
+    """Funnel per hiring stage from recorded candidate transitions (POST /pipeline/events).
 
-def generate_funnel_report(time_range: str = "last_30_days", group_by: Optional[str] = None) -> Dict[str, Any]:
+    Reports entries, conversion and drop-off rates and time-in-stage percentiles for stages
+    entered within ``time_range`` ("last_30_days", "last_12_hours", ... or "all").
+    ``group_by`` is "stage" (one funnel), "position", "source", "week" or "month".
+    """
+    if time_range == "all":
+        start, end = None, None
+    else:
+        start, end = resolve_window(time_range, None, None)
+    group_by = group_by or "stage"
     return {
-        "type": "funnel_report_request",
+        "type": "funnel_report",
         "time_range": time_range,
-        "group_by": group_by or "stage",
+        "group_by": group_by,
+        "position": position,
+        "window": {
+            "start": start.isoformat(timespec="seconds") if start else None,
+            "end": end.isoformat(timespec="seconds") if end else None,
+        },
+        "groups": get_pipeline_store().funnel(start, end, group_by=group_by, position=position),
     }
-
-
-
-
-
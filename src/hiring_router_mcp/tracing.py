@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import atexit
+import contextvars
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Coroutine, Dict, Iterator, List, Optional, TypeVar
+
+if TYPE_CHECKING:
+    import requests
+
+T = TypeVar("T")
+
+TRACING_EXPORTERS = ("none", "file", "otlp")
+TRACE_FILE_NAME = "traces.jsonl"
+
+# OTLP enum values (opentelemetry/proto/trace/v1/trace.proto)
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """One timed operation, shaped like an OpenTelemetry span.
+
+    ``to_otlp`` renders it as OTLP/JSON, so exported batches load into any
+    OTLP collector (``/v1/traces``) or its file receiver unchanged.
+    """
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "status", "message", "events")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int, attributes: Optional[Dict[str, Any]]) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.status = 0
+        self.message = ""
+        self.events: List[Dict[str, Any]] = []
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def fail(self, exc: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.message = f"{type(exc).__name__}: {exc}"
+        self.events.append({
+            "timeUnixNano": str(time.time_ns()),
+            "name": "exception",
+            "attributes": _attributes({"exception.type": type(exc).__name__, "exception.message": str(exc)}),
+        })
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _attributes(self.attributes),
+            "status": {"code": self.status, "message": self.message} if self.status else {},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.events:
+            span["events"] = self.events
+        return span
+
+
+def _attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    rendered = []
+    for key, value in values.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            # OTLP/JSON carries 64-bit ints as strings
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        rendered.append({"key": key, "value": typed})
+    return rendered
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("hiring_router_span", default=None)
+
+
+class _SpanScope:
+    __slots__ = ("processor", "span", "token")
+
+    def __init__(self, processor: "BatchSpanProcessor", span: Span) -> None:
+        self.processor = processor
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current.reset(self.token)
+        if exc is not None:
+            self.span.fail(exc)
+        self.span.end_ns = time.time_ns()
+        self.processor.on_end(self.span)
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP = _NoopScope()
+_processor: Optional["BatchSpanProcessor"] = None
+
+
+def start_span(name: str, kind: int = KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None) -> Any:
+    """Context manager timing a child of the current span (or a new trace's root).
+
+    Yields the :class:`Span`, or None while tracing is off, in which case the
+    whole call is one global check and a shared no-op object.
+    """
+    processor = _processor
+    if processor is None:
+        return _NOOP
+    parent = _current.get()
+    trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+    return _SpanScope(processor, Span(name, trace_id, parent.span_id if parent is not None else None, kind, attributes))
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current.get()
+    return span.trace_id if span is not None else None
+
+
+def enabled() -> bool:
+    return _processor is not None
+
+
+async def propagate(coro: Coroutine[Any, Any, T], span: Optional[Span]) -> T:
+    """Run ``coro`` with ``span`` as its parent, e.g. on another thread's event loop."""
+    token = _current.set(span)
+    try:
+        return await coro
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def use_span(span: Optional[Span]) -> Iterator[None]:
+    """Make ``span`` the parent of spans started in the block, e.g. on a thread handling work queued under it."""
+    token = _current.set(span)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+class FileSpanExporter:
+    """Append each batch as one OTLP/JSON ``{"resourceSpans": [...]}`` line (the collector file exporter format)."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+
+    def export(self, payload: Dict[str, Any]) -> bool:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+        return True
+
+
+class OtlpHttpSpanExporter:
+    """POST OTLP/JSON batches to a collector's ``/v1/traces``."""
+
+    def __init__(self, endpoint: str, timeout_seconds: float = 5.0) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.timeout_seconds = timeout_seconds
+        self._session: Optional["requests.Session"] = None
+
+    def export(self, payload: Dict[str, Any]) -> bool:
+        if self._session is None:
+            # Imported on first export so requests stays off the server startup path
+            import requests
+
+            self._session = requests.Session()
+        try:
+            response = self._session.post(
+                self.url,
+                data=json.dumps(payload, separators=(",", ":")).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+                timeout=self.timeout_seconds,
+            )
+        except Exception:
+            return False
+        return response.status_code < 300
+
+
+class BatchSpanProcessor:
+    """Queue finished spans and export them in batches from a background thread.
+
+    ``on_end`` is a ``put_nowait``; when the queue is full the span is dropped
+    and counted, so tracing never blocks a request.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        exporter: Any,
+        service_name: str,
+        batch_size: int = 512,
+        flush_seconds: float = 1.0,
+        max_queue_size: int = 10000,
+    ) -> None:
+        self.exporter = exporter
+        self.resource = {"attributes": _attributes({"service.name": service_name})}
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max_queue_size)
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+        self._worker = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._worker.start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"queue_depth": self._queue.qsize(), "exported": self.exported, "dropped": self.dropped, "failed": self.failed}
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        if self._worker.is_alive():
+            self._queue.put(self._STOP)
+            self._worker.join(timeout)
+
+    def _run(self) -> None:
+        batch: List[Span] = []
+        deadline = time.monotonic() + self.flush_seconds
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if isinstance(item, Span):
+                batch.append(item)
+            due = time.monotonic() >= deadline
+            if batch and (due or item is self._STOP or len(batch) >= self.batch_size):
+                self._export(batch)
+                batch = []
+            if item is self._STOP:
+                return
+            if due:
+                deadline = time.monotonic() + self.flush_seconds
+
+    def _export(self, batch: List[Span]) -> None:
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": self.resource,
+                    "scopeSpans": [{"scope": {"name": "hiring_router_mcp"}, "spans": [span.to_otlp() for span in batch]}],
+                }
+            ]
+        }
+        try:
+            ok = self.exporter.export(payload)
+        except Exception:
+            ok = False
+        if ok:
+            self.exported += len(batch)
+        else:
+            self.failed += len(batch)
+
+
+def setup_tracing(
+    exporter: str,
+    log_dir: Path,
+    service_name: str = "hiring-router-mcp",
+    otlp_endpoint: str = "http://localhost:4318",
+    batch_size: int = 512,
+    flush_seconds: float = 1.0,
+    max_queue_size: int = 10000,
+) -> Optional[BatchSpanProcessor]:
+    """Install the process-wide span processor for ``exporter`` ("none" turns tracing off).
+
+    "file" appends OTLP/JSON batches to ``<log_dir>/traces.jsonl``; "otlp"
+    posts them to an OTLP/HTTP collector at ``otlp_endpoint``.
+    """
+    global _processor
+    if _processor is not None:
+        _processor.shutdown()
+        _processor = None
+    if exporter == "file":
+        sink: Any = FileSpanExporter(log_dir / TRACE_FILE_NAME)
+    elif exporter == "otlp":
+        sink = OtlpHttpSpanExporter(otlp_endpoint)
+    elif exporter == "none":
+        return None
+    else:
+        raise ValueError(f"Unsupported TRACING_EXPORTER {exporter!r}; use one of {', '.join(TRACING_EXPORTERS)}")
+    _processor = BatchSpanProcessor(sink, service_name, batch_size, flush_seconds, max_queue_size)
+    return _processor
+
+
+def _shutdown() -> None:
+    if _processor is not None:
+        _processor.shutdown()
+
+
+atexit.register(_shutdown)
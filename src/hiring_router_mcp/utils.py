@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 import functools
+import hashlib
+import hmac
 import json
 import logging
-from typing import Any, Callable, Dict, Optional, List
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, List, Tuple
+
+RELATIVE_RANGE = re.compile(r"^last_(\d+)_(hour|day)s?$")
 
 
 def log_tool_calls(func: Callable[..., Any]) -> Callable[..., Any]:
@@ -37,5 +43,53 @@ def log_tool_calls(func: Callable[..., Any]) -> Callable[..., Any]:
     return wrapper
 
 
+def parse_moment(value: str) -> datetime:
+    text = value.strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    moment = datetime.fromisoformat(text)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def resolve_window(
+    time_range: Optional[str], start: Optional[str], end: Optional[str]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    start_dt = parse_moment(start) if start else None
+    end_dt = parse_moment(end) if end else None
+    if time_range:
+        match = RELATIVE_RANGE.match(time_range.strip().lower())
+        if not match:
+            raise ValueError(f"Unsupported time_range {time_range!r}; use e.g. 'last_24_hours' or 'last_7_days'")
+        amount, unit = int(match.group(1)), match.group(2)
+        end_dt = end_dt or datetime.now(timezone.utc)
+        start_dt = end_dt - (timedelta(hours=amount) if unit == "hour" else timedelta(days=amount))
+    return start_dt, end_dt
+
+
+def timestamp_key(moment: datetime) -> str:
+    """Render a bound in the log's UTC ``YYYY-MM-DDTHH:MM:SS`` form for string comparison."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.isoformat(timespec="seconds")
+
+
+def end_timestamp_key(moment: datetime) -> str:
+    """Exclusive end bound for :func:`timestamp_key` comparisons.
+
+    Log timestamps compare at whole seconds, so a fractional end (such as
+    now) rounds up; truncating it would drop every record of its second.
+    """
+    if moment.microsecond:
+        moment = moment.replace(microsecond=0) + timedelta(seconds=1)
+    return timestamp_key(moment)
+
+
+def hmac_signature(secret: str, body: bytes) -> str:
+    """``X-Signature`` header value for ``body``, the scheme the log webhook uses."""
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
 
 
+def verify_signature(secret: str, body: bytes, header: Optional[str]) -> bool:
+    return bool(header) and hmac.compare_digest(hmac_signature(secret, body), header)